@@ -0,0 +1,181 @@
+"""Wire codecs for WebSocket frames, chosen per connection by subprotocol.
+
+- no subprotocol / "codenames.json": JSON in text frames (what browsers expect)
+- "codenames.json-binary": the same JSON as UTF-8 in binary frames, skipping
+  the str round trip
+- "codenames.msgpack": MessagePack in binary frames, with game_state boards
+  packed into compact arrays (only offered if msgpack is installed)
+
+JSON codecs use orjson when it is installed and fall back to the stdlib.
+"""
+import json
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+Frame = Union[str, bytes]
+
+_BATCH_HEAD = '{"type":"batch","payload":{"messages":['
+
+# Card type codes used by packed boards; HIDDEN marks a type an operative can't see
+_TYPE_CODES = {"red": 0, "blue": 1, "neutral": 2, "assassin": 3, None: 255}
+_TYPES = {code: card_type for card_type, code in _TYPE_CODES.items()}
+
+
+class Codec:
+    """Encodes outbound messages and decodes inbound ones."""
+
+    name = ""
+    # Subprotocol to confirm on accept; None for the default codec
+    subprotocol: Optional[str] = None
+    # Whether frames are sent as binary rather than text
+    binary = False
+
+    def encode(self, message: dict) -> Frame:
+        raise NotImplementedError
+
+    def decode(self, data: Frame) -> dict:
+        raise NotImplementedError
+
+    def validate(self, data: Frame, adapter: TypeAdapter) -> Any:
+        """Decode a frame and validate it against a schema."""
+        return adapter.validate_python(self.decode(data))
+
+    def batch(self, frames: List[Frame]) -> Frame:
+        """Wrap already-encoded frames in one batch envelope, in order."""
+        return self.encode({"type": "batch", "payload": {"messages": [self.decode(f) for f in frames]}})
+
+
+class JsonCodec(Codec):
+    """JSON, encoded with orjson if available."""
+
+    def __init__(self, name: str, subprotocol: Optional[str], binary: bool, fast: bool = True):
+        self.name = name
+        self.subprotocol = subprotocol
+        self.binary = binary
+        self.fast = fast and orjson is not None
+
+    def encode(self, message: dict) -> Frame:
+        if self.fast:
+            data = orjson.dumps(message)
+            return data if self.binary else data.decode()
+        text = json.dumps(message, separators=(",", ":"))
+        return text.encode() if self.binary else text
+
+    def decode(self, data: Frame) -> dict:
+        if self.fast:
+            return orjson.loads(data)
+        return json.loads(data)
+
+    def validate(self, data: Frame, adapter: TypeAdapter) -> Any:
+        # pydantic parses and validates the raw JSON in a single pass
+        return adapter.validate_json(data)
+
+    def batch(self, frames: List[Frame]) -> Frame:
+        # Splice the encoded frames in rather than re-encoding them
+        if self.binary:
+            return _BATCH_HEAD.encode() + b",".join(frames) + b"]}}"
+        return _BATCH_HEAD + ",".join(frames) + "]}}"
+
+
+def pack_cards(cards: List[dict]) -> dict:
+    """Pack card dicts into parallel arrays: words, one type byte per card and a revealed bitmask."""
+    revealed = 0
+    for card in cards:
+        if card["revealed"]:
+            revealed |= 1 << card["position"]
+    return {
+        "words": [card["word"] for card in cards],
+        "types": bytes(_TYPE_CODES[card["type"]] for card in cards),
+        "revealed": revealed,
+    }
+
+
+def unpack_cards(packed: dict) -> List[dict]:
+    """Inverse of pack_cards."""
+    revealed = packed["revealed"]
+    return [
+        {"word": word, "type": _TYPES[code], "revealed": bool(revealed >> i & 1), "position": i}
+        for i, (word, code) in enumerate(zip(packed["words"], packed["types"]))
+    ]
+
+
+class MsgpackCodec(Codec):
+    """MessagePack with packed boards in game_state frames."""
+
+    name = "msgpack"
+    subprotocol = "codenames.msgpack"
+    binary = True
+
+    def __init__(self):
+        # An envelope with an empty array ends in its array header, so
+        # encoded frames can follow a header for the real length
+        self._batch_head = msgpack.packb({"type": "batch", "payload": {"messages": []}})[:-1]
+
+    def encode(self, message: dict) -> Frame:
+        if message.get("type") == "game_state":
+            payload = dict(message["payload"], cards=pack_cards(message["payload"]["cards"]))
+            message = {"type": "game_state", "payload": payload}
+        return msgpack.packb(message)
+
+    def _unpack(self, data: Frame) -> Any:
+        if not isinstance(data, bytes):
+            raise ValueError("expected a binary frame")
+        try:
+            return msgpack.unpackb(data)
+        except Exception as error:
+            raise ValueError(f"invalid msgpack: {error}") from error
+
+    def decode(self, data: Frame) -> dict:
+        message = self._unpack(data)
+        try:
+            if isinstance(message, dict) and message.get("type") == "game_state":
+                message["payload"]["cards"] = unpack_cards(message["payload"]["cards"])
+            elif isinstance(message, dict) and message.get("type") == "batch":
+                for item in message["payload"]["messages"]:
+                    if item.get("type") == "game_state":
+                        item["payload"]["cards"] = unpack_cards(item["payload"]["cards"])
+        except (AttributeError, KeyError, TypeError, IndexError) as error:
+            raise ValueError(f"malformed {message['type']} frame") from error
+        return message
+
+    def validate(self, data: Frame, adapter: TypeAdapter) -> Any:
+        # Client messages never carry packed boards, so validate them as sent
+        return adapter.validate_python(self._unpack(data))
+
+    def batch(self, frames: List[Frame]) -> Frame:
+        count = len(frames)
+        header = bytes([0x90 | count]) if count < 16 else b"\xdc" + count.to_bytes(2, "big")
+        return self._batch_head + header + b"".join(frames)
+
+
+DEFAULT_CODEC = JsonCodec("json", None, binary=False)
+# Unwrapped JSON for HTTP response bodies
+BODY_CODEC = JsonCodec("body", None, binary=True)
+
+# Subprotocol -> codec
+CODECS: Dict[str, Codec] = {
+    "codenames.json": JsonCodec("json", "codenames.json", binary=False),
+    "codenames.json-binary": JsonCodec("json-binary", "codenames.json-binary", binary=True),
+}
+if msgpack is not None:
+    CODECS[MsgpackCodec.subprotocol] = MsgpackCodec()
+
+
+def negotiate(subprotocols: List[str]) -> Codec:
+    """Pick the first subprotocol offered by the client that we support."""
+    for subprotocol in subprotocols:
+        codec = CODECS.get(subprotocol)
+        if codec is not None:
+            return codec
+    return DEFAULT_CODEC
@@ -0,0 +1,86 @@
+import os
+import secrets
+
+
+class Settings:
+    """Runtime settings, read from CODENAMES_* environment variables."""
+
+    def __init__(self):
+        # "memory://" keeps games in this process; "sqlite:///path/to/games.db"
+        # shares them between workers on the same machine.
+        self.store_url = os.environ.get("CODENAMES_STORE", "memory://")
+        # "unix:///path/to/broker.sock" relays broadcasts between workers.
+        # Empty means a single worker with no pub/sub.
+        self.broker_url = os.environ.get("CODENAMES_BROKER", "")
+        # Directory for the command log and snapshots used to recover games
+        # after a restart. Empty disables persistence.
+        self.data_dir = os.environ.get("CODENAMES_DATA_DIR", "")
+        # Seconds between group commits of the command log
+        self.log_flush_interval = float(os.environ.get("CODENAMES_LOG_FLUSH_INTERVAL", "0.05"))
+        # SQLite file finished games are archived to, for stats. Empty disables it.
+        self.archive_path = os.environ.get("CODENAMES_ARCHIVE", "")
+        # Seconds between batched writes to the archive
+        self.archive_flush_interval = float(os.environ.get("CODENAMES_ARCHIVE_FLUSH_INTERVAL", "0.5"))
+        # Seconds between snapshots, which bound replay time on startup
+        self.snapshot_interval = float(os.environ.get("CODENAMES_SNAPSHOT_INTERVAL", "300"))
+        # Seconds a room may go without activity before it is deleted, by state
+        self.lobby_ttl = float(os.environ.get("CODENAMES_LOBBY_TTL", "1800"))
+        self.in_progress_ttl = float(os.environ.get("CODENAMES_IN_PROGRESS_TTL", "7200"))
+        self.finished_ttl = float(os.environ.get("CODENAMES_FINISHED_TTL", "900"))
+        # Live rooms kept in memory before the least recently active are evicted
+        self.max_rooms = int(os.environ.get("CODENAMES_MAX_ROOMS", "100000"))
+        # Seconds between reaper passes
+        self.reap_interval = float(os.environ.get("CODENAMES_REAP_INTERVAL", "30"))
+        # Token-bucket limits on inbound messages as "type=rate/burst,...",
+        # where "*" covers unlisted types; per connection and per room
+        self.rate_limits = os.environ.get(
+            "CODENAMES_RATE_LIMITS",
+            "join_game=1/3,assign_role=2/5,start_game=0.5/2,reset_game=0.5/2,*=10/20",
+        )
+        self.room_rate_limits = os.environ.get(
+            "CODENAMES_ROOM_RATE_LIMITS",
+            "start_game=0.5/3,reset_game=0.2/3,*=40/80",
+        )
+        # Rejected messages a connection may accumulate (recovering one per
+        # second) before it is disconnected
+        self.rate_limit_strikes = float(os.environ.get("CODENAMES_RATE_LIMIT_STRIKES", "20"))
+        # Seconds a disconnected player's seat is held for them to resume
+        self.resume_grace = float(os.environ.get("CODENAMES_RESUME_GRACE", "60"))
+        # Signs resume tokens. Set it to the same value on every worker so
+        # players can resume on any of them; by default it is per process.
+        self.session_secret = os.environ.get("CODENAMES_SESSION_SECRET") or secrets.token_hex(32)
+        # Recent deltas kept per game to catch up reconnecting clients
+        self.replay_buffer = int(os.environ.get("CODENAMES_REPLAY_BUFFER", "64"))
+        # Seconds a WebSocket may stay silent before it is pinged; 0 disables pings
+        self.heartbeat_interval = float(os.environ.get("CODENAMES_HEARTBEAT_INTERVAL", "30"))
+        # Seconds to wait for any frame after a ping before dropping the connection
+        self.heartbeat_timeout = float(os.environ.get("CODENAMES_HEARTBEAT_TIMEOUT", "10"))
+        # Longest a long poll for game state waits before answering 304
+        self.long_poll_timeout = float(os.environ.get("CODENAMES_LONG_POLL_TIMEOUT", "25"))
+        # Players, bots included, a room seats
+        self.max_players = int(os.environ.get("CODENAMES_MAX_PLAYERS", "12"))
+        # Seconds between lobby feed updates, which batch all changes since the last
+        self.lobby_feed_interval = float(os.environ.get("CODENAMES_LOBBY_FEED_INTERVAL", "0.5"))
+        # Bearer token for the /api/admin diagnostics. Empty disables them.
+        self.admin_token = os.environ.get("CODENAMES_ADMIN_TOKEN", "")
+        # Directory of <name>.pack word packs, mapped on first use. The
+        # built-in "standard" pack is always available.
+        self.word_pack_dir = os.environ.get("CODENAMES_WORD_PACK_DIR", "")
+        # Boards a room remembers so their words aren't dealt again
+        self.word_history = int(os.environ.get("CODENAMES_WORD_HISTORY", "5"))
+        # Path prefix of <prefix>.npy vectors and their <prefix>.pack vocabulary
+        # for bot spymasters. Empty disables bots.
+        self.ai_embeddings = os.environ.get("CODENAMES_AI_EMBEDDINGS", "")
+        # Threads computing bot clues
+        self.ai_workers = int(os.environ.get("CODENAMES_AI_WORKERS", "2"))
+        # Boards whose vocabulary similarities are kept between turns
+        self.ai_cache_boards = int(os.environ.get("CODENAMES_AI_CACHE_BOARDS", "32"))
+        # Spectators accepted by this worker across all rooms
+        self.max_spectators = int(os.environ.get("CODENAMES_MAX_SPECTATORS", "10000"))
+        # Updates per second sent to a room's spectators
+        self.spectator_max_fps = float(os.environ.get("CODENAMES_SPECTATOR_MAX_FPS", "2"))
+        # Seconds the spectator spymaster view lags behind; 0 disables that view
+        self.spectator_delay = float(os.environ.get("CODENAMES_SPECTATOR_DELAY", "30"))
+
+
+settings = Settings()
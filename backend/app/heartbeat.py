@@ -0,0 +1,157 @@
+"""Application-level ping/pong for finding dead WebSocket connections.
+
+Every frame a client sends counts as a sign of life. A connection that
+has been silent for `interval` seconds is sent {"type": "ping"}, and
+clients answer {"type": "pong"}. One still silent `timeout` seconds
+after its ping is expired: its handler task is cancelled and leaves
+through the normal disconnect path, so a half-open socket can't hold a
+seat or keep a room alive.
+
+Connections wait in a timer wheel rather than each having a sleeping
+task: one loop advances the wheel a slot per tick and visits only the
+connections due in it. An idle connection costs one visit and one ping
+per interval. A busy one costs a timestamp per frame it sends.
+"""
+import asyncio
+import math
+import time
+from typing import Dict, Hashable, List, Optional, Set
+
+from .codecs import Codec, Frame
+from .config import settings
+
+
+class TimerWheel:
+    """Items due after a delay, bucketed by tick. Scheduling and cancelling are O(1)."""
+
+    def __init__(self, tick: float, span: float):
+        self.tick = tick
+        # One slot per tick of the longest delay, plus the current one
+        self.slots: List[Set[Hashable]] = [set() for _ in range(math.ceil(span / tick) + 1)]
+        self.cursor = 0
+        self._slot_of: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._slot_of
+
+    def schedule(self, item: Hashable, delay: float):
+        """Make an item due after `delay` seconds, rounded up to whole ticks (at least one)."""
+        self.cancel(item)
+        self.insert(item, delay)
+
+    def insert(self, item: Hashable, delay: float):
+        """schedule() for an item known not to be in the wheel, such as one just popped."""
+        slots = self.slots
+        ticks = math.ceil(delay / self.tick) or 1
+        if ticks >= len(slots):
+            ticks = len(slots) - 1
+        index = (self.cursor + ticks) % len(slots)
+        slots[index].add(item)
+        self._slot_of[item] = index
+
+    def cancel(self, item: Hashable):
+        index = self._slot_of.pop(item, None)
+        if index is not None:
+            self.slots[index].discard(item)
+
+    def advance(self) -> Set[Hashable]:
+        """Move on one tick and pop the items now due."""
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        due = self.slots[self.cursor]
+        self.slots[self.cursor] = set()
+        for item in due:
+            del self._slot_of[item]
+        return due
+
+
+class Heartbeat:
+    """Pings idle connections and expires those that stop answering.
+
+    Connections need a `last_seen` monotonic timestamp, `pinged_at`
+    (None until the first ping), a `failed` flag set when a write fails, `codec`, `push(frame)` and
+    `expire()`.
+    """
+
+    def __init__(self, interval: float, timeout: float, tick: float = 1.0):
+        # Seconds of silence before a ping; 0 disables the heartbeat
+        self.interval = interval
+        # Seconds to wait for any frame after a ping
+        self.timeout = timeout
+        self.wheel = TimerWheel(tick, max(interval, timeout, tick))
+        # Connections expired so far
+        self.expired = 0
+        self._pings: Dict[str, Frame] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def add(self, connection):
+        if self.enabled:
+            self.wheel.schedule(connection, self.interval)
+
+    def remove(self, connection):
+        self.wheel.cancel(connection)
+
+    def check_soon(self, connection):
+        """Visit a connection at the next tick, e.g. after a write to it failed."""
+        if connection in self.wheel:
+            self.wheel.schedule(connection, 0)
+
+    def _ping(self, codec: Codec) -> Frame:
+        frame = self._pings.get(codec.name)
+        if frame is None:
+            frame = self._pings[codec.name] = codec.encode({"type": "ping", "payload": {}})
+        return frame
+
+    def visit(self, connection, now: float):
+        """Check a connection that has just come due, popped from the wheel."""
+        pinged_at = connection.pinged_at
+        if connection.failed or (pinged_at is not None and connection.last_seen < pinged_at):
+            # Scheduled `timeout` after its ping, and nothing since
+            self.expired += 1
+            connection.expire()
+            return
+        idle = now - connection.last_seen
+        if idle >= self.interval:
+            connection.pinged_at = now
+            connection.push(self._ping(connection.codec))
+            self.wheel.insert(connection, self.timeout)
+        else:
+            self.wheel.insert(connection, self.interval - idle)
+
+    def tick(self, now: Optional[float] = None):
+        if now is None:
+            now = time.monotonic()
+        for connection in self.wheel.advance():
+            self.visit(connection, now)
+
+    async def run(self):
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            # Paced against the loop clock, so a late tick doesn't push back the rest
+            next_tick += self.wheel.tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            self.tick()
+
+
+def absorb_expiry(connection) -> bool:
+    """Call from a socket handler catching CancelledError.
+
+    Returns True, and uncancels the task, if the heartbeat expired the
+    handler's connection. The handler should then clean up as on a
+    disconnect instead of re-raising.
+    """
+    if connection is None or not connection.timed_out:
+        return False
+    asyncio.current_task().uncancel()
+    return True
+
+
+heartbeat = Heartbeat(settings.heartbeat_interval, settings.heartbeat_timeout)
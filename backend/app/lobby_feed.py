@@ -0,0 +1,125 @@
+"""Live lobby listings over WebSocket.
+
+Subscribers get a first page of public games matching their filter, then
+a `lobby_update` every CODENAMES_LOBBY_FEED_INTERVAL seconds listing the
+games that changed since the last one and the IDs of those that closed,
+went private or stopped matching. Subscribers with the same filter and
+codec share each encoded frame.
+
+With a broker, each worker also publishes the changes to its own games
+to the "lobby" room, so every worker's index lists every public game
+changed since it started.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import WebSocket
+
+from .codecs import Codec, Frame
+from .config import settings
+from .metrics import fanout_seconds
+from .services.game_service import game_service
+from .services.lobby import Change, LobbyEntry, LobbyFilter, LobbyIndex
+from .websocket_manager import Connection
+
+# Broker room carrying index changes between workers
+LOBBY_ROOM = "lobby"
+
+
+class Subscriber:
+    __slots__ = ("connection", "where", "limit")
+
+    def __init__(self, connection: Connection, where: LobbyFilter, limit: int):
+        self.connection = connection
+        self.where = where
+        self.limit = limit
+
+
+class LobbyFeed:
+    """Pushes batched lobby index changes to subscribed sockets."""
+
+    def __init__(self, lobby: LobbyIndex, interval: float = 0.5, max_queue: int = 8):
+        self.lobby = lobby
+        self.interval = interval
+        self.max_queue = max_queue
+        self.subscribers: Dict[WebSocket, Subscriber] = {}
+        self._manager = None
+
+    def page_frame(self, where: LobbyFilter, limit: int, codec: Codec) -> Frame:
+        page, cursor = self.lobby.query(where, limit)
+        return codec.encode({
+            "type": "lobby",
+            "payload": {"games": [entry.to_dict() for entry in page], "next": cursor},
+        })
+
+    async def connect(self, websocket: WebSocket, where: LobbyFilter, limit: int, codec: Codec):
+        await websocket.accept(subprotocol=codec.subprotocol)
+        connection = Connection(websocket, "", "", self.max_queue, codec)
+        connection.start()
+        self.subscribers[websocket] = Subscriber(connection, where, limit)
+        connection.push_state(self.page_frame(where, limit, codec), True)
+
+    def disconnect(self, websocket: WebSocket):
+        subscriber = self.subscribers.pop(websocket, None)
+        if subscriber is not None:
+            subscriber.connection.close()
+
+    def attach(self, manager):
+        """Exchange index changes with other workers through the manager's broker."""
+        self._manager = manager
+        manager.on_remote(LOBBY_ROOM, self._apply_remote)
+
+    def _apply_remote(self, data: dict):
+        for game in data["games"]:
+            self.lobby.put(LobbyEntry.from_dict(game), local=False)
+        for game_id in data["removed"]:
+            self.lobby.remove(game_id, local=False)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    async def flush(self):
+        """Send the changes since the last flush to subscribers and other workers."""
+        changes, local = self.lobby.drain_changes()
+        if not changes:
+            return
+
+        broker = self._manager.broker if self._manager is not None else None
+        if broker is not None and local:
+            await broker.publish(LOBBY_ROOM, {
+                "games": [entry.to_dict() for game_id, _, entry in changes if entry and game_id in local],
+                "removed": [game_id for game_id, _, entry in changes if not entry and game_id in local],
+            })
+
+        start = time.perf_counter()
+        frames: Dict[Tuple[tuple, str], Optional[Frame]] = {}
+        for subscriber in list(self.subscribers.values()):
+            connection, where = subscriber.connection, subscriber.where
+            key = (where.values, connection.codec.name)
+            if key not in frames:
+                frames[key] = self._update_frame(where, changes, connection.codec)
+            frame = frames[key]
+            # A subscriber too far behind gets a fresh first page instead
+            if frame is not None and connection.push_state(frame, False) < 0:
+                connection.push_state(self.page_frame(where, subscriber.limit, connection.codec), True)
+        if self.subscribers:
+            fanout_seconds.observe("lobby", time.perf_counter() - start)
+
+    @staticmethod
+    def _update_frame(where: LobbyFilter, changes: List[Change], codec: Codec) -> Optional[Frame]:
+        games, removed = [], []
+        for game_id, old_key, entry in changes:
+            if entry is not None and where.matches(entry):
+                games.append(entry.to_dict())
+            elif old_key is not None and where.matches_key(old_key):
+                # Matched before, so the subscriber may be showing it
+                removed.append(game_id)
+        if not games and not removed:
+            return None
+        return codec.encode({"type": "lobby_update", "payload": {"games": games, "removed": removed}})
+
+
+lobby_feed = LobbyFeed(game_service.lobby, settings.lobby_feed_interval)
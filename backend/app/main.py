@@ -1,12 +1,85 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from .config import settings
+from .heartbeat import heartbeat
+from .metrics import COUNT_BUCKETS, loop_lag, registry
+from .pubsub import create_broker
+from .lobby_feed import lobby_feed
+from .routers import admin_router, game_router, lobby_router, stats_router, websocket_router
+from .routers.websocket import turn_expired
+from .services.archive import GameArchive
+from .services.event_log import EventLog
+from .services.game_service import game_service
+from .services.spymaster_ai import spymaster_ai
+from .websocket_manager import manager
+
+
+async def snapshot_loop():
+    while True:
+        await asyncio.sleep(settings.snapshot_interval)
+        await game_service.write_snapshot()
+
+
+async def reap_loop():
+    while True:
+        await asyncio.sleep(settings.reap_interval)
+        evicted = game_service.reap(lambda game_id: manager.get_connection_count(game_id) > 0)
+        for game_id in evicted:
+            await manager.close_room(game_id, 4010, "Room expired")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background = []
+
+    if settings.data_dir:
+        log = EventLog(settings.data_dir, flush_interval=settings.log_flush_interval)
+        game_service.recover(log)
+        log.start()
+        # Compact the replayed tail straight away
+        await game_service.write_snapshot()
+        background.append(asyncio.create_task(snapshot_loop()))
+
+    if settings.archive_path:
+        game_service.archive = GameArchive(settings.archive_path, settings.archive_flush_interval)
+        game_service.archive.start()
+
+    broker = create_broker(settings.broker_url)
+    if broker is not None:
+        await manager.attach_broker(broker, game_service)
+    lobby_feed.attach(manager)
+
+    spymaster_ai.start()
+    game_service.timers.start(turn_expired)
+    background.append(asyncio.create_task(reap_loop()))
+    background.append(asyncio.create_task(lobby_feed.run()))
+    background.append(asyncio.create_task(heartbeat.run()))
+    background.append(asyncio.create_task(loop_lag.run()))
+
+    yield
+
+    for task in background:
+        task.cancel()
+    game_service.timers.stop()
+    if broker is not None:
+        await broker.stop()
+    if game_service.log is not None:
+        game_service.log.close()
+    if game_service.archive is not None:
+        game_service.archive.close()
+    spymaster_ai.close()
 
-from .routers import game_router, websocket_router
 
 app = FastAPI(
     title="Codenames API",
     description="Backend API for the Codenames multiplayer game",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -20,6 +93,10 @@ app.add_middleware(
 
 # Include routers
 app.include_router(game_router)
+# Before the game socket route, which would otherwise match /ws/lobby
+app.include_router(lobby_router)
+app.include_router(stats_router)
+app.include_router(admin_router)
 app.include_router(websocket_router)
 
 
@@ -30,4 +107,49 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    reaper = game_service.reaper
+    return {
+        "status": "healthy",
+        "rooms": len(reaper) if reaper is not None else None,
+        "evictions": reaper.evictions if reaper is not None else None,
+    }
+
+
+def _games_by_state() -> dict:
+    reaper = game_service.reaper
+    return reaper.counts() if reaper is not None else {}
+
+
+def _players_per_room() -> list:
+    # Rooms with sockets on this worker; other workers report their own
+    counts = []
+    for game_id in manager.active_connections:
+        game = game_service.get_game(game_id)
+        if game:
+            counts.append(len(game.players))
+    return counts
+
+
+registry.gauge("codenames_games", "Live games by state", _games_by_state, label="state")
+registry.gauge("codenames_connections", "Open WebSocket connections", lambda: len(manager.connection_info))
+registry.gauge("codenames_spectators", "Open spectator connections", lambda: len(manager.spectator_info))
+registry.gauge("codenames_rooms_connected", "Rooms with at least one connection", lambda: len(manager.active_connections))
+registry.gauge(
+    "codenames_archive_pending", "Finished games waiting to be written to the archive",
+    lambda: game_service.archive.pending if game_service.archive is not None else 0,
+)
+registry.gauge("codenames_turn_timers", "Timed turns waiting on their deadline", lambda: len(game_service.timers))
+registry.gauge("codenames_heartbeat_watched", "Connections watched by the heartbeat", lambda: len(heartbeat.wheel))
+registry.gauge(
+    "codenames_heartbeat_expired", "Connections dropped since startup for not answering pings",
+    lambda: heartbeat.expired,
+)
+registry.sampled_histogram(
+    "codenames_players_per_room", "Players in rooms with connections on this worker",
+    COUNT_BUCKETS, _players_per_room,
+)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,210 @@
+"""In-process metrics exposed at /metrics in the Prometheus text format.
+
+Histograms use fixed buckets, so recording a value is a bisect and two
+additions with no allocation. Gauges are callbacks evaluated at scrape
+time, so they cost nothing between scrapes.
+"""
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+BYTES_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+GaugeValue = Union[float, Dict[str, float]]
+
+
+class Histogram:
+    """Cumulative-bucket histogram for one label value."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        # One count per bound plus the +Inf bucket
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class LabeledHistogram:
+    """A histogram family with one child per value of a single label."""
+
+    def __init__(self, name: str, help: str, bounds: Sequence[float], label: str):
+        self.name = name
+        self.help = help
+        self.bounds = bounds
+        self.label = label
+        self.children: Dict[str, Histogram] = {}
+
+    def observe(self, label_value: str, value: float):
+        child = self.children.get(label_value)
+        if child is None:
+            child = self.children[label_value] = Histogram(self.bounds)
+        child.observe(value)
+
+    def render(self, lines: List[str]):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        for label_value, child in sorted(self.children.items()):
+            _render_buckets(lines, self.name, f'{self.label}="{label_value}",', child)
+
+
+class LabeledCounter:
+    """A counter family keyed by a tuple of label values."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: Dict[tuple, int] = {}
+
+    def inc(self, *label_values: str):
+        self.values[label_values] = self.values.get(label_values, 0) + 1
+
+    def render(self, lines: List[str]):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} counter")
+        for label_values, value in sorted(self.values.items()):
+            labels = ",".join(f'{label}="{v}"' for label, v in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{labels}}} {value}" if labels else f"{self.name} {value}")
+
+
+class Gauge:
+    """A value computed by a callback at scrape time, optionally split by one label."""
+
+    def __init__(self, name: str, help: str, read: Callable[[], GaugeValue], label: Optional[str] = None):
+        self.name = name
+        self.help = help
+        self.read = read
+        self.label = label
+
+    def render(self, lines: List[str]):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} gauge")
+        value = self.read()
+        if self.label is None:
+            lines.append(f"{self.name} {value}")
+            return
+        for label_value, item in sorted(value.items()):
+            lines.append(f'{self.name}{{{self.label}="{label_value}"}} {item}')
+
+
+class SampledHistogram:
+    """A histogram rebuilt from a callback's values at scrape time."""
+
+    def __init__(self, name: str, help: str, bounds: Sequence[float], read: Callable[[], List[float]]):
+        self.name = name
+        self.help = help
+        self.bounds = bounds
+        self.read = read
+
+    def render(self, lines: List[str]):
+        histogram = Histogram(self.bounds)
+        for value in self.read():
+            histogram.observe(value)
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        _render_buckets(lines, self.name, "", histogram)
+
+
+def _render_buckets(lines: List[str], name: str, labels: str, histogram: Histogram):
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+    cumulative += histogram.counts[-1]
+    lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {cumulative}')
+    suffix = f"{{{labels[:-1]}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {cumulative}")
+
+
+class Registry:
+    """All metrics exposed by this process."""
+
+    def __init__(self):
+        self.metrics: list = []
+
+    def histogram(self, name: str, help: str, bounds: Sequence[float], label: str) -> LabeledHistogram:
+        metric = LabeledHistogram(name, help, bounds, label)
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str]) -> LabeledCounter:
+        metric = LabeledCounter(name, help, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, help: str, read: Callable[[], GaugeValue], label: Optional[str] = None):
+        self.metrics.append(Gauge(name, help, read, label))
+
+    def sampled_histogram(self, name: str, help: str, bounds: Sequence[float], read: Callable[[], List[float]]):
+        self.metrics.append(SampledHistogram(name, help, bounds, read))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            metric.render(lines)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+handler_seconds = registry.histogram(
+    "codenames_handler_seconds", "WebSocket message handling time, including the game lock wait",
+    LATENCY_BUCKETS, "type",
+)
+fanout_seconds = registry.histogram(
+    "codenames_fanout_seconds", "Time to encode and queue a broadcast for a room",
+    LATENCY_BUCKETS, "kind",
+)
+frame_bytes = registry.histogram(
+    "codenames_frame_bytes", "Size of encoded outbound frames",
+    BYTES_BUCKETS, "kind",
+)
+timer_lag_seconds = registry.histogram(
+    "codenames_turn_timer_lag_seconds",
+    "How long after a turn deadline its timer fired, and its turn change was broadcast",
+    LATENCY_BUCKETS, "stage",
+)
+rate_limited = registry.counter(
+    "codenames_rate_limited_total", "Messages rejected by a rate limit", ("scope", "type"),
+)
+rate_limit_disconnects = registry.counter(
+    "codenames_rate_limit_disconnects_total", "Connections closed for repeatedly exceeding rate limits", (),
+)
+
+
+class LoopLagProbe:
+    """Measures how late the event loop wakes a task that sleeps for a fixed interval."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.last = 0.0
+        self.histogram = Histogram(LATENCY_BUCKETS)
+
+    async def run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.last = max(0.0, time.perf_counter() - start - self.interval)
+            self.histogram.observe(self.last)
+
+    def render(self, lines: List[str]):
+        name = "codenames_event_loop_lag_seconds"
+        lines.append(f"# HELP {name} How late the event loop woke a periodic probe")
+        lines.append(f"# TYPE {name} histogram")
+        _render_buckets(lines, name, "", self.histogram)
+        lines.append(f"# HELP {name}_last Lag measured by the latest probe")
+        lines.append(f"# TYPE {name}_last gauge")
+        lines.append(f"{name}_last {self.last}")
+
+
+loop_lag = LoopLagProbe()
+registry.metrics.append(loop_lag)
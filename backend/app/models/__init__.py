@@ -1,5 +1,14 @@
+from .board import Board
 from .card import Card, CardType
 from .player import Player, Role, Team
 from .game import Game, GameState, Clue
+from .messages import (
+    AddBot, AssignRole, ClientMessage, EndTurn, GiveClue, JoinGame, Pong, ResetGame, RevealCard, Resync,
+    StartGame, client_message,
+)
 
-__all__ = ["Card", "CardType", "Player", "Role", "Team", "Game", "GameState", "Clue"]
+__all__ = [
+    "Board", "Card", "CardType", "Player", "Role", "Team", "Game", "GameState", "Clue",
+    "AddBot", "AssignRole", "ClientMessage", "EndTurn", "GiveClue", "JoinGame", "Pong", "ResetGame",
+    "RevealCard", "Resync", "StartGame", "client_message",
+]
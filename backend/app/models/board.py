@@ -0,0 +1,120 @@
+import random
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+from ..utils.word_packs import DEFAULT_PACK, word_packs
+from .card import CardType
+from .player import Team
+
+# Card types are stored as one byte each, indexed by these codes; teams use
+# the codes of their cards
+CARD_TYPES = [CardType.RED, CardType.BLUE, CardType.NEUTRAL, CardType.ASSASSIN]
+TYPE_CODES = {card_type: code for code, card_type in enumerate(CARD_TYPES)}
+RED, BLUE, NEUTRAL, ASSASSIN = range(4)
+TEAMS = [Team.RED, Team.BLUE]
+
+BOARD_SIZE = 25
+
+# What a guess leads to, from Board.outcome()
+CONTINUE, TURN_OVER, ASSASSINATED, CLEARED = range(4)
+# Reasons given for game_over, by outcome
+GAME_OVER_REASONS = {ASSASSINATED: "assassin", CLEARED: "all_cards_revealed"}
+
+
+def deal(rng: random.Random = random) -> Tuple[bytes, int]:
+    """Deal card types: 9 for the starting team, 8 for the other, 7 neutral and the assassin.
+
+    Returns the type codes by position and the starting team's code.
+    """
+    starting = rng.choice((RED, BLUE))
+    codes = [starting] * 9 + [BLUE - starting] * 8 + [NEUTRAL] * 7 + [ASSASSIN]
+    rng.shuffle(codes)
+    return bytes(codes), starting
+
+
+def guesses_for(number: int) -> int:
+    """Guesses a clue allows: its number plus one."""
+    return number + 1
+
+
+class Board:
+    """Compact 5x5 board: word indices, a type byte per card and a revealed bitmask.
+
+    Remaining unrevealed cards per team are kept as counters, so win checks
+    don't rescan the board. Words are stored as indices into a word pack
+    and only resolved when building API payloads.
+    """
+
+    __slots__ = ("words", "pack", "types", "revealed", "remaining")
+
+    def __init__(self, words: Sequence[int], types: bytes, revealed: int = 0, pack: str = DEFAULT_PACK):
+        self.words = array("I", words)
+        self.pack = word_packs.get(pack)
+        self.types = bytearray(types)
+        self.revealed = revealed
+        # Unrevealed cards left for red and blue
+        if not revealed:
+            self.remaining = [self.types.count(RED), self.types.count(BLUE)]
+            return
+        self.remaining = [0, 0]
+        for position, code in enumerate(self.types):
+            if code <= BLUE and not revealed >> position & 1:
+                self.remaining[code] += 1
+
+    def is_revealed(self, position: int) -> bool:
+        return bool(self.revealed >> position & 1)
+
+    def reveal(self, position: int) -> int:
+        """Reveal a card and return its type code."""
+        self.revealed |= 1 << position
+        code = self.types[position]
+        if code <= BLUE:
+            self.remaining[code] -= 1
+        return code
+
+    def outcome(self, code: int, team: int, guesses_remaining: int) -> Tuple[int, Optional[int]]:
+        """What revealing a card of type `code` means for the guessing team.
+
+        Returns the outcome and, if the game is over, the winning team's code.
+        """
+        if code == ASSASSIN:
+            return ASSASSINATED, BLUE - team
+        if not self.remaining[RED]:
+            return CLEARED, RED
+        if not self.remaining[BLUE]:
+            return CLEARED, BLUE
+        if code != team or guesses_remaining <= 0:
+            return TURN_OVER, None
+        return CONTINUE, None
+
+    def word(self, position: int) -> str:
+        return self.pack[self.words[position]]
+
+    def card_dict(self, position: int, show_type: bool = True) -> dict:
+        """Card payload in the shape of Card.model_dump()."""
+        return {
+            "word": self.word(position),
+            "type": CARD_TYPES[self.types[position]].value if show_type else None,
+            "revealed": self.is_revealed(position),
+            "position": position,
+        }
+
+    def card_dicts(self, is_spymaster: bool) -> List[dict]:
+        """All card payloads, with unrevealed types hidden from operatives."""
+        revealed = self.revealed
+        return [
+            self.card_dict(position, is_spymaster or bool(revealed >> position & 1))
+            for position in range(len(self.types))
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "words": list(self.words),
+            "pack": self.pack.name,
+            "types": self.types.hex(),
+            "revealed": self.revealed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Board":
+        return cls(data["words"], bytes.fromhex(data["types"]), data["revealed"], data.get("pack", DEFAULT_PACK))
@@ -1,10 +1,12 @@
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
 
+from .board import Board
 from .card import Card
 from .player import Player, Team
+from ..utils.word_packs import DEFAULT_PACK
 
 
 class GameState(str, Enum):
@@ -20,9 +22,11 @@ class Clue(BaseModel):
 
 
 class Game(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     id: str
     state: GameState = GameState.LOBBY
-    cards: List[Card] = Field(default_factory=list)
+    board: Optional[Board] = None
     players: Dict[str, Player] = Field(default_factory=dict)
     current_team: Optional[Team] = None
     starting_team: Optional[Team] = None
@@ -30,18 +34,42 @@ class Game(BaseModel):
     guesses_remaining: int = 0
     winner: Optional[Team] = None
     clue_history: List[Clue] = Field(default_factory=list)
+    # Card positions in the order they were revealed
+    reveal_order: List[int] = Field(default_factory=list)
+    word_pack: str = DEFAULT_PACK
+    # Listed in the public lobby
+    public: bool = False
+    # Seconds a spymaster has to give a clue, and operatives to guess after
+    # it, before the turn passes; 0 means no limit
+    clue_seconds: int = 0
+    guess_seconds: int = 0
+    # When the current phase of the turn runs out (Unix time), if timed
+    turn_deadline: Optional[float] = None
+    # Word indices dealt in the room's last few boards, kept out of the next one
+    recent_words: List[int] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    version: int = 0  # Bumped by GameService on every mutation
+
+    @field_serializer("board")
+    def _serialize_board(self, board: Optional[Board]) -> Optional[dict]:
+        return board.to_dict() if board else None
+
+    @field_validator("board", mode="before")
+    @classmethod
+    def _validate_board(cls, value: Any) -> Optional[Board]:
+        return Board.from_dict(value) if isinstance(value, dict) else value
+
+    @property
+    def cards(self) -> List[Card]:
+        """The board as Card models (built on demand)."""
+        if not self.board:
+            return []
+        return [Card(**self.board.card_dict(i)) for i in range(len(self.board.types))]
 
     def get_cards_for_role(self, is_spymaster: bool) -> List[dict]:
         """Return cards with type hidden for operatives (unrevealed cards)."""
-        result = []
-        for card in self.cards:
-            card_dict = card.model_dump()
-            if not is_spymaster and not card.revealed:
-                card_dict["type"] = None
-            result.append(card_dict)
-        return result
+        return self.board.card_dicts(is_spymaster) if self.board else []
 
     def count_remaining(self, team: Team) -> int:
         """Count remaining unrevealed cards for a team."""
-        return sum(1 for card in self.cards if card.type.value == team.value and not card.revealed)
+        return self.board.remaining[0 if team == Team.RED else 1] if self.board else 0
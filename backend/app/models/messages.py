@@ -0,0 +1,93 @@
+from typing import Annotated, Literal, Union
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter
+
+from .player import Role, Team
+
+
+class EmptyPayload(BaseModel):
+    # Frozen, so one instance can be the default without pydantic copying it
+    model_config = ConfigDict(frozen=True)
+
+
+NO_PAYLOAD = EmptyPayload()
+
+
+class JoinGamePayload(BaseModel):
+    player_name: str = "Anonymous"
+
+
+class AssignRolePayload(BaseModel):
+    team: Team
+    role: Role
+
+
+class GiveCluePayload(BaseModel):
+    word: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+    number: int = Field(default=0, ge=0)
+
+
+class AddBotPayload(BaseModel):
+    team: Team
+
+
+class RevealCardPayload(BaseModel):
+    position: int
+
+
+class JoinGame(BaseModel):
+    type: Literal["join_game"] = "join_game"
+    payload: JoinGamePayload = Field(default_factory=JoinGamePayload)
+
+
+class AssignRole(BaseModel):
+    type: Literal["assign_role"] = "assign_role"
+    payload: AssignRolePayload
+
+
+class AddBot(BaseModel):
+    type: Literal["add_bot"] = "add_bot"
+    payload: AddBotPayload
+
+
+class StartGame(BaseModel):
+    type: Literal["start_game"] = "start_game"
+    payload: EmptyPayload = NO_PAYLOAD
+
+
+class GiveClue(BaseModel):
+    type: Literal["give_clue"] = "give_clue"
+    payload: GiveCluePayload
+
+
+class RevealCard(BaseModel):
+    type: Literal["reveal_card"] = "reveal_card"
+    payload: RevealCardPayload
+
+
+class EndTurn(BaseModel):
+    type: Literal["end_turn"] = "end_turn"
+    payload: EmptyPayload = NO_PAYLOAD
+
+
+class ResetGame(BaseModel):
+    type: Literal["reset_game"] = "reset_game"
+    payload: EmptyPayload = NO_PAYLOAD
+
+
+class Resync(BaseModel):
+    type: Literal["resync"] = "resync"
+    payload: EmptyPayload = NO_PAYLOAD
+
+
+class Pong(BaseModel):
+    type: Literal["pong"] = "pong"
+    payload: EmptyPayload = NO_PAYLOAD
+
+
+ClientMessage = Annotated[
+    Union[JoinGame, AssignRole, AddBot, StartGame, GiveClue, RevealCard, EndTurn, ResetGame, Resync, Pong],
+    Field(discriminator="type"),
+]
+
+# Built once at import; validates a whole frame, JSON parsing included, in one pass
+client_message = TypeAdapter(ClientMessage)
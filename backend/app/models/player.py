@@ -18,3 +18,7 @@ class Player(BaseModel):
     name: str
     team: Optional[Team] = None
     role: Optional[Role] = None
+    # Wall-clock time the player's connection dropped; None while connected
+    disconnected_at: Optional[float] = None
+    # Bot spymasters have no connection and give clues from the server
+    is_bot: bool = False
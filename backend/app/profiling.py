@@ -0,0 +1,218 @@
+"""On-demand diagnostics for a worker: CPU stack sampling, allocation diffs and object sizes.
+
+Nothing here runs until an admin asks for it. The CPU profiler samples
+the event loop's stack from a SIGPROF timer, so handlers carry no
+instrumentation and cost nothing extra while no profile is being taken.
+"""
+import asyncio
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from enum import Enum
+from types import CodeType, FrameType
+from typing import Dict, List, Optional, Tuple
+
+from .utils.word_packs import WordPack
+
+# Shared objects that must not be counted towards any one room
+_SHARED = (type, Enum, WordPack)
+
+
+def deep_sizeof(obj) -> int:
+    """Approximate bytes held by an object and everything it references, not counting shared objects."""
+    seen = set()
+    pending = [obj]
+    size = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED) or obj is None:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float)):
+            continue
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            pending.extend(obj)
+        for cls in type(obj).__mro__:
+            for slot in cls.__dict__.get("__slots__", ()):
+                value = getattr(obj, slot, None)
+                if value is not None:
+                    pending.append(value)
+        if hasattr(obj, "__dict__"):
+            pending.append(vars(obj))
+    return size
+
+
+def _describe(code: CodeType) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_qualname}:{code.co_firstlineno}"
+
+
+class StackSampler:
+    """Samples the event loop's Python stack every `interval` seconds of CPU time.
+
+    Each sample is put down to the innermost frame of a labelled function
+    (a message handler, say), or to "idle" when the loop is waiting in the
+    selector while other threads use the CPU, or "other". The function's
+    `game_id` argument, or its object's, attributes it to a room.
+
+    The loop is interrupted by SIGPROF, which needs it to run on the main
+    thread, as it does under uvicorn. Elsewhere a thread reads its stack
+    instead; that thread only gets to look while the loop has released
+    the GIL, mostly in the selector, so it over-reports "idle".
+    """
+
+    def __init__(self, interval: float, labels: Dict[CodeType, str]):
+        self.interval = interval
+        self.labels = labels
+        self.mode = ""
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self.handlers: Counter = Counter()
+        self.rooms: Counter = Counter()
+
+    def record(self, frame: Optional[FrameType]):
+        if frame is None:
+            return
+        self.samples += 1
+        innermost = frame
+        codes: List[CodeType] = []
+        label = room = None
+        while frame is not None:
+            code = frame.f_code
+            codes.append(code)
+            if label is None and code in self.labels:
+                label = self.labels[code]
+                local = frame.f_locals
+                room = local.get("game_id", getattr(local.get("self"), "game_id", None))
+            frame = frame.f_back
+        if label is None:
+            idle = innermost.f_code.co_name == "select" and innermost.f_code.co_filename.endswith("selectors.py")
+            label = "idle" if idle else "other"
+        self.handlers[label] += 1
+        if room is not None:
+            self.rooms[room] += 1
+        codes.reverse()
+        self.stacks[(label, tuple(codes))] += 1
+
+    async def run(self, seconds: float):
+        """Sample the running loop for `seconds` of wall time."""
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, "setitimer"):
+            self.mode = "signal"
+            previous = signal.signal(signal.SIGPROF, lambda signum, frame: self.record(frame))
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                signal.setitimer(signal.ITIMER_PROF, 0)
+                signal.signal(signal.SIGPROF, previous)
+        else:
+            self.mode = "thread"
+            await asyncio.to_thread(self._run_thread, threading.get_ident(), seconds)
+
+    def _run_thread(self, thread_id: int, seconds: float):
+        deadline = time.perf_counter() + seconds
+        next_sample = time.perf_counter()
+        while next_sample < deadline:
+            self.record(sys._current_frames().get(thread_id))
+            next_sample += self.interval
+            time.sleep(max(0.0, next_sample - time.perf_counter()))
+
+    def report(self, limit: int) -> dict:
+        """Samples per handler and room, the heaviest stacks and functions by own and total samples."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for (_, codes), count in self.stacks.items():
+            own[codes[-1]] += count
+            for code in set(codes):
+                total[code] += count
+        return {
+            "mode": self.mode,
+            "samples": self.samples,
+            "intervalMs": self.interval * 1e3,
+            "handlers": dict(self.handlers.most_common()),
+            "rooms": [{"gameId": room, "samples": count} for room, count in self.rooms.most_common(limit)],
+            # Collapsed "root;...;leaf" stacks, as flame graph tools take them
+            "stacks": [
+                {"handler": label, "samples": count, "stack": ";".join(_describe(code) for code in codes)}
+                for (label, codes), count in self.stacks.most_common(limit)
+            ],
+            "functions": [
+                {"function": _describe(code), "self": count, "total": total[code]}
+                for code, count in own.most_common(limit)
+            ],
+        }
+
+
+class AllocationTracker:
+    """tracemalloc snapshots, each diffed against the one before.
+
+    Tracing starts with the first snapshot and slows allocation until
+    stop() is called.
+    """
+
+    FILTERS = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ]
+
+    def __init__(self):
+        self._last: Optional[tracemalloc.Snapshot] = None
+        self._taken_at = 0.0
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def snapshot(self, frames: int, group_by: str, limit: int) -> dict:
+        """Take a snapshot and return the allocations that grew most since the previous one."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._last = None
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+        now = time.time()
+        current, peak = tracemalloc.get_traced_memory()
+        result = {"tracedBytes": current, "peakBytes": peak, "since": None, "diff": []}
+        if self._last is not None:
+            result["since"] = self._taken_at
+            stats: List[tracemalloc.StatisticDiff] = snapshot.compare_to(self._last, group_by)
+            result["diff"] = [
+                {
+                    "where": [str(frame) for frame in stat.traceback],
+                    "sizeDiff": stat.size_diff,
+                    "size": stat.size,
+                    "countDiff": stat.count_diff,
+                    "count": stat.count,
+                }
+                for stat in stats[:limit]
+            ]
+        self._last, self._taken_at = snapshot, now
+        return result
+
+    def stop(self):
+        tracemalloc.stop()
+        self._last = None
+
+
+async def room_sizes(games: List[Tuple[str, object]]) -> Dict[str, int]:
+    """Approximate bytes per game, for (game_id, game) pairs.
+
+    Games are only mutated on the event loop, so each one is walked there in
+    a single step and never seen half-changed; the loop is yielded between
+    games so a large registry doesn't stall play.
+    """
+    sizes = {}
+    for game_id, game in games:
+        sizes[game_id] = deep_sizeof(game)
+        await asyncio.sleep(0)
+    return sizes
+
+
+allocations = AllocationTracker()
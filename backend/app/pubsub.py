@@ -0,0 +1,134 @@
+"""Cross-worker pub/sub so broadcasts reach sockets held by other workers.
+
+The broker is a small relay listening on a Unix socket. Each worker keeps
+one connection to it, subscribes to the rooms it has sockets for, and
+publishes its broadcasts; the relay forwards each message to the other
+subscribers of that room. Messages are newline-delimited JSON.
+
+Run the relay with:
+    python -m app.pubsub /tmp/codenames.sock
+"""
+import asyncio
+import json
+import logging
+import sys
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+MessageHandler = Callable[[str, dict], Awaitable[None]]
+
+logger = logging.getLogger(__name__)
+
+
+class UnixSocketBroker:
+    """A worker's connection to the relay."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def start(self, handler: MessageHandler):
+        """Connect to the relay and deliver incoming messages to handler(room, data)."""
+        reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._reader_task = asyncio.create_task(self._read_loop(reader, handler))
+
+    async def stop(self):
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+    def _send(self, message: dict):
+        if self._writer is not None:
+            self._writer.write(json.dumps(message).encode() + b"\n")
+
+    def subscribe(self, room: str):
+        self._send({"op": "sub", "room": room})
+
+    def unsubscribe(self, room: str):
+        self._send({"op": "unsub", "room": room})
+
+    async def publish(self, room: str, data: dict):
+        self._send({"op": "pub", "room": room, "data": data})
+        if self._writer is not None:
+            await self._writer.drain()
+
+    async def _read_loop(self, reader: asyncio.StreamReader, handler: MessageHandler):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                message = json.loads(line)
+                await handler(message["room"], message["data"])
+            except Exception:
+                # One bad message must not stop delivery for the whole worker
+                logger.exception("Dropped a message from the relay: %.200r", line)
+
+
+def create_broker(url: str) -> Optional[UnixSocketBroker]:
+    """Create a broker client from a URL such as unix:///tmp/codenames.sock."""
+    if not url:
+        return None
+    if url.startswith("unix://"):
+        return UnixSocketBroker(url[len("unix://"):])
+    raise ValueError(f"Unsupported broker: {url}")
+
+
+class Relay:
+    """The relay process: forwards published messages to other room subscribers."""
+
+    def __init__(self):
+        # room -> subscribed client writers
+        self.rooms: Dict[str, Set[asyncio.StreamWriter]] = {}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscribed: Set[str] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    op, room = message.get("op"), message.get("room")
+                except (ValueError, AttributeError):
+                    # A bad line is dropped rather than disconnecting the worker
+                    logger.warning("Dropped a malformed line: %.200r", line)
+                    continue
+
+                if op == "sub":
+                    self.rooms.setdefault(room, set()).add(writer)
+                    subscribed.add(room)
+                elif op == "unsub":
+                    self._unsubscribe(room, writer)
+                    subscribed.discard(room)
+                elif op == "pub":
+                    for subscriber in self.rooms.get(room, ()):
+                        if subscriber is not writer:
+                            subscriber.write(line)
+        finally:
+            for room in subscribed:
+                self._unsubscribe(room, writer)
+            writer.close()
+
+    def _unsubscribe(self, room: str, writer: asyncio.StreamWriter):
+        subscribers = self.rooms.get(room)
+        if subscribers is not None:
+            subscribers.discard(writer)
+            if not subscribers:
+                del self.rooms[room]
+
+
+async def serve(path: str):
+    relay = Relay()
+    server = await asyncio.start_unix_server(relay.handle_client, path=path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(sys.argv[1] if len(sys.argv) > 1 else "/tmp/codenames.sock"))
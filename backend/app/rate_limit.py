@@ -0,0 +1,115 @@
+"""Token-bucket rate limits on inbound WebSocket messages.
+
+Every message type has a limit per connection and per room, given as
+"rate/burst" (tokens per second / bucket size) in a spec such as
+"reveal_card=2/5,reset_game=0.2/2,*=10/20", where "*" covers types not
+listed. A message must get a token from both its connection's and its
+room's bucket. Rejections drain a separate strike bucket, and a
+connection that runs out of strikes is disconnected.
+
+Buckets refill lazily when they are checked, so each check is a few
+arithmetic operations and no timers are involved.
+"""
+import time
+from typing import Callable, Dict, Tuple
+
+from .config import settings
+from .metrics import rate_limit_disconnects, rate_limited
+
+Limit = Tuple[float, float]
+
+
+def parse_limits(spec: str) -> Dict[str, Limit]:
+    """Parse "type=rate/burst,..." into {type: (rate, burst)}."""
+    limits = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        msg_type, limit = item.split("=")
+        rate, burst = limit.split("/")
+        limits[msg_type.strip()] = (float(rate), float(burst))
+    return limits
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        """Take a token if one is available."""
+        tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if tokens < 1:
+            self.tokens = tokens
+            return False
+        self.tokens = tokens - 1
+        return True
+
+
+class ConnectionLimits:
+    """Buckets for one connection: one per message type plus its strikes."""
+
+    __slots__ = ("buckets", "strikes")
+
+    def __init__(self, strikes: TokenBucket):
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.strikes = strikes
+
+
+class RateLimiter:
+    """Checks messages against per-connection and per-room limits."""
+
+    def __init__(self, connection_limits: Dict[str, Limit], room_limits: Dict[str, Limit],
+                 strikes: float, strike_rate: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        self.connection_limits = connection_limits
+        self.room_limits = room_limits
+        self.strikes = strikes
+        self.strike_rate = strike_rate
+        self._clock = clock
+        # game_id -> message type -> bucket
+        self._rooms: Dict[str, Dict[str, TokenBucket]] = {}
+
+    def connection(self) -> ConnectionLimits:
+        """Create the limit state for a new connection."""
+        return ConnectionLimits(TokenBucket(self.strike_rate, self.strikes, self._clock()))
+
+    def _take(self, buckets: Dict[str, TokenBucket], limits: Dict[str, Limit], msg_type: str, now: float) -> bool:
+        bucket = buckets.get(msg_type)
+        if bucket is None:
+            limit = limits.get(msg_type) or limits.get("*")
+            if limit is None:
+                return True
+            bucket = buckets[msg_type] = TokenBucket(limit[0], limit[1], now)
+        return bucket.take(now)
+
+    def check(self, connection: ConnectionLimits, game_id: str, msg_type: str) -> Tuple[bool, bool]:
+        """Check a message, returning (allowed, disconnect)."""
+        now = self._clock()
+        if not self._take(connection.buckets, self.connection_limits, msg_type, now):
+            rate_limited.inc("connection", msg_type)
+        elif not self._take(self._rooms.setdefault(game_id, {}), self.room_limits, msg_type, now):
+            rate_limited.inc("room", msg_type)
+        else:
+            return True, False
+
+        if connection.strikes.take(now):
+            return False, False
+        rate_limit_disconnects.inc()
+        return False, True
+
+    def forget_room(self, game_id: str):
+        """Drop a room's buckets once it has no connections."""
+        self._rooms.pop(game_id, None)
+
+
+rate_limiter = RateLimiter(
+    parse_limits(settings.rate_limits),
+    parse_limits(settings.room_rate_limits),
+    settings.rate_limit_strikes,
+)
@@ -1,4 +1,7 @@
+from .admin import router as admin_router
 from .game import router as game_router
+from .lobby import router as lobby_router
+from .stats import router as stats_router
 from .websocket import router as websocket_router
 
-__all__ = ["game_router", "websocket_router"]
+__all__ = ["admin_router", "game_router", "lobby_router", "stats_router", "websocket_router"]
@@ -0,0 +1,108 @@
+import asyncio
+import hmac
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from ..config import settings
+from ..profiling import StackSampler, allocations, room_sizes
+from ..websocket_manager import Connection, manager
+from ..services.game_service import game_service
+from .websocket import HANDLERS, bot_turn, expire_turn, player_left, websocket_endpoint
+
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    """Admin endpoints are hidden unless CODENAMES_ADMIN_TOKEN is set, and need it as a bearer token."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.admin_token.encode()):
+        raise HTTPException(status_code=401, detail="Admin token required", headers={"WWW-Authenticate": "Bearer"})
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+# Held while a CPU profile is being taken
+_profiling = asyncio.Lock()
+
+
+def _labels() -> dict:
+    """Functions samples are attributed to, by code object: message handlers, socket I/O and server-side turns."""
+    labels = {handler.__code__: message_type for message_type, handler in HANDLERS.items()}
+    # Reading and validating frames, outside any handler
+    labels[websocket_endpoint.__code__] = "receive"
+    labels[Connection._write_loop.__code__] = "send"
+    labels[bot_turn.__code__] = "bot_turn"
+    labels[expire_turn.__code__] = "turn_timeout"
+    labels[player_left.__code__] = "player_left"
+    return labels
+
+
+@router.post("/profile")
+async def profile(
+    seconds: float = Query(10, gt=0, le=60),
+    interval_ms: float = Query(5, ge=1, le=100),
+    limit: int = Query(30, ge=1, le=500),
+):
+    """Sample the event loop's stack every `interval_ms` of CPU time for `seconds`, then report where it went.
+
+    Samples are grouped by message handler and room, with the heaviest
+    stacks in collapsed form and the functions seen most.
+    """
+    if _profiling.locked():
+        raise HTTPException(status_code=409, detail="A profile is already being taken")
+    async with _profiling:
+        sampler = StackSampler(interval_ms / 1e3, _labels())
+        await sampler.run(seconds)
+    return {"seconds": seconds, **sampler.report(limit)}
+
+
+@router.post("/tracemalloc")
+async def tracemalloc_snapshot(
+    frames: int = Query(1, ge=1, le=25),
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = Query(30, ge=1, le=500),
+):
+    """Take an allocation snapshot and diff it against the previous one.
+
+    The first call starts tracing with `frames` frames per allocation, and
+    returns no diff. Tracing slows the worker until DELETE stops it.
+    """
+    return await asyncio.to_thread(allocations.snapshot, frames, group_by, limit)
+
+
+@router.delete("/tracemalloc")
+async def tracemalloc_stop():
+    """Stop tracing allocations and drop the last snapshot."""
+    was_tracing = allocations.tracing
+    allocations.stop()
+    return {"stopped": was_tracing}
+
+
+@router.get("/rooms")
+async def room_memory(limit: int = Query(20, ge=1, le=1000)):
+    """Approximate memory per room, largest first.
+
+    Counts the game object and everything it holds except shared word
+    packs, plus the encoded frames cached and queued for the room.
+    """
+    games = list(game_service.games.items())
+    sizes = await room_sizes(games)
+    rooms = []
+    for game_id, game in games:
+        buffers = {**game_service.get_room_buffers(game_id), **manager.get_room_buffers(game_id)}
+        rooms.append({
+            "gameId": game_id,
+            "state": game.state,
+            "approxBytes": sizes[game_id] + buffers["cachedViewBytes"] + buffers["queuedBytes"],
+            "gameBytes": sizes[game_id],
+            "players": len(game.players),
+            "clueHistory": len(game.clue_history),
+            **buffers,
+        })
+    rooms.sort(key=lambda room: room["approxBytes"], reverse=True)
+    return {
+        "rooms": len(rooms),
+        "totalApproxBytes": sum(room["approxBytes"] for room in rooms),
+        "largest": rooms[:limit],
+    }
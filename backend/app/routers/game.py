@@ -1,11 +1,27 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from typing import Optional
 
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field
+
+from ..config import settings
+from ..models import Game, Role
 from ..services.game_service import game_service
+from ..services.sessions import sessions
+from ..utils.word_packs import DEFAULT_PACK, word_packs
+from ..websocket_manager import manager
 
 router = APIRouter(prefix="/api/games", tags=["games"])
 
 
+class CreateGameRequest(BaseModel):
+    word_pack: str = DEFAULT_PACK
+    # List the game in the public lobby
+    public: bool = False
+    # Seconds a spymaster has to give a clue, and a team to guess; 0 is untimed
+    clue_seconds: int = Field(0, ge=0, le=3600)
+    guess_seconds: int = Field(0, ge=0, le=3600)
+
+
 class CreateGameResponse(BaseModel):
     game_id: str
 
@@ -15,19 +31,85 @@ class JoinGameRequest(BaseModel):
 
 
 @router.post("", response_model=CreateGameResponse)
-async def create_game():
-    """Create a new game."""
-    game = game_service.create_game()
+async def create_game(request: Optional[CreateGameRequest] = None):
+    """Create a new game, optionally choosing its word pack, turn clocks and listing it publicly."""
+    request = request or CreateGameRequest()
+    try:
+        game = game_service.create_game(
+            request.word_pack, request.public, request.clue_seconds, request.guess_seconds,
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Word pack not found")
     return CreateGameResponse(game_id=game.id)
 
 
-@router.get("/{game_id}")
-async def get_game(game_id: str):
-    """Get game state."""
-    game_state = game_service.get_game_state(game_id)
-    if not game_state:
+@router.get("/word-packs")
+async def list_word_packs():
+    """List the word packs games can be created with."""
+    return {"packs": word_packs.names()}
+
+
+def _existing_game(game_id: str) -> Game:
+    game = game_service.get_game(game_id)
+    if not game:
         raise HTTPException(status_code=404, detail="Game not found")
-    return game_state
+    return game
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _is_spymaster(game: Game, token: Optional[str]) -> bool:
+    """Whether a resume token belongs to one of the game's spymasters."""
+    player = game.players.get(sessions.verify(game.id, token) or "") if token else None
+    return player is not None and player.role == Role.SPYMASTER
+
+
+@router.get("/{game_id}")
+async def get_game(game_id: str, request: Request, token: Optional[str] = None):
+    """Get game state, or 304 if the If-None-Match header has its current ETag.
+
+    Players pass their resume token to see their role's view; others see
+    the operative view.
+    """
+    game = _existing_game(game_id)
+    is_spymaster = _is_spymaster(game, token)
+    etag = game_service.etag(game, is_spymaster)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    body = game_service.get_state_body(game_id, is_spymaster)
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.get("/{game_id}/poll")
+async def poll_game(
+    game_id: str,
+    since: Optional[int] = None,
+    token: Optional[str] = None,
+    timeout: float = Query(settings.long_poll_timeout, ge=0, le=settings.long_poll_timeout),
+):
+    """Wait until the game's version differs from `since`, then return the caller's view.
+
+    Answers 304 if nothing changed within `timeout` seconds. Players pass
+    their resume token to see their role's view; others see the operative
+    view.
+    """
+    _existing_game(game_id)
+    if since is not None:
+        async with manager.polling(game_id):
+            changed = await game_service.wait_for_change(game_id, since, timeout)
+        if not changed:
+            _existing_game(game_id)
+            return Response(status_code=304)
+
+    game = _existing_game(game_id)
+    body = game_service.get_state_body(game_id, _is_spymaster(game, token))
+    return Response(body, media_type="application/json")
 
 
 @router.get("/{game_id}/exists")
@@ -35,3 +117,12 @@ async def check_game_exists(game_id: str):
     """Check if a game exists."""
     game = game_service.get_game(game_id)
     return {"exists": game is not None}
+
+
+@router.get("/{game_id}/connections")
+async def get_connection_stats(game_id: str):
+    """Get outbound queue depth and drop counts for a game's connections."""
+    stats = manager.get_room_stats(game_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No connections for game")
+    return stats
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Query, WebSocket
+
+from ..codecs import negotiate
+from ..heartbeat import absorb_expiry
+from ..lobby_feed import lobby_feed
+from ..websocket_manager import manager
+from ..models import GameState
+from ..services.game_service import game_service
+from ..services.lobby import LobbyFilter
+
+router = APIRouter(tags=["lobby"])
+
+# Largest page a client may ask for
+MAX_PAGE = 100
+
+
+@router.get("/api/lobby")
+async def list_games(
+    state: Optional[GameState] = None,
+    open_seats: Optional[bool] = None,
+    missing_spymaster: Optional[bool] = None,
+    word_pack: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE),
+    before: Optional[int] = None,
+):
+    """List public games, newest first. Pass `next` from a page as `before` to get the one after it."""
+    where = LobbyFilter(state, open_seats, missing_spymaster, word_pack)
+    page, cursor = game_service.lobby.query(where, limit, before)
+    return {"games": [entry.to_dict() for entry in page], "next": cursor}
+
+
+@router.websocket("/ws/lobby")
+async def lobby_endpoint(
+    websocket: WebSocket,
+    state: Optional[GameState] = None,
+    open_seats: Optional[bool] = None,
+    missing_spymaster: Optional[bool] = None,
+    word_pack: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE),
+):
+    """First page of public games matching the filters, then batched changes to them."""
+    codec = negotiate(websocket.scope.get("subprotocols", []))
+    await lobby_feed.connect(websocket, LobbyFilter(state, open_seats, missing_spymaster, word_pack), limit, codec)
+    connection = lobby_feed.subscribers[websocket].connection
+    try:
+        # The feed is one-way; any frame is just a sign of life
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            connection.seen()
+    except asyncio.CancelledError:
+        if not absorb_expiry(connection):
+            raise
+        await manager.kick(websocket, 1001, "Heartbeat timeout")
+    finally:
+        lobby_feed.disconnect(websocket)
@@ -0,0 +1,28 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ..services.archive import GameArchive
+from ..services.game_service import game_service
+
+router = APIRouter(tags=["stats"])
+
+
+def _archive() -> GameArchive:
+    if game_service.archive is None:
+        raise HTTPException(status_code=503, detail="Game archive is not enabled")
+    return game_service.archive
+
+
+@router.get("/api/stats")
+async def get_stats(word_pack: Optional[str] = None):
+    """Win rate by starting team, assassin losses and clue averages over archived games."""
+    return await asyncio.to_thread(_archive().stats, word_pack)
+
+
+@router.get("/api/archive/{game_id}")
+async def get_archived_games(game_id: str, limit: int = Query(20, ge=1, le=100)):
+    """A room's finished games, most recent first: board, clues, reveal order and outcome."""
+    games = await asyncio.to_thread(_archive().games, game_id, limit)
+    return {"games": games}
@@ -1,203 +1,395 @@
+import asyncio
+import time
 import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Set
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-import json
+from pydantic import ValidationError
 
+from ..codecs import negotiate
+from ..config import settings
+from ..heartbeat import absorb_expiry
+from ..metrics import handler_seconds, timer_lag_seconds
+from ..rate_limit import ConnectionLimits, rate_limiter
 from ..websocket_manager import manager
 from ..services.game_service import game_service
-from ..models import Team, Role
+from ..services.sessions import sessions
+from ..services.spymaster_ai import spymaster_ai
+from ..models import (
+    AddBot, AssignRole, EndTurn, GiveClue, JoinGame, Pong, ResetGame, RevealCard, Resync, StartGame,
+    client_message,
+)
 
 router = APIRouter()
 
+Handler = Callable[[WebSocket, str, str, object], Awaitable[None]]
+
+# Message type -> handler(websocket, game_id, player_id, message)
+HANDLERS: Dict[str, Handler] = {}
+
+# Validation error types raised by the discriminator on the "type" field
+_UNKNOWN_TYPE_ERRORS = {"union_tag_invalid", "union_tag_not_found"}
+
+# game_id -> task computing a bot spymaster's clue
+_bot_turns: Dict[str, asyncio.Task] = {}
+# Tasks passing turns whose clock ran out
+_expiries: Set[asyncio.Task] = set()
+
+
+def handles(model):
+    """Register a handler for the message type declared by a message model."""
+    def register(handler: Handler) -> Handler:
+        HANDLERS[model.model_fields["type"].default] = handler
+        return handler
+    return register
+
+
+async def send_error(websocket: WebSocket, message: str, code: str = "rejected", errors: List[dict] = None):
+    payload = {"message": message, "code": code}
+    if errors:
+        payload["errors"] = errors
+    await manager.send_personal_message({"type": "error", "payload": payload}, websocket)
+
+
+async def send_invalid(websocket: WebSocket, error: ValueError):
+    """Reply to a frame that failed to decode or validate."""
+    if not isinstance(error, ValidationError):
+        await send_error(websocket, "Malformed message", "malformed")
+        return
+
+    details = error.errors(include_url=False, include_input=False)
+    # Locations start with the message type the discriminator picked
+    errors = [{"loc": ".".join(str(part) for part in detail["loc"][1:]), "msg": detail["msg"]} for detail in details]
+    if details[0]["type"] in _UNKNOWN_TYPE_ERRORS:
+        await send_error(websocket, "Unknown message type", "unknown_type", errors)
+    elif not details[0]["loc"]:
+        await send_error(websocket, "Malformed message", "malformed", errors)
+    else:
+        await send_error(websocket, f"Invalid {errors[0]['loc']}: {errors[0]['msg']}", "invalid_payload", errors)
+
+
+async def throttle(websocket: WebSocket, limits: ConnectionLimits, game_id: str, msg_type: str) -> bool:
+    """Apply rate limits to a message, returning True if it should be dropped."""
+    allowed, disconnect = rate_limiter.check(limits, game_id, msg_type)
+    if disconnect:
+        await manager.kick(websocket, 1008, "Rate limit exceeded")
+        raise WebSocketDisconnect(1008)
+    if not allowed:
+        await send_error(websocket, "Too many messages. Slow down.", "rate_limited")
+    return not allowed
+
+
+@handles(JoinGame)
+async def join_game(websocket: WebSocket, game_id: str, player_id: str, message: JoinGame):
+    if game_service.add_player(game_id, player_id, message.payload.player_name):
+        await manager.broadcast_deltas(game_id, game_service)
+    else:
+        await send_error(websocket, "Game is full.")
+
+
+@handles(AssignRole)
+async def assign_role(websocket: WebSocket, game_id: str, player_id: str, message: AssignRole):
+    if game_service.assign_role(game_id, player_id, message.payload.team, message.payload.role):
+        await manager.broadcast_deltas(game_id, game_service)
+    else:
+        await send_error(websocket, "Could not assign role. It may already be taken.")
+
+
+@handles(AddBot)
+async def add_bot(websocket: WebSocket, game_id: str, player_id: str, message: AddBot):
+    if not spymaster_ai.available:
+        await send_error(websocket, "Bot spymasters are not enabled on this server.")
+    elif game_service.add_bot(game_id, message.payload.team):
+        await manager.broadcast_deltas(game_id, game_service)
+    else:
+        await send_error(websocket, "Could not add a bot. The spymaster seat may already be taken.")
+
+
+@handles(StartGame)
+async def start_game(websocket: WebSocket, game_id: str, player_id: str, message: StartGame):
+    if game_service.start_game(game_id):
+        await manager.broadcast_deltas(game_id, game_service)
+
+        await manager.broadcast_to_game(game_id, {
+            "type": "game_started",
+            "payload": {}
+        })
+    else:
+        await send_error(websocket, "Cannot start game. Need at least one spymaster per team.")
+
+
+@handles(GiveClue)
+async def give_clue(websocket: WebSocket, game_id: str, player_id: str, message: GiveClue):
+    if game_service.give_clue(game_id, player_id, message.payload.word, message.payload.number):
+        await manager.broadcast_deltas(game_id, game_service)
+    else:
+        await send_error(websocket, "Cannot give clue. Not your turn or already gave a clue.")
+
+
+@handles(RevealCard)
+async def reveal_card(websocket: WebSocket, game_id: str, player_id: str, message: RevealCard):
+    result = game_service.reveal_card(game_id, player_id, message.payload.position)
+
+    if result["success"]:
+        await manager.broadcast_deltas(game_id, game_service)
+    else:
+        await send_error(websocket, result.get("error", "Cannot reveal card"))
+
+
+@handles(EndTurn)
+async def end_turn(websocket: WebSocket, game_id: str, player_id: str, message: EndTurn):
+    if game_service.end_turn(game_id, player_id):
+        await manager.broadcast_deltas(game_id, game_service)
+    else:
+        await send_error(websocket, "Cannot end turn")
+
+
+@handles(ResetGame)
+async def reset_game(websocket: WebSocket, game_id: str, player_id: str, message: ResetGame):
+    # Reset to lobby state with same players
+    if game_service.reset_game(game_id):
+        await manager.broadcast_to_game(game_id, {
+            "type": "game_reset",
+            "payload": {}
+        })
+
+        await manager.broadcast_deltas(game_id, game_service)
+
+
+@handles(Resync)
+async def resync(websocket: WebSocket, game_id: str, player_id: str, message: Resync):
+    # Client detected a gap in the delta sequence
+    await manager.send_snapshot(websocket, game_id, game_service)
+
+
+async def bot_turn(game_id: str):
+    """Compute a bot spymaster's clue off the event loop, then give it."""
+    while game_service.bot_to_play(game_id) is not None:
+        game = game_service.get_game(game_id)
+        turn = (game.board.words, game.board.revealed, game.current_team)
+        clue = await spymaster_ai.suggest(game)
+        if clue is None:
+            return
+
+        async with game_service.lock(game_id), manager.outbox(game_id, game_service):
+            bot = game_service.bot_to_play(game_id)
+            game = game_service.get_game(game_id)
+            # The board changed while the clue was computed: think again
+            if bot is None or (game.board.words, game.board.revealed, game.current_team) != turn:
+                continue
+            if game_service.give_clue(game_id, bot.id, *clue):
+                await manager.broadcast_deltas(game_id, game_service)
+            return
+
+
+def schedule_bot_turn(game_id: str):
+    """Start computing a clue if the game is waiting on a bot spymaster."""
+    if not spymaster_ai.available or game_id in _bot_turns or game_service.bot_to_play(game_id) is None:
+        return
+    task = _bot_turns[game_id] = asyncio.create_task(bot_turn(game_id))
+    task.add_done_callback(lambda _: _bot_turns.pop(game_id, None))
+
+
+async def expire_turn(game_id: str, deadline: float):
+    async with game_service.lock(game_id), manager.outbox(game_id, game_service):
+        if game_service.expire_turn(game_id, deadline):
+            await manager.broadcast_deltas(game_id, game_service)
+            timer_lag_seconds.observe("applied", time.time() - deadline)
+    schedule_bot_turn(game_id)
+
+
+def turn_expired(game_id: str, deadline: float):
+    """Turn timer callback: pass the turn once the game lock is free."""
+    task = asyncio.create_task(expire_turn(game_id, deadline))
+    _expiries.add(task)
+    task.add_done_callback(_expiries.discard)
+
+
+async def remove_seat(game_id: str, player_id: str):
+    """Remove a player and clean up the room. Call with the game lock held."""
+    if game_service.remove_player(game_id, player_id):
+        await manager.broadcast_deltas(game_id, game_service)
+
+    # Delete the game once no socket is open here and nobody holds a seat,
+    # including seats kept for players who may resume or sit on other workers
+    if manager.get_connection_count(game_id) == 0:
+        rate_limiter.forget_room(game_id)
+        game = game_service.get_game(game_id)
+        if game and all(player.is_bot for player in game.players.values()):
+            game_service.delete_game(game_id)
+            await manager.close_room(game_id, 4004, "Game not found")
+
+
+async def expire_seat(game_id: str, player_id: str, disconnected_at: float):
+    async with game_service.lock(game_id):
+        game = game_service.get_game(game_id)
+        player = game.players.get(player_id) if game else None
+        # A different timestamp means the player resumed since, possibly on another worker
+        if player is not None and player.disconnected_at == disconnected_at:
+            await remove_seat(game_id, player_id)
+
+
+async def player_left(game_id: str, player_id: str):
+    """Handle a player's socket closing: hold their seat for the grace period, or free it."""
+    async with game_service.lock(game_id):
+        if manager.get_player_connections(game_id, player_id):
+            # Replaced by a newer connection for the same seat
+            return
+
+        if sessions.grace > 0:
+            disconnected_at = game_service.mark_disconnected(game_id, player_id)
+            if disconnected_at is not None:
+                await manager.broadcast_deltas(game_id, game_service)
+                sessions.hold(game_id, player_id, lambda: expire_seat(game_id, player_id, disconnected_at))
+                if manager.get_connection_count(game_id) == 0:
+                    rate_limiter.forget_room(game_id)
+                return
+
+        await remove_seat(game_id, player_id)
+
+
+async def resume(websocket: WebSocket, game_id: str) -> Optional[str]:
+    """Return the seated player a resume token in the URL belongs to, if any."""
+    token = websocket.query_params.get("resume")
+    player_id = sessions.verify(game_id, token) if token else None
+    game = game_service.get_game(game_id)
+    if player_id is None or game is None or player_id not in game.players:
+        return None
+
+    sessions.release(game_id, player_id)
+    for connection in manager.get_player_connections(game_id, player_id):
+        await manager.kick(connection.websocket, 4001, "Replaced by a new connection")
+    return player_id
+
+
+async def catch_up(websocket: WebSocket, game_id: str, player_id: str, resumed: bool):
+    """Bring a new connection up to date: missed deltas if possible, else a snapshot."""
+    since = websocket.query_params.get("since")
+    deltas = None
+    if resumed and since is not None and since.isdigit():
+        deltas = game_service.deltas_since(game_id, int(since))
+
+    if deltas is None:
+        # Clients keep their copy current by applying deltas on top of this
+        await manager.send_snapshot(websocket, game_id, game_service)
+    elif deltas:
+        await manager.send_personal_message({
+            "type": "state_delta",
+            "payload": {"deltas": deltas}
+        }, websocket)
+
+    # Everyone, this connection included, sees the player come back after that
+    if resumed and game_service.mark_connected(game_id, player_id):
+        await manager.broadcast_deltas(game_id, game_service)
+
 
 @router.websocket("/ws/{game_id}")
 async def websocket_endpoint(websocket: WebSocket, game_id: str):
-    """WebSocket endpoint for game communication."""
-    player_id = str(uuid.uuid4())
+    """WebSocket endpoint for game communication.
 
+    Clients may pass ?resume=<token> to take back a seat held after a
+    disconnect, and &since=<version> to receive only the deltas they missed.
+    """
     # Check if game exists
     game = game_service.get_game(game_id)
     if not game:
         await websocket.close(code=4004, reason="Game not found")
         return
 
-    await manager.connect(websocket, game_id, player_id)
+    codec = negotiate(websocket.scope.get("subprotocols", []))
+    limits = rate_limiter.connection()
 
+    # Cleanup is in finally, so a connection ended by an error or a heartbeat
+    # expiry during catch-up is removed and its seat freed or held as well
     try:
-        # Send initial player ID
-        await manager.send_personal_message({
-            "type": "connected",
-            "payload": {"playerId": player_id}
-        }, websocket)
+        async with game_service.lock(game_id):
+            player_id = await resume(websocket, game_id)
+            resumed = player_id is not None
+            if not resumed:
+                player_id = str(uuid.uuid4())
+            await manager.connect(websocket, game_id, player_id, codec)
+
+            # Send initial player ID
+            await manager.send_personal_message({
+                "type": "connected",
+                "payload": {
+                    "playerId": player_id,
+                    "resumeToken": sessions.token(game_id, player_id),
+                    "resumed": resumed,
+                    # Lets the client correct turn deadlines for its clock offset
+                    "serverTime": time.time(),
+                }
+            }, websocket)
+            await catch_up(websocket, game_id, player_id, resumed)
+        connection = manager.connection_info[websocket]
 
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
-            msg_type = message.get("type")
-            payload = message.get("payload", {})
-
-            if msg_type == "join_game":
-                player_name = payload.get("player_name", "Anonymous")
-                player = game_service.add_player(game_id, player_id, player_name)
-
-                if player:
-                    # Broadcast updated game state to all players
-                    game_state = game_service.get_game_state(game_id)
-                    await manager.broadcast_game_state(game_id, game_state, game_service)
-
-                    await manager.broadcast_to_game(game_id, {
-                        "type": "player_joined",
-                        "payload": {"player": player.model_dump()}
-                    }, exclude=websocket)
-
-            elif msg_type == "assign_role":
-                team = Team(payload.get("team"))
-                role = Role(payload.get("role"))
-
-                success = game_service.assign_role(game_id, player_id, team, role)
-
-                if success:
-                    game_state = game_service.get_game_state(game_id)
-                    await manager.broadcast_game_state(game_id, game_state, game_service)
-                else:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "payload": {"message": "Could not assign role. It may already be taken."}
-                    }, websocket)
-
-            elif msg_type == "start_game":
-                success = game_service.start_game(game_id)
-
-                if success:
-                    game_state = game_service.get_game_state(game_id)
-                    await manager.broadcast_game_state(game_id, game_state, game_service)
-
-                    await manager.broadcast_to_game(game_id, {
-                        "type": "game_started",
-                        "payload": {}
-                    })
-                else:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "payload": {"message": "Cannot start game. Need at least one spymaster per team."}
-                    }, websocket)
-
-            elif msg_type == "give_clue":
-                word = payload.get("word", "").strip()
-                number = int(payload.get("number", 0))
-
-                if not word or number < 0:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "payload": {"message": "Invalid clue format"}
-                    }, websocket)
-                    continue
-
-                success = game_service.give_clue(game_id, player_id, word, number)
-
-                if success:
-                    game_state = game_service.get_game_state(game_id)
-                    await manager.broadcast_game_state(game_id, game_state, game_service)
-
-                    await manager.broadcast_to_game(game_id, {
-                        "type": "clue_given",
-                        "payload": {
-                            "word": word.upper(),
-                            "number": number
-                        }
-                    })
-                else:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "payload": {"message": "Cannot give clue. Not your turn or already gave a clue."}
-                    }, websocket)
-
-            elif msg_type == "reveal_card":
-                position = int(payload.get("position", -1))
-                result = game_service.reveal_card(game_id, player_id, position)
-
-                if result["success"]:
-                    game_state = game_service.get_game_state(game_id)
-                    await manager.broadcast_game_state(game_id, game_state, game_service)
-
-                    await manager.broadcast_to_game(game_id, {
-                        "type": "card_revealed",
-                        "payload": {
-                            "position": position,
-                            "card": result["card"]
-                        }
-                    })
-
-                    if result["game_over"]:
-                        await manager.broadcast_to_game(game_id, {
-                            "type": "game_over",
-                            "payload": {
-                                "winner": result["winner"],
-                                "reason": result["reason"]
-                            }
-                        })
-                    elif result["turn_ended"]:
-                        await manager.broadcast_to_game(game_id, {
-                            "type": "turn_ended",
-                            "payload": {}
-                        })
-                else:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "payload": {"message": result.get("error", "Cannot reveal card")}
-                    }, websocket)
-
-            elif msg_type == "end_turn":
-                success = game_service.end_turn(game_id, player_id)
-
-                if success:
-                    game_state = game_service.get_game_state(game_id)
-                    await manager.broadcast_game_state(game_id, game_state, game_service)
-
-                    await manager.broadcast_to_game(game_id, {
-                        "type": "turn_ended",
-                        "payload": {}
-                    })
-                else:
-                    await manager.send_personal_message({
-                        "type": "error",
-                        "payload": {"message": "Cannot end turn"}
-                    }, websocket)
-
-            elif msg_type == "reset_game":
-                # Reset to lobby state with same players
-                game = game_service.get_game(game_id)
-                if game:
-                    # Create new game with same ID
-                    game_service.delete_game(game_id)
-                    new_game = game_service.create_game()
-                    # Reassign game ID (hacky but works for prototype)
-                    game_service.games[game_id] = new_game
-                    game_service.games[game_id].id = game_id
-                    del game_service.games[new_game.id]
-
-                    await manager.broadcast_to_game(game_id, {
-                        "type": "game_reset",
-                        "payload": {}
-                    })
-
-                    game_state = game_service.get_game_state(game_id)
-                    await manager.broadcast_game_state(game_id, game_state, game_service)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            connection.seen()
+            data = frame.get("text")
+            start = time.perf_counter()
+
+            try:
+                message = codec.validate(data if data is not None else frame["bytes"], client_message)
+            except ValueError as error:
+                if not await throttle(websocket, limits, game_id, "invalid"):
+                    await send_invalid(websocket, error)
+                handler_seconds.observe("invalid", time.perf_counter() - start)
+                continue
+
+            if await throttle(websocket, limits, game_id, message.type):
+                continue
+            if isinstance(message, Pong):
+                # Only a sign of life, already recorded
+                continue
+
+            # Serialize commands on this game with their broadcasts, which
+            # reach each client as a single frame per command
+            async with game_service.lock(game_id), manager.outbox(game_id, game_service):
+                await HANDLERS[message.type](websocket, game_id, player_id, message)
+
+            handler_seconds.observe(message.type, time.perf_counter() - start)
+            schedule_bot_turn(game_id)
 
     except WebSocketDisconnect:
+        pass
+    except asyncio.CancelledError:
+        if not absorb_expiry(manager.connection_info.get(websocket)):
+            raise
+        await manager.kick(websocket, 1001, "Heartbeat timeout")
+    finally:
         info = manager.disconnect(websocket)
         if info:
-            game_id, player_id = info
-            game_service.remove_player(game_id, player_id)
-
-            # Notify other players
-            game_state = game_service.get_game_state(game_id)
-            if game_state:
-                await manager.broadcast_game_state(game_id, game_state, game_service)
-                await manager.broadcast_to_game(game_id, {
-                    "type": "player_left",
-                    "payload": {"playerId": player_id}
-                })
-
-            # Clean up empty games
-            if manager.get_connection_count(game_id) == 0:
-                game_service.delete_game(game_id)
+            await player_left(*info)
+
+
+@router.websocket("/ws/{game_id}/spectate")
+async def spectate_endpoint(websocket: WebSocket, game_id: str, view: str = "operative"):
+    """Read-only WebSocket for watching a game without joining it.
+
+    view=spymaster shows card types, delayed by CODENAMES_SPECTATOR_DELAY.
+    """
+    if not game_service.get_game(game_id):
+        await websocket.close(code=4004, reason="Game not found")
+        return
+    delayed = view == "spymaster"
+    if delayed and settings.spectator_delay <= 0:
+        await websocket.close(code=1008, reason="Spymaster view is disabled")
+        return
+
+    codec = negotiate(websocket.scope.get("subprotocols", []))
+    try:
+        if not await manager.connect_spectator(websocket, game_id, codec, delayed, game_service):
+            return
+        connection = manager.spectator_info[websocket]
+
+        # Spectators can't send commands; any frame is just a sign of life
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            connection.seen()
+    except asyncio.CancelledError:
+        if not absorb_expiry(manager.spectator_info.get(websocket)):
+            raise
+        await manager.kick(websocket, 1001, "Heartbeat timeout")
+    finally:
+        manager.disconnect_spectator(websocket)
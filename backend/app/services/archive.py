@@ -0,0 +1,189 @@
+import json
+import logging
+import sqlite3
+import threading
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+class GameArchive:
+    """Finished games kept in a local SQLite file, with running totals for stats.
+
+    Games are appended to an in-memory buffer from the event loop, and a
+    background thread inserts everything buffered every `flush_interval`
+    seconds in one transaction. The same transaction adds each game to
+    totals kept per word pack and starting team, so stats read a handful of
+    rows however many games are archived. A failed write puts its games back
+    at the front of the buffer for the next flush; a crash loses at most the
+    last interval.
+
+    Tables:
+        games   one row per finished game; board, clues and reveals as JSON
+        totals  counters per (word_pack, starting_team)
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._writer = self._connect()
+        self._writer.executescript(
+            "CREATE TABLE IF NOT EXISTS games ("
+            " seq INTEGER PRIMARY KEY, game_id TEXT NOT NULL, finished_at REAL NOT NULL,"
+            " word_pack TEXT NOT NULL, starting_team TEXT NOT NULL, winner TEXT NOT NULL,"
+            " reason TEXT NOT NULL, data TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS games_by_room ON games (game_id, seq);"
+            "CREATE TABLE IF NOT EXISTS totals ("
+            " word_pack TEXT NOT NULL, starting_team TEXT NOT NULL,"
+            " games INTEGER NOT NULL, starting_wins INTEGER NOT NULL, assassinations INTEGER NOT NULL,"
+            " clues INTEGER NOT NULL, clue_numbers INTEGER NOT NULL, reveals INTEGER NOT NULL,"
+            " PRIMARY KEY (word_pack, starting_team));"
+        )
+        self._reader = self._connect()
+        self._reader_lock = threading.Lock()
+        self._buffer: List[dict] = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @property
+    def pending(self) -> int:
+        """Games buffered but not yet written."""
+        return len(self._buffer)
+
+    def start(self):
+        """Start the background writer thread."""
+        self._thread = threading.Thread(target=self._run, name="game-archive", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Write everything buffered and stop the background thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        self._writer.close()
+        self._reader.close()
+
+    def append(self, record: dict):
+        """Buffer a finished game; see GameService._archive_record for its fields."""
+        with self._lock:
+            self._buffer.append(record)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Archive write failed, %d games kept for the next flush", self.pending)
+
+    def flush(self):
+        """Insert all buffered games and update the totals, in one transaction."""
+        with self._io_lock:
+            with self._lock:
+                records, self._buffer = self._buffer, []
+            if not records:
+                return
+            try:
+                self._write(records)
+            except BaseException:
+                with self._lock:
+                    self._buffer[:0] = records
+                raise
+
+    def _write(self, records: List[dict]):
+        rows = []
+        totals = {}
+        for record in records:
+            clues = record["clues"]
+            rows.append((
+                record["gameId"], record["finishedAt"], record["wordPack"], record["startingTeam"],
+                record["winner"], record["reason"], json.dumps(record, separators=(",", ":")),
+            ))
+            key = (record["wordPack"], record["startingTeam"])
+            games, wins, assassinations, clue_count, numbers, reveals = totals.get(key, (0, 0, 0, 0, 0, 0))
+            totals[key] = (
+                games + 1,
+                wins + (record["winner"] == record["startingTeam"]),
+                assassinations + (record["reason"] == "assassin"),
+                clue_count + len(clues),
+                numbers + sum(clue["number"] for clue in clues),
+                reveals + len(record["reveals"]),
+            )
+
+        conn = self._writer
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT INTO games (game_id, finished_at, word_pack, starting_team, winner, reason, data)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany(
+                "INSERT INTO totals VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (word_pack, starting_team) DO UPDATE SET"
+                " games = games + excluded.games, starting_wins = starting_wins + excluded.starting_wins,"
+                " assassinations = assassinations + excluded.assassinations, clues = clues + excluded.clues,"
+                " clue_numbers = clue_numbers + excluded.clue_numbers, reveals = reveals + excluded.reveals",
+                [key + value for key, value in totals.items()],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _read(self, sql: str, params: tuple) -> list:
+        with self._reader_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def stats(self, word_pack: Optional[str] = None) -> dict:
+        """Aggregate stats over archived games, optionally for one word pack."""
+        sql = (
+            "SELECT starting_team, SUM(games), SUM(starting_wins), SUM(assassinations),"
+            " SUM(clues), SUM(clue_numbers), SUM(reveals) FROM totals"
+        )
+        params: tuple = ()
+        if word_pack is not None:
+            sql += " WHERE word_pack = ?"
+            params = (word_pack,)
+        rows = self._read(sql + " GROUP BY starting_team", params)
+
+        games = wins = assassinations = clues = numbers = reveals = 0
+        by_starting_team = {}
+        for team, team_games, team_wins, team_assassinations, team_clues, team_numbers, team_reveals in rows:
+            by_starting_team[team] = {
+                "games": team_games,
+                "wins": team_wins,
+                "winRate": team_wins / team_games,
+            }
+            games += team_games
+            wins += team_wins
+            assassinations += team_assassinations
+            clues += team_clues
+            numbers += team_numbers
+            reveals += team_reveals
+
+        return {
+            "games": games,
+            "startingTeamWinRate": wins / games if games else None,
+            "byStartingTeam": by_starting_team,
+            "assassinLosses": assassinations,
+            "assassinLossRate": assassinations / games if games else None,
+            "averageClueNumber": numbers / clues if clues else None,
+            "averageCluesPerGame": clues / games if games else None,
+            "averageRevealsPerGame": reveals / games if games else None,
+        }
+
+    def games(self, game_id: str, limit: int = 20) -> List[dict]:
+        """A room's archived games, most recent first."""
+        rows = self._read(
+            "SELECT data FROM games WHERE game_id = ? ORDER BY seq DESC LIMIT ?", (game_id, limit)
+        )
+        return [json.loads(data) for (data,) in rows]
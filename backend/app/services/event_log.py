@@ -0,0 +1,168 @@
+import glob
+import json
+import os
+import threading
+from typing import IO, Iterator, List, Optional, Tuple
+
+# Marks the point in the write buffer where a new segment starts
+_ROLL = object()
+
+
+class EventLog:
+    """Segmented append-only log of game commands with group commit.
+
+    Records are appended to an in-memory buffer from the event loop, and a
+    background thread writes and fsyncs the buffer every `flush_interval`
+    seconds, so a burst of commands shares one fsync. A crash loses at most
+    the last interval. Segments are rolled by size or for a snapshot, and
+    segments covered by a snapshot are deleted.
+
+    Files in `directory`:
+        log-<segment>.jsonl       one JSON record per line
+        snapshot-<segment>.jsonl  all games as of the start of <segment>
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 64 << 20, flush_interval: float = 0.05):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        os.makedirs(directory, exist_ok=True)
+
+        existing = self._segments()
+        # Never append to a segment that may end in a torn write
+        self._segment = (existing[-1] + 1) if existing else 1
+        self._file: Optional[IO[str]] = None
+        self._file_segment = 0
+        self._buffer: list = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _path(self, kind: str, segment: int) -> str:
+        return os.path.join(self.directory, f"{kind}-{segment:08d}.jsonl")
+
+    def _segments(self) -> List[int]:
+        paths = glob.glob(os.path.join(self.directory, "log-*.jsonl"))
+        return sorted(int(os.path.basename(p)[4:12]) for p in paths)
+
+    def _snapshots(self) -> List[int]:
+        paths = glob.glob(os.path.join(self.directory, "snapshot-*.jsonl"))
+        return sorted(int(os.path.basename(p)[9:17]) for p in paths)
+
+    def start(self):
+        """Start the background group-commit thread."""
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Flush everything buffered and stop the background thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def append(self, record: dict):
+        """Buffer a record; it becomes durable at the next group commit."""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+
+    def roll(self) -> int:
+        """Start a new segment for records appended from now on, returning its number."""
+        with self._lock:
+            self._segment += 1
+            self._buffer.append(_ROLL)
+            return self._segment
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write and fsync all buffered records."""
+        with self._io_lock:
+            with self._lock:
+                items, self._buffer = self._buffer, []
+                segment = self._segment
+
+            # The segment the first buffered record belongs to
+            current = segment - sum(1 for item in items if item is _ROLL)
+            lines: List[str] = []
+            for item in items:
+                if item is _ROLL:
+                    self._write(current, lines)
+                    lines = []
+                    current += 1
+                else:
+                    lines.append(item)
+            self._write(current, lines)
+
+            if self._file and self._file.tell() >= self.segment_bytes:
+                self.roll()
+
+    def _write(self, segment: int, lines: List[str]):
+        if not lines:
+            return
+        if self._file_segment != segment:
+            if self._file:
+                self._file.close()
+            self._file = open(self._path("log", segment), "a", encoding="utf-8")
+            self._file_segment = segment
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def write_snapshot(self, segment: int, games: List[str]):
+        """Durably write a snapshot taken at the start of `segment`, then prune.
+
+        `games` are JSON-encoded games. Older snapshots and the segments the
+        new snapshot covers are deleted once it is safely on disk.
+        """
+        # Make sure the roll to `segment` has been processed
+        self.flush()
+
+        path = self._path("snapshot", segment)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"segment": segment, "games": len(games)}) + "\n")
+            for game in games:
+                f.write(game + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+        for old in self._snapshots():
+            if old < segment:
+                os.remove(self._path("snapshot", old))
+        for old in self._segments():
+            if old < segment:
+                os.remove(self._path("log", old))
+
+    def load(self) -> Tuple[List[str], Iterator[dict]]:
+        """Return the latest snapshot's games and an iterator over the records after it."""
+        games: List[str] = []
+        start = 0
+        snapshots = self._snapshots()
+        if snapshots:
+            start = snapshots[-1]
+            with open(self._path("snapshot", start), encoding="utf-8") as f:
+                f.readline()
+                games = [line for line in f if line.strip()]
+        return games, self._records(start)
+
+    def _records(self, start: int) -> Iterator[dict]:
+        for segment in self._segments():
+            if segment < start:
+                continue
+            with open(self._path("log", segment), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write at the end of a segment from a crash
+                        break
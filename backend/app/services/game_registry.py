@@ -0,0 +1,121 @@
+import asyncio
+import random
+import string
+from typing import Dict, Iterator, Optional
+
+from ..models import Game
+from .game_store import GameStore
+
+# All 676 two-letter strings, indexed by their base-26 value
+_LETTER_PAIRS = [a + b for b in string.ascii_uppercase for a in string.ascii_uppercase]
+
+
+class RoomCodeAllocator:
+    """Hands out 6-letter room codes in constant time at any occupancy.
+
+    Codes are drawn by walking the 26^6 code space through a keyed Feistel
+    permutation, so every code is produced once in a scrambled order and no
+    allocation ever has to retry against taken codes. Once the whole
+    permutation has been used, a freshly keyed one starts; codes still held
+    by live games may then come round again, which GameStore.add rejects.
+    """
+
+    LETTERS = string.ascii_uppercase
+    LENGTH = 6
+    SPACE = len(LETTERS) ** LENGTH
+    _HALF_BITS = 15  # Feistel domain is 2^30, the smallest even power above SPACE
+    _HALF_MASK = (1 << _HALF_BITS) - 1
+
+    def __init__(self, seed: Optional[int] = None):
+        self._rng = random.Random(seed)
+        self._rekey()
+
+    def _rekey(self):
+        self._keys = tuple(self._rng.getrandbits(32) | 1 for _ in range(4))
+        self._counter = 0
+
+    def _permute(self, value: int) -> int:
+        mask = self._HALF_MASK
+        left, right = value >> self._HALF_BITS, value & mask
+        for key in self._keys:
+            left, right = right, left ^ ((((right ^ key) * 0x2545F491) >> 9) & mask)
+        return (left << self._HALF_BITS) | right
+
+    def _encode(self, index: int) -> str:
+        high, index = divmod(index, 676)
+        middle, low = divmod(high, 676)
+        pairs = _LETTER_PAIRS
+        return pairs[index] + pairs[low] + pairs[middle]
+
+    def _next_index(self) -> Optional[int]:
+        limit = 1 << (2 * self._HALF_BITS)
+        while self._counter < limit:
+            # Cycle-walk values that land outside the code space (~1 in 3.5)
+            value = self._permute(self._counter)
+            self._counter += 1
+            if value < self.SPACE:
+                return value
+        return None
+
+    def allocate(self) -> str:
+        """Return a code not handed out since the current permutation started."""
+        index = self._next_index()
+        if index is None:
+            self._rekey()
+            index = self._next_index()
+        return self._encode(index)
+
+
+class GameRegistry(GameStore):
+    """In-memory game storage in one dict, with one asyncio lock per game.
+
+    Splitting the dict into shards would bound the stall when it resizes
+    (the longest insert while filling to a million rooms drops from ~40 ms
+    to ~2 ms) but costs every lookup and delete up to 1.5x, and the other
+    per-room dicts (reaper, caches, lobby, timers) resize the same way
+    regardless; see benchmarks/bench_registry.py. Commands that await
+    between reading and writing a game must hold its lock.
+    """
+
+    def __init__(self):
+        self._games: Dict[str, Game] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def __getitem__(self, game_id: str) -> Game:
+        return self._games[game_id]
+
+    def get(self, game_id: str, default=None):
+        return self._games.get(game_id, default)
+
+    def __contains__(self, game_id) -> bool:
+        return game_id in self._games
+
+    def __setitem__(self, game_id: str, game: Game):
+        self._games[game_id] = game
+
+    def __delitem__(self, game_id: str):
+        del self._games[game_id]
+        self._locks.pop(game_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._games))
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def add(self, game: Game) -> bool:
+        if game.id in self:
+            return False
+        self[game.id] = game
+        return True
+
+    def save(self, game: Game):
+        # Games are mutated in place
+        pass
+
+    def lock(self, game_id: str) -> asyncio.Lock:
+        """Get the lock serializing commands on a game."""
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = self._locks[game_id] = asyncio.Lock()
+        return lock
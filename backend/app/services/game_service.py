@@ -1,30 +1,202 @@
-import random
-import string
-from typing import Dict, Optional
-
-from ..models import Card, CardType, Game, GameState, Player, Team, Role, Clue
+import asyncio
+import math
+import time
+from collections import deque
+from typing import AsyncContextManager, Callable, Deque, Dict, List, Optional
+
+from ..codecs import BODY_CODEC, DEFAULT_CODEC, Codec, Frame
+from ..config import settings
+from ..models import Game, GameState, Player, Team, Role, Clue
+from ..models.board import (
+    BOARD_SIZE, CARD_TYPES, GAME_OVER_REASONS, TEAMS, TURN_OVER, Board, deal, guesses_for,
+)
+from ..utils.word_packs import DEFAULT_PACK, word_packs
+from .archive import GameArchive
+from .event_log import EventLog
+from .game_registry import GameRegistry, RoomCodeAllocator
+from .game_store import GameStore, create_store
+from .lobby import LobbyIndex
+from .reaper import RoomReaper
+from .turn_timers import TurnTimers
 from .word_service import WordService
 
 
 class GameService:
     """Service for managing game logic."""
 
-    def __init__(self):
-        self.games: Dict[str, Game] = {}
-
-    def _generate_game_id(self) -> str:
-        """Generate a unique 6-character game ID."""
+    def __init__(self, store: Optional[GameStore] = None, reaper: Optional[RoomReaper] = None,
+                 history: int = 64, word_history: int = 5, max_players: int = 12,
+                 lobby: Optional[LobbyIndex] = None):
+        self.games = store if store is not None else GameRegistry()
+        self.codes = RoomCodeAllocator()
+        # Expires idle rooms and caps the room count, if enabled
+        self.reaper = reaper
+        # game_id -> (version, {(is_spymaster, codec name): encoded game_state frame}),
+        # plus the bare views served over HTTP under the "body" codec
+        self._view_cache: Dict[str, tuple[int, Dict[tuple[bool, str], Frame]]] = {}
+        # game_id -> deltas produced since the last broadcast
+        self._pending_deltas: Dict[str, List[dict]] = {}
+        # game_id -> the most recent deltas, for clients catching up after a reconnect
+        self.history = history
+        self._history: Dict[str, Deque[dict]] = {}
+        # Boards per room whose words are kept out of the next deal
+        self.word_history = word_history
+        self.max_players = max_players
+        # Public games, re-indexed on every change
+        self.lobby = lobby if lobby is not None else LobbyIndex(max_players)
+        # Deadlines of timed turns, for every game
+        self.timers = TurnTimers()
+        # Durable record of successful commands, if enabled
+        self.log: Optional[EventLog] = None
+        self._replaying = False
+        # Where finished games are recorded, if enabled
+        self.archive: Optional[GameArchive] = None
+        # game_id -> {deadline second: future}, shared by the long polls on a
+        # game that time out in that second and resolved by its next mutation
+        self._changes: Dict[str, Dict[int, asyncio.Future]] = {}
+
+    def _emit(self, game: Game, op: str, **fields):
+        """Record a mutation as a delta, bumping the game version to its sequence number.
+
+        Deltas only carry information visible to every role. Ops that change
+        role-specific data (the board) are sent as "snapshot" deltas, which
+        tell the broadcaster to send full views instead.
+        """
+        game.version += 1
+        self.games.save(game)
+        if self.reaper is not None:
+            self.reaper.touch(game.id, game.state)
+        self.lobby.update(game)
+        delta = {"seq": game.version, "op": op, **fields}
+        self._pending_deltas.setdefault(game.id, []).append(delta)
+        history = self._history.get(game.id)
+        if history is None:
+            history = self._history[game.id] = deque(maxlen=self.history)
+        history.append(delta)
+        self.notify(game.id)
+
+    def notify(self, game_id: str):
+        """Wake the long polls waiting on a game."""
+        for waiter in self._changes.pop(game_id, {}).values():
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _expire_waiters(self, game_id: str, tick: int):
+        waiters = self._changes.get(game_id)
+        waiter = waiters.pop(tick, None) if waiters is not None else None
+        if waiter is not None:
+            if not waiters:
+                del self._changes[game_id]
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait_for_change(self, game_id: str, version: int, timeout: float) -> bool:
+        """Wait about `timeout` seconds, at most one more, for a game to move on from `version`.
+
+        Returns False on timeout or if the game is gone. Waiters share a
+        future per game and deadline second instead of each having a timer,
+        so a parked waiter costs little beyond its task and one mutation
+        wakes them all.
+        """
+        loop = asyncio.get_running_loop()
+        tick = math.ceil(loop.time() + timeout)
         while True:
-            game_id = ''.join(random.choices(string.ascii_uppercase, k=6))
-            if game_id not in self.games:
-                return game_id
+            game = self.get_game(game_id)
+            if game is None:
+                return False
+            if game.version != version:
+                return True
+            if loop.time() >= tick:
+                return False
+            waiters = self._changes.setdefault(game_id, {})
+            waiter = waiters.get(tick)
+            if waiter is None or waiter.done():
+                waiter = waiters[tick] = loop.create_future()
+                loop.call_at(tick, self._expire_waiters, game_id, tick)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Another waiter's cancellation cancels the shared future; only
+                # stop if this task is the one being cancelled
+                if asyncio.current_task().cancelling():
+                    raise
+
+    def etag(self, game: Game, is_spymaster: bool = False) -> str:
+        """An entity tag for a role's view of a game, changing with every mutation."""
+        # The creation time tells apart games that reuse a room code
+        view = "s" if is_spymaster else "o"
+        return f'"{game.id}-{game.created_at.timestamp():.0f}-{game.version}-{view}"'
+
+    def get_room_buffers(self, game_id: str) -> dict:
+        """Sizes of what the service keeps per game besides the game, for memory accounting."""
+        cached = self._view_cache.get(game_id)
+        frames = cached[1].values() if cached else ()
+        return {
+            "historyDeltas": len(self._history.get(game_id, ())),
+            "pendingDeltas": len(self._pending_deltas.get(game_id, ())),
+            "cachedViews": len(frames),
+            "cachedViewBytes": sum(len(frame) for frame in frames),
+        }
+
+    def _log(self, op: str, game_id: str, **fields):
+        """Append a successful command to the event log."""
+        if self.log is not None and not self._replaying:
+            self.log.append({"op": op, "game": game_id, **fields})
+
+    def drain_deltas(self, game_id: str) -> List[dict]:
+        """Pop the deltas produced since the last call."""
+        return self._pending_deltas.pop(game_id, [])
+
+    def deltas_since(self, game_id: str, version: int) -> Optional[List[dict]]:
+        """Deltas that bring a copy at `version` up to date, or None if a snapshot is needed.
+
+        Only recent deltas produced by this process are kept, and snapshot
+        deltas carry no data, so anything older, missing or spanning a
+        snapshot needs a full view instead.
+        """
+        game = self.get_game(game_id)
+        if not game or version > game.version:
+            return None
+        if version == game.version:
+            return []
+
+        history = self._history.get(game_id)
+        if not history or history[0]["seq"] > version + 1:
+            return None
+        deltas = [delta for delta in history if delta["seq"] > version]
+        if len(deltas) != game.version - version or any(delta["op"] == "snapshot" for delta in deltas):
+            return None
+        return deltas
+
+    def lock(self, game_id: str) -> AsyncContextManager:
+        """Get the lock that serializes commands and their broadcasts for a game."""
+        return self.games.lock(game_id)
 
-    def create_game(self) -> Game:
-        """Create a new game in lobby state."""
-        game_id = self._generate_game_id()
-        game = Game(id=game_id)
-        self.games[game_id] = game
-        return game
+    def create_game(self, word_pack: str = DEFAULT_PACK, public: bool = False, clue_seconds: int = 0,
+                    guess_seconds: int = 0) -> Game:
+        """Create a new game in lobby state, dealing words from the given pack.
+
+        Non-zero clue_seconds and guess_seconds time each turn's clue and
+        guesses.
+        """
+        if word_pack not in word_packs:
+            raise KeyError(word_pack)
+
+        while True:
+            # Only IDs taken outside this allocator (e.g. by another worker) can collide
+            game = Game(
+                id=self.codes.allocate(), word_pack=word_pack, public=public,
+                clue_seconds=clue_seconds, guess_seconds=guess_seconds,
+            )
+            if self.games.add(game):
+                if self.reaper is not None:
+                    self.reaper.touch(game.id, game.state)
+                self.lobby.update(game)
+                self._log(
+                    "create", game.id, pack=word_pack, public=public,
+                    clue_seconds=clue_seconds, guess_seconds=guess_seconds,
+                )
+                return game
 
     def get_game(self, game_id: str) -> Optional[Game]:
         """Get a game by ID."""
@@ -39,8 +211,13 @@ class GameService:
         if player_id in game.players:
             return game.players[player_id]
 
+        if len(game.players) >= self.max_players:
+            return None
+
         player = Player(id=player_id, name=player_name)
         game.players[player_id] = player
+        self._emit(game, "player_joined", player=player.model_dump())
+        self._log("join", game_id, player=player_id, name=player_name)
         return player
 
     def remove_player(self, game_id: str, player_id: str) -> bool:
@@ -48,9 +225,33 @@ class GameService:
         game = self.get_game(game_id)
         if game and player_id in game.players:
             del game.players[player_id]
+            self._emit(game, "player_left", playerId=player_id)
+            self._log("leave", game_id, player=player_id)
             return True
         return False
 
+    def mark_disconnected(self, game_id: str, player_id: str) -> Optional[float]:
+        """Keep a player's seat after their connection drops, returning the time it dropped."""
+        game = self.get_game(game_id)
+        player = game.players.get(player_id) if game else None
+        if player is None:
+            return None
+
+        player.disconnected_at = time.time()
+        self._emit(game, "player_updated", player=player.model_dump())
+        return player.disconnected_at
+
+    def mark_connected(self, game_id: str, player_id: str) -> bool:
+        """Clear a player's disconnected mark when they resume their seat."""
+        game = self.get_game(game_id)
+        player = game.players.get(player_id) if game else None
+        if player is None or player.disconnected_at is None:
+            return False
+
+        player.disconnected_at = None
+        self._emit(game, "player_updated", player=player.model_dump())
+        return True
+
     def assign_role(self, game_id: str, player_id: str, team: Team, role: Role) -> bool:
         """Assign a team and role to a player."""
         game = self.get_game(game_id)
@@ -69,8 +270,39 @@ class GameService:
         player = game.players[player_id]
         player.team = team
         player.role = role
+        self._emit(game, "player_updated", player=player.model_dump())
+        self._log("role", game_id, player=player_id, team=team.value, role=role.value)
         return True
 
+    def add_bot(self, game_id: str, team: Team) -> Optional[Player]:
+        """Seat a bot as a team's spymaster, if the game is in the lobby and the seat is free."""
+        game = self.get_game(game_id)
+        if not game or game.state != GameState.LOBBY:
+            return None
+
+        if any(p.team == team and p.role == Role.SPYMASTER for p in game.players.values()):
+            return None
+
+        if len(game.players) >= self.max_players:
+            return None
+
+        player = Player(id=f"bot-{team.value}", name="Bot", team=team, role=Role.SPYMASTER, is_bot=True)
+        game.players[player.id] = player
+        self._emit(game, "player_joined", player=player.model_dump())
+        self._log("bot", game_id, team=team.value)
+        return player
+
+    def bot_to_play(self, game_id: str) -> Optional[Player]:
+        """The bot spymaster whose clue the game is waiting for, if any."""
+        game = self.get_game(game_id)
+        if not game or game.state != GameState.IN_PROGRESS or game.current_clue is not None:
+            return None
+
+        for player in game.players.values():
+            if player.is_bot and player.team == game.current_team and player.role == Role.SPYMASTER:
+                return player
+        return None
+
     def start_game(self, game_id: str) -> bool:
         """Initialize and start the game."""
         game = self.get_game(game_id)
@@ -91,32 +323,24 @@ class GameService:
             return False
 
         # Initialize board
-        words = WordService.get_random_words(25)
+        words = WordService.get_random_indices(BOARD_SIZE, game.word_pack, set(game.recent_words))
+
+        # Random starting team, which gets 9 cards to the other's 8
+        types, starting = deal()
+        starting_team = TEAMS[starting]
+        self._start(game, words, types, starting_team)
+        self._log("start", game_id, words=words, types=types.hex(), team=starting_team.value)
+        return True
 
-        # Randomly determine starting team (starting team gets 9 cards)
-        starting_team = random.choice([Team.RED, Team.BLUE])
+    def _start(self, game: Game, words: List[int], types: bytes, starting_team: Team):
+        """Deal a board and move the game into progress."""
         game.starting_team = starting_team
         game.current_team = starting_team
-
-        # Create card type distribution
-        # Starting team: 9, Other team: 8, Neutral: 7, Assassin: 1
-        card_types = []
-        if starting_team == Team.RED:
-            card_types = [CardType.RED] * 9 + [CardType.BLUE] * 8
-        else:
-            card_types = [CardType.BLUE] * 9 + [CardType.RED] * 8
-
-        card_types += [CardType.NEUTRAL] * 7 + [CardType.ASSASSIN]
-        random.shuffle(card_types)
-
-        # Create cards
-        game.cards = [
-            Card(word=words[i], type=card_types[i], position=i)
-            for i in range(25)
-        ]
-
+        game.board = Board(words, types, pack=game.word_pack)
+        game.recent_words = (game.recent_words + list(words))[-self.word_history * BOARD_SIZE:]
         game.state = GameState.IN_PROGRESS
-        return True
+        self._restart_clock(game)
+        self._emit(game, "snapshot")
 
     def give_clue(self, game_id: str, player_id: str, word: str, number: int) -> bool:
         """Spymaster gives a clue."""
@@ -137,7 +361,13 @@ class GameService:
         clue = Clue(word=word.upper(), number=number, team=game.current_team)
         game.current_clue = clue
         game.clue_history.append(clue)
-        game.guesses_remaining = number + 1  # Can guess number + 1 times
+        game.guesses_remaining = guesses_for(number)
+        self._restart_clock(game)
+        self._emit(
+            game, "clue_given",
+            clue=clue.model_dump(), guessesRemaining=game.guesses_remaining, turnDeadline=game.turn_deadline,
+        )
+        self._log("clue", game_id, player=player_id, word=word, number=number)
 
         return True
 
@@ -163,64 +393,75 @@ class GameService:
         if position < 0 or position >= 25:
             return {"success": False, "error": "Invalid card position"}
 
-        card = game.cards[position]
-        if card.revealed:
+        board = game.board
+        if board.is_revealed(position):
             return {"success": False, "error": "Card already revealed"}
 
         # Reveal the card
-        card.revealed = True
+        code = board.reveal(position)
+        card_type = CARD_TYPES[code]
+        game.reveal_order.append(position)
         game.guesses_remaining -= 1
+        self._log("reveal", game_id, player=player_id, position=position)
+
+        red_remaining = game.count_remaining(Team.RED)
+        blue_remaining = game.count_remaining(Team.BLUE)
+
+        self._emit(
+            game, "card_revealed",
+            position=position,
+            type=card_type.value,
+            guessesRemaining=game.guesses_remaining,
+            redRemaining=red_remaining,
+            blueRemaining=blue_remaining
+        )
 
         result = {
             "success": True,
-            "card": card.model_dump(),
+            "card": board.card_dict(position),
             "turn_ended": False,
             "game_over": False,
             "winner": None,
             "reason": None
         }
 
-        # Check for assassin
-        if card.type == CardType.ASSASSIN:
+        # Assassin, a team out of cards, a wrong card or no guesses left
+        outcome, winner = board.outcome(code, TEAMS.index(game.current_team), game.guesses_remaining)
+        if winner is not None:
             game.state = GameState.FINISHED
-            game.winner = Team.BLUE if game.current_team == Team.RED else Team.RED
+            game.winner = TEAMS[winner]
             result["game_over"] = True
             result["winner"] = game.winner.value
-            result["reason"] = "assassin"
-            return result
-
-        # Check for win condition
-        red_remaining = game.count_remaining(Team.RED)
-        blue_remaining = game.count_remaining(Team.BLUE)
-
-        if red_remaining == 0:
-            game.state = GameState.FINISHED
-            game.winner = Team.RED
-            result["game_over"] = True
-            result["winner"] = Team.RED.value
-            result["reason"] = "all_cards_revealed"
-            return result
-
-        if blue_remaining == 0:
-            game.state = GameState.FINISHED
-            game.winner = Team.BLUE
-            result["game_over"] = True
-            result["winner"] = Team.BLUE.value
-            result["reason"] = "all_cards_revealed"
-            return result
-
-        # Check if turn should end
-        if card.type.value != game.current_team.value:
-            # Wrong card - turn ends
-            result["turn_ended"] = True
-            self._end_turn(game)
-        elif game.guesses_remaining <= 0:
-            # No more guesses
+            result["reason"] = GAME_OVER_REASONS[outcome]
+            self._restart_clock(game)
+            self._emit(game, "game_over", winner=result["winner"], reason=result["reason"])
+            # Replayed games were archived before the restart
+            if self.archive is not None and not self._replaying:
+                self.archive.append(self._archive_record(game, result["reason"]))
+        elif outcome == TURN_OVER:
             result["turn_ended"] = True
             self._end_turn(game)
 
         return result
 
+    def _archive_record(self, game: Game, reason: str) -> dict:
+        board = game.board
+        return {
+            "gameId": game.id,
+            "finishedAt": time.time(),
+            "wordPack": game.word_pack,
+            "startingTeam": game.starting_team.value,
+            "winner": game.winner.value,
+            "reason": reason,
+            "cards": [board.card_dict(position) for position in range(len(board.types))],
+            "reveals": list(game.reveal_order),
+            "clues": [clue.model_dump() for clue in game.clue_history],
+            "players": [
+                {"name": p.name, "team": p.team, "role": p.role, "isBot": p.is_bot}
+                for p in game.players.values()
+            ],
+        }
+
     def end_turn(self, game_id: str, player_id: str) -> bool:
         """Operative voluntarily ends their turn."""
         game = self.get_game(game_id)
@@ -235,6 +476,7 @@ class GameService:
             return False
 
         self._end_turn(game)
+        self._log("end_turn", game_id, player=player_id)
         return True
 
     def _end_turn(self, game: Game):
@@ -242,35 +484,233 @@ class GameService:
         game.current_team = Team.BLUE if game.current_team == Team.RED else Team.RED
         game.current_clue = None
         game.guesses_remaining = 0
+        self._restart_clock(game)
+        self._emit(game, "turn_ended", currentTeam=game.current_team.value, turnDeadline=game.turn_deadline)
+
+    def _restart_clock(self, game: Game):
+        """Time the phase the game is now in: waiting for a clue, or for guesses after one."""
+        seconds = game.guess_seconds if game.current_clue is not None else game.clue_seconds
+        if game.state == GameState.IN_PROGRESS and seconds:
+            game.turn_deadline = time.time() + seconds
+            self.timers.schedule(game.id, game.turn_deadline)
+        else:
+            game.turn_deadline = None
+            self.timers.cancel(game.id)
 
-    def get_game_state(self, game_id: str) -> Optional[dict]:
-        """Get serializable game state."""
+    def expire_turn(self, game_id: str, deadline: Optional[float] = None) -> bool:
+        """Pass the turn because its clock ran out.
+
+        Does nothing if the game has since moved on from `deadline`
+        (any deadline if None).
+        """
+        game = self.get_game(game_id)
+        if not game or game.state != GameState.IN_PROGRESS or game.turn_deadline is None:
+            return False
+        if deadline is not None and game.turn_deadline != deadline:
+            return False
+
+        self._end_turn(game)
+        self._log("timeout", game_id)
+        return True
+
+    def get_state_frame(self, game_id: str, is_spymaster: bool, codec: Codec = DEFAULT_CODEC,
+                        wrap: bool = True) -> Optional[Frame]:
+        """Get the encoded game_state frame for a role, built once per game version and codec."""
         game = self.get_game(game_id)
         if not game:
             return None
 
+        cached = self._view_cache.get(game_id)
+        if cached is None or cached[0] != game.version:
+            cached = (game.version, {})
+            self._view_cache[game_id] = cached
+
+        frames = cached[1]
+        frame = frames.get((is_spymaster, codec.name))
+        if frame is None:
+            view = self._build_view(game, is_spymaster)
+            frame = codec.encode({"type": "game_state", "payload": view} if wrap else view)
+            frames[(is_spymaster, codec.name)] = frame
+        return frame
+
+    def get_state_body(self, game_id: str, is_spymaster: bool) -> Optional[bytes]:
+        """Get a role's view as a bare JSON body, built once per game version."""
+        return self.get_state_frame(game_id, is_spymaster, BODY_CODEC, wrap=False)
+
+    def _build_view(self, game: Game, is_spymaster: bool) -> dict:
+        """Build the game state as seen by a spymaster or an operative."""
         return {
             "id": game.id,
+            "version": game.version,
             "state": game.state.value,
-            "cards": [card.model_dump() for card in game.cards],
             "players": {pid: p.model_dump() for pid, p in game.players.items()},
             "currentTeam": game.current_team.value if game.current_team else None,
             "startingTeam": game.starting_team.value if game.starting_team else None,
             "currentClue": game.current_clue.model_dump() if game.current_clue else None,
             "guessesRemaining": game.guesses_remaining,
             "winner": game.winner.value if game.winner else None,
-            "redRemaining": game.count_remaining(Team.RED) if game.cards else 0,
-            "blueRemaining": game.count_remaining(Team.BLUE) if game.cards else 0,
-            "clueHistory": [c.model_dump() for c in game.clue_history]
+            "redRemaining": game.count_remaining(Team.RED),
+            "blueRemaining": game.count_remaining(Team.BLUE),
+            "clueHistory": [c.model_dump() for c in game.clue_history],
+            "clueSeconds": game.clue_seconds,
+            "guessSeconds": game.guess_seconds,
+            "turnDeadline": game.turn_deadline,
+            "cards": game.get_cards_for_role(is_spymaster),
         }
 
+    def reset_game(self, game_id: str) -> Optional[Game]:
+        """Reset a game to the lobby, keeping its ID and players."""
+        game = self.get_game(game_id)
+        if not game:
+            return None
+
+        new_game = Game(
+            id=game_id,
+            players=game.players,
+            version=game.version,
+            word_pack=game.word_pack,
+            public=game.public,
+            clue_seconds=game.clue_seconds,
+            guess_seconds=game.guess_seconds,
+            recent_words=game.recent_words,
+        )
+        self.timers.cancel(game_id)
+        self.games[game_id] = new_game
+        self._emit(new_game, "snapshot")
+        self._log("reset", game_id)
+        return new_game
+
     def delete_game(self, game_id: str) -> bool:
         """Delete a game."""
         if game_id in self.games:
             del self.games[game_id]
+            self._view_cache.pop(game_id, None)
+            self._pending_deltas.pop(game_id, None)
+            self._history.pop(game_id, None)
+            self.notify(game_id)
+            self.timers.cancel(game_id)
+            self.lobby.remove(game_id)
+            if self.reaper is not None:
+                self.reaper.forget(game_id)
+            self._log("delete", game_id)
             return True
         return False
 
+    def recover(self, log: EventLog) -> int:
+        """Rebuild games from the log's latest snapshot plus the records after it.
+
+        Returns the number of records replayed. Commands made after this call
+        are appended to the log.
+        """
+        games, records = log.load()
+        for data in games:
+            game = Game.model_validate_json(data)
+            self.games[game.id] = game
+            if self.reaper is not None:
+                self.reaper.touch(game.id, game.state)
+            self.lobby.update(game)
+            if game.turn_deadline is not None:
+                self.timers.schedule(game.id, game.turn_deadline)
+
+        replayed = 0
+        self._replaying = True
+        try:
+            for record in records:
+                self._replay(record)
+                replayed += 1
+        finally:
+            self._replaying = False
+            self._pending_deltas.clear()
+
+        self.log = log
+        return replayed
+
+    def _replay(self, record: dict):
+        """Re-apply a logged command."""
+        op, game_id = record["op"], record["game"]
+
+        if op == "create":
+            game = Game(
+                id=game_id, word_pack=record.get("pack", DEFAULT_PACK), public=record.get("public", False),
+                clue_seconds=record.get("clue_seconds", 0), guess_seconds=record.get("guess_seconds", 0),
+            )
+            if self.games.add(game):
+                if self.reaper is not None:
+                    self.reaper.touch(game_id, game.state)
+                self.lobby.update(game)
+        elif op == "join":
+            self.add_player(game_id, record["player"], record["name"])
+        elif op == "leave":
+            self.remove_player(game_id, record["player"])
+        elif op == "bot":
+            self.add_bot(game_id, Team(record["team"]))
+        elif op == "role":
+            self.assign_role(game_id, record["player"], Team(record["team"]), Role(record["role"]))
+        elif op == "start":
+            game = self.get_game(game_id)
+            if game:
+                self._start(game, record["words"], bytes.fromhex(record["types"]), Team(record["team"]))
+        elif op == "clue":
+            self.give_clue(game_id, record["player"], record["word"], record["number"])
+        elif op == "reveal":
+            self.reveal_card(game_id, record["player"], record["position"])
+        elif op == "end_turn":
+            self.end_turn(game_id, record["player"])
+        elif op == "timeout":
+            self.expire_turn(game_id)
+        elif op == "reset":
+            self.reset_game(game_id)
+        elif op == "delete":
+            self.delete_game(game_id)
+
+    def reap(self, is_active: Callable[[str], bool]) -> List[str]:
+        """Delete rooms idle past their TTL and the least active rooms over the cap.
+
+        Rooms for which is_active() is true are spared the TTL but not the
+        cap. Returns the IDs of the deleted games.
+
+        With a shared store this worker only sees its own activity, so a room
+        idle here may be live on another worker. Such rooms are only dropped
+        from this worker's caches, and deleted through the store elsewhere
+        as usual (e.g. when their last player leaves).
+        """
+        if self.reaper is None:
+            return []
+
+        evicted = self.reaper.expired(is_active) + self.reaper.over_capacity()
+        if self.games.shared:
+            for game_id in evicted:
+                self._view_cache.pop(game_id, None)
+                self._history.pop(game_id, None)
+            return []
+        for game_id in evicted:
+            self.delete_game(game_id)
+        return evicted
+
+    async def write_snapshot(self):
+        """Snapshot every game so the log before this point can be discarded."""
+        if self.log is None:
+            return
+
+        # Rolling and dumping happen without awaiting, so no command can land
+        # between the snapshot and the start of the new segment
+        segment = self.log.roll()
+        games = [game.model_dump_json() for game in self.games.values()]
+        await asyncio.to_thread(self.log.write_snapshot, segment, games)
+
 
 # Singleton instance
-game_service = GameService()
+game_service = GameService(
+    create_store(settings.store_url),
+    RoomReaper(
+        {
+            GameState.LOBBY: settings.lobby_ttl,
+            GameState.IN_PROGRESS: settings.in_progress_ttl,
+            GameState.FINISHED: settings.finished_ttl,
+        },
+        settings.max_rooms,
+    ),
+    settings.replay_buffer,
+    settings.word_history,
+    settings.max_players,
+)
@@ -0,0 +1,194 @@
+import asyncio
+import fcntl
+import os
+import sqlite3
+import zlib
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import AsyncContextManager, Iterator, MutableMapping, Optional
+
+from ..models import Game
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a game was modified elsewhere since it was loaded."""
+
+
+class GameStore(MutableMapping[str, Game]):
+    """Storage for live games behind GameService.
+
+    Besides the mapping interface, a store inserts new games atomically,
+    persists mutated games and serializes commands on a game.
+    """
+
+    # Whether other processes see the same games
+    shared = False
+
+    @abstractmethod
+    def add(self, game: Game) -> bool:
+        """Insert a new game, returning False if its ID is already taken."""
+
+    @abstractmethod
+    def save(self, game: Game):
+        """Persist a game after a mutation."""
+
+    @abstractmethod
+    def lock(self, game_id: str) -> AsyncContextManager:
+        """Get the lock serializing commands on a game."""
+
+
+class _FileLock:
+    """Async context manager pairing an asyncio lock with a cross-process flock."""
+
+    def __init__(self, local: asyncio.Lock, path: str):
+        self._local = local
+        self._path = path
+        self._fd: Optional[int] = None
+
+    async def __aenter__(self):
+        await self._local.acquire()
+        try:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    # Held by another worker; poll rather than block the loop
+                    await asyncio.sleep(0.001)
+            self._fd = fd
+        except BaseException:
+            self._local.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+        self._local.release()
+
+
+class SQLiteGameStore(GameStore):
+    """Games stored as JSON rows in a SQLite file shared by every worker.
+
+    This is a single-machine stand-in for a networked store. Saves check the
+    version the game was loaded at, and per-game locks are backed by flock on
+    one of a fixed set of lock files so workers serialize on the same game.
+
+    Decoded games are cached by version, so reading a game this worker has
+    already loaded costs one indexed lookup of its version rather than a
+    JSON decode.
+    """
+
+    shared = True
+    LOCK_SHARDS = 256
+
+    def __init__(self, path: str, cache_size: int = 10000):
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            "id TEXT PRIMARY KEY, version INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        self._lock_dir = path + ".locks"
+        os.makedirs(self._lock_dir, exist_ok=True)
+        self._locks: dict[str, asyncio.Lock] = {}
+        # game_id -> last decoded or saved game, least recently used first
+        self._cache: "OrderedDict[str, Game]" = OrderedDict()
+        self.cache_size = cache_size
+
+    def _remember(self, game: Game):
+        self._cache[game.id] = game
+        self._cache.move_to_end(game.id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def __getitem__(self, game_id: str) -> Game:
+        cached = self._cache.get(game_id)
+        # The data column is only read if the cached copy is stale
+        row = self._conn.execute(
+            "SELECT version, CASE WHEN version = ? THEN NULL ELSE data END FROM games WHERE id = ?",
+            (cached.version if cached is not None else -1, game_id),
+        ).fetchone()
+        if row is None:
+            self._cache.pop(game_id, None)
+            raise KeyError(game_id)
+        if row[1] is None:
+            self._cache.move_to_end(game_id)
+            return cached
+        game = Game.model_validate_json(row[1])
+        self._remember(game)
+        return game
+
+    def get(self, game_id: str, default=None):
+        try:
+            return self[game_id]
+        except KeyError:
+            return default
+
+    def __contains__(self, game_id) -> bool:
+        row = self._conn.execute("SELECT 1 FROM games WHERE id = ?", (game_id,)).fetchone()
+        return row is not None
+
+    def __setitem__(self, game_id: str, game: Game):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO games (id, version, data) VALUES (?, ?, ?)",
+            (game_id, game.version, game.model_dump_json()),
+        )
+        self._remember(game)
+
+    def __delitem__(self, game_id: str):
+        self._cache.pop(game_id, None)
+        cursor = self._conn.execute("DELETE FROM games WHERE id = ?", (game_id,))
+        if cursor.rowcount == 0:
+            raise KeyError(game_id)
+        self._locks.pop(game_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._conn.execute("SELECT id FROM games").fetchall()
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def add(self, game: Game) -> bool:
+        try:
+            self._conn.execute(
+                "INSERT INTO games (id, version, data) VALUES (?, ?, ?)",
+                (game.id, game.version, game.model_dump_json()),
+            )
+        except sqlite3.IntegrityError:
+            return False
+        self._remember(game)
+        return True
+
+    def save(self, game: Game):
+        # Each save follows exactly one version bump
+        cursor = self._conn.execute(
+            "UPDATE games SET version = ?, data = ? WHERE id = ? AND version = ?",
+            (game.version, game.model_dump_json(), game.id, game.version - 1),
+        )
+        if cursor.rowcount == 0:
+            # The cached copy was changed in place and no longer matches its version
+            self._cache.pop(game.id, None)
+            raise ConcurrentUpdateError(game.id)
+        self._remember(game)
+
+    def lock(self, game_id: str) -> AsyncContextManager:
+        local = self._locks.get(game_id)
+        if local is None:
+            local = self._locks[game_id] = asyncio.Lock()
+        shard = zlib.crc32(game_id.encode()) % self.LOCK_SHARDS
+        return _FileLock(local, os.path.join(self._lock_dir, f"{shard}.lock"))
+
+
+def create_store(url: str) -> GameStore:
+    """Create a game store from a URL such as memory:// or sqlite:///games.db."""
+    if url.startswith("memory://"):
+        from .game_registry import GameRegistry
+        return GameRegistry()
+    if url.startswith("sqlite:///"):
+        return SQLiteGameStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported game store: {url}")
@@ -0,0 +1,201 @@
+"""Index of public games for the lobby browser.
+
+GameService updates an entry whenever a public game changes. Entries are
+filed in buckets by everything the lobby filters on (state, whether
+seats are free, whether a spymaster is missing, word pack). Within a
+bucket, entries are ordered by a sequence number assigned when they
+entered it. A page is a merge of the matching buckets, newest first,
+starting below a cursor. It costs a binary search per bucket plus the
+page itself, however many rooms are live. Changes that don't move an
+entry between buckets, such as a revealed card, update it in place.
+"""
+import heapq
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..models import Game, GameState, Role, Team
+
+BucketKey = Tuple[str, bool, bool, str]
+
+
+class LobbyEntry:
+    """What the lobby shows about one game."""
+
+    __slots__ = ("id", "state", "players", "capacity", "missing_spymaster", "word_pack", "seq")
+
+    def __init__(self, id: str, state: str, players: int, capacity: int, missing_spymaster: bool,
+                 word_pack: str, seq: int = 0):
+        self.id = id
+        self.state = state
+        self.players = players
+        self.capacity = capacity
+        self.missing_spymaster = missing_spymaster
+        self.word_pack = word_pack
+        self.seq = seq
+
+    @classmethod
+    def from_game(cls, game: Game, capacity: int) -> "LobbyEntry":
+        spymasters = {p.team for p in game.players.values() if p.role == Role.SPYMASTER}
+        return cls(
+            game.id, game.state.value, len(game.players), capacity,
+            not {Team.RED, Team.BLUE} <= spymasters, game.word_pack,
+        )
+
+    @property
+    def open_seats(self) -> int:
+        return max(self.capacity - self.players, 0)
+
+    @property
+    def key(self) -> BucketKey:
+        return (self.state, self.open_seats > 0, self.missing_spymaster, self.word_pack)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "state": self.state,
+            "players": self.players,
+            "capacity": self.capacity,
+            "openSeats": self.open_seats,
+            "missingSpymaster": self.missing_spymaster,
+            "wordPack": self.word_pack,
+            "seq": self.seq,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LobbyEntry":
+        return cls(
+            data["id"], data["state"], data["players"], data["capacity"],
+            data["missingSpymaster"], data["wordPack"],
+        )
+
+
+Change = Tuple[str, Optional[BucketKey], Optional[LobbyEntry]]
+
+
+class Bucket:
+    """Entries with the same filter values, in the order they arrived."""
+
+    __slots__ = ("seqs", "ids")
+
+    def __init__(self):
+        # Ascending; new entries always get the highest seq, so they append
+        self.seqs: List[int] = []
+        self.ids: Dict[int, str] = {}
+
+    def add(self, seq: int, game_id: str):
+        self.seqs.append(seq)
+        self.ids[seq] = game_id
+
+    def discard(self, seq: int):
+        del self.ids[seq]
+        del self.seqs[bisect_left(self.seqs, seq)]
+
+    def newest(self, before: Optional[int]) -> Iterator[Tuple[int, str]]:
+        """(seq, game_id) for entries below `before`, newest first."""
+        seqs, ids = self.seqs, self.ids
+        i = len(seqs) if before is None else bisect_left(seqs, before)
+        while i > 0:
+            i -= 1
+            yield seqs[i], ids[seqs[i]]
+
+
+class LobbyFilter:
+    """Wanted values for each bucket key field; None matches anything."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, state: Optional[GameState] = None, open_seats: Optional[bool] = None,
+                 missing_spymaster: Optional[bool] = None, word_pack: Optional[str] = None):
+        self.values = (state.value if state else None, open_seats, missing_spymaster, word_pack)
+
+    def matches_key(self, key: BucketKey) -> bool:
+        return all(want is None or want == value for want, value in zip(self.values, key))
+
+    def matches(self, entry: LobbyEntry) -> bool:
+        return self.matches_key(entry.key)
+
+
+class LobbyIndex:
+    """Public games by filter values, for paged listings and change feeds."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries: Dict[str, LobbyEntry] = {}
+        self._buckets: Dict[BucketKey, Bucket] = {}
+        self._seq = 0
+        # IDs changed or removed since the feed last drained them, with their
+        # bucket key before the first of those changes (None if new), and
+        # the subset that changed here rather than on another worker
+        self._changed: Dict[str, Optional[BucketKey]] = {}
+        self._local: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, game: Game):
+        """Re-index a game after it changed."""
+        if game.public:
+            self.put(LobbyEntry.from_game(game, self.capacity))
+        else:
+            self.remove(game.id)
+
+    def put(self, entry: LobbyEntry, local: bool = True):
+        old = self._entries.get(entry.id)
+        self._mark(entry.id, old, local)
+        if old is not None and old.key == entry.key:
+            entry.seq = old.seq
+        else:
+            if old is not None:
+                self._discard(old)
+            self._seq += 1
+            entry.seq = self._seq
+            bucket = self._buckets.get(entry.key)
+            if bucket is None:
+                bucket = self._buckets[entry.key] = Bucket()
+            bucket.add(entry.seq, entry.id)
+        self._entries[entry.id] = entry
+
+    def remove(self, game_id: str, local: bool = True):
+        entry = self._entries.pop(game_id, None)
+        if entry is not None:
+            self._mark(game_id, entry, local)
+            self._discard(entry)
+
+    def _discard(self, entry: LobbyEntry):
+        bucket = self._buckets[entry.key]
+        bucket.discard(entry.seq)
+        if not bucket.ids:
+            del self._buckets[entry.key]
+
+    def _mark(self, game_id: str, old: Optional[LobbyEntry], local: bool):
+        if game_id not in self._changed:
+            self._changed[game_id] = old.key if old is not None else None
+        if local:
+            self._local.add(game_id)
+
+    def get(self, game_id: str) -> Optional[LobbyEntry]:
+        return self._entries.get(game_id)
+
+    def query(self, where: LobbyFilter, limit: int = 20,
+              before: Optional[int] = None) -> Tuple[List[LobbyEntry], Optional[int]]:
+        """A page of matching entries, newest first, and the cursor for the next page."""
+        streams = [
+            bucket.newest(before) for key, bucket in self._buckets.items() if where.matches_key(key)
+        ]
+        page: List[LobbyEntry] = []
+        for _, game_id in heapq.merge(*streams, reverse=True):
+            if len(page) == limit:
+                return page, page[-1].seq
+            page.append(self._entries[game_id])
+        return page, None
+
+    def drain_changes(self) -> Tuple[List[Change], Set[str]]:
+        """Pop the changes since the last call, and the IDs among them that changed on this worker.
+
+        Each change is (game_id, bucket key before, entry now), the entry
+        being None if the game was removed.
+        """
+        changed, local = self._changed, self._local
+        self._changed, self._local = {}, set()
+        return [(game_id, key, self._entries.get(game_id)) for game_id, key in changed.items()], local
+
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+from ..models import GameState
+
+
+class RoomReaper:
+    """Tracks room activity to expire idle rooms and cap the number of live rooms.
+
+    Every room sits in an insertion-ordered dict for its state and in a
+    global one, both ordered by last activity. Touching a room moves it to
+    the end, so the rooms due to expire are always at the front and a tick
+    only looks at rooms it actually evicts.
+    """
+
+    def __init__(self, ttls: Dict[GameState, float], max_rooms: int,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttls = ttls
+        self.max_rooms = max_rooms
+        self._clock = clock
+        # state -> game_id -> last activity, oldest first
+        self._by_state: Dict[GameState, "OrderedDict[str, float]"] = {state: OrderedDict() for state in GameState}
+        # game_id -> state, oldest activity first
+        self._lru: "OrderedDict[str, GameState]" = OrderedDict()
+        self.evictions: Dict[str, int] = {state.value: 0 for state in GameState}
+        self.evictions["capacity"] = 0
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def touch(self, game_id: str, state: GameState):
+        """Record activity on a room."""
+        previous = self._lru.get(game_id)
+        if previous is not None and previous != state:
+            del self._by_state[previous][game_id]
+        entries = self._by_state[state]
+        entries[game_id] = self._clock()
+        entries.move_to_end(game_id)
+        self._lru[game_id] = state
+        self._lru.move_to_end(game_id)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of tracked rooms in each state."""
+        return {state.value: len(entries) for state, entries in self._by_state.items()}
+
+    def forget(self, game_id: str):
+        """Stop tracking a deleted room."""
+        state = self._lru.pop(game_id, None)
+        if state is not None:
+            del self._by_state[state][game_id]
+
+    def expired(self, is_active: Callable[[str], bool]) -> List[str]:
+        """Pop rooms idle past their state's TTL.
+
+        Rooms for which is_active() is true are treated as fresh activity
+        instead, so they are checked again one TTL later.
+        """
+        now = self._clock()
+        result = []
+        for state, entries in self._by_state.items():
+            ttl = self.ttls[state]
+            while entries:
+                game_id, last = next(iter(entries.items()))
+                if now - last <= ttl:
+                    break
+                if is_active(game_id):
+                    self.touch(game_id, state)
+                    continue
+                self.forget(game_id)
+                self.evictions[state.value] += 1
+                result.append(game_id)
+        return result
+
+    def over_capacity(self) -> List[str]:
+        """Pop the least recently active rooms beyond max_rooms."""
+        result = []
+        while len(self._lru) > self.max_rooms:
+            game_id = next(iter(self._lru))
+            self.forget(game_id)
+            self.evictions["capacity"] += 1
+            result.append(game_id)
+        return result
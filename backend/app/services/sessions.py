@@ -0,0 +1,64 @@
+import asyncio
+import hashlib
+import hmac
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from ..config import settings
+
+
+class SessionManager:
+    """Resume tokens and grace-period timers for player seats.
+
+    A token is the player ID signed with a secret and the game ID, so any
+    worker sharing the secret can check it without stored state. When a
+    player's connection drops, their seat is kept for `grace` seconds
+    before a callback removes it.
+    """
+
+    def __init__(self, secret: str, grace: float):
+        self.secret = secret.encode()
+        self.grace = grace
+        # (game_id, player_id) -> pending seat removal
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        # Seat removals that have started, kept until they finish
+        self._expiring: Set[asyncio.Task] = set()
+
+    def _sign(self, game_id: str, player_id: str) -> str:
+        message = f"{game_id}:{player_id}".encode()
+        return hmac.new(self.secret, message, hashlib.sha256).hexdigest()[:32]
+
+    def token(self, game_id: str, player_id: str) -> str:
+        """Issue the token a player presents to resume their seat."""
+        return f"{player_id}.{self._sign(game_id, player_id)}"
+
+    def verify(self, game_id: str, token: str) -> Optional[str]:
+        """Return the player ID a token was issued for, if it is valid for this game."""
+        player_id, _, signature = token.rpartition(".")
+        if not player_id:
+            return None
+        # compare_digest only accepts ASCII str, so compare bytes to handle any token
+        if hmac.compare_digest(signature.encode(), self._sign(game_id, player_id).encode()):
+            return player_id
+        return None
+
+    def hold(self, game_id: str, player_id: str, expire: Callable[[], Awaitable[None]]):
+        """Run `expire` once the grace period ends, unless the player resumes first."""
+        self.release(game_id, player_id)
+        key = (game_id, player_id)
+
+        def fire():
+            self._timers.pop(key, None)
+            task = asyncio.create_task(expire())
+            self._expiring.add(task)
+            task.add_done_callback(self._expiring.discard)
+
+        self._timers[key] = asyncio.get_running_loop().call_later(self.grace, fire)
+
+    def release(self, game_id: str, player_id: str):
+        """Cancel a pending seat removal."""
+        timer = self._timers.pop((game_id, player_id), None)
+        if timer is not None:
+            timer.cancel()
+
+
+sessions = SessionManager(settings.session_secret, settings.resume_grace)
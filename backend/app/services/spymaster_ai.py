@@ -0,0 +1,247 @@
+"""Bot spymasters that pick clues from word embeddings.
+
+The vocabulary is a word pack (<prefix>.pack) and its unit-length vectors
+a float32 matrix in NumPy format (<prefix>.npy), both memory-mapped.
+Choosing a clue scores every vocabulary word at once: the vocabulary's
+similarities to the 25 board words are one matrix product, computed once
+per board and cached across turns. Each turn then only picks the rows of
+unrevealed cards and compares each word's target similarities against its
+worst opponent, neutral and assassin similarity. Clues are computed in a thread
+pool, since NumPy releases the GIL for the heavy parts.
+
+Build the files from word2vec/GloVe text vectors:
+
+    python -m app.services.spymaster_ai glove.txt /srv/ai/glove --limit 50000
+
+Requires NumPy; without it, or without CODENAMES_AI_EMBEDDINGS, bots are
+disabled.
+"""
+import argparse
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config import settings
+from ..models import Game, Team
+from ..models.board import ASSASSIN, BLUE, BOARD_SIZE, NEUTRAL, RED
+from ..utils.word_lists import WORDS
+from ..utils.word_packs import WordPack, write_pack
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Highest number a bot will attach to a clue
+MAX_CLUE_NUMBER = 4
+# How much closer a target must be to the clue than every card to avoid
+MARGIN = 0.05
+# Neutral cards only end the turn, so they are feared less than opponent cards
+NEUTRAL_SLACK = 0.05
+# The assassin loses the game, so it is feared more
+ASSASSIN_MARGIN = 0.1
+# Top-scoring words checked against the board-word rules before a full sort
+CANDIDATES = 64
+
+
+class Embeddings:
+    """A vocabulary and its unit-length vectors, one row per word."""
+
+    def __init__(self, vocab: WordPack, vectors):
+        if len(vocab) != len(vectors):
+            raise ValueError("Vocabulary and vectors differ in length")
+        self.vocab = vocab
+        self.vectors = vectors
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def open(cls, prefix: str) -> "Embeddings":
+        return cls(WordPack.open("embeddings", prefix + ".pack"), np.load(prefix + ".npy", mmap_mode="r"))
+
+    def row(self, word: str) -> Optional[int]:
+        """The row of a word's vector, if it is in the vocabulary."""
+        if self._index is None:
+            # Built on first use; later lookups are a dict hit
+            with self._lock:
+                if self._index is None:
+                    self._index = {self.vocab[i]: i for i in range(len(self.vocab))}
+        return self._index.get(word)
+
+    def word(self, row: int) -> str:
+        return self.vocab[row]
+
+
+def is_legal(clue: str, words: Sequence[str]) -> bool:
+    """A clue may not be, contain or be part of a word on the board."""
+    return not any(clue in word or word in clue for word in words)
+
+
+class ClueEngine:
+    """Scores the whole vocabulary as clues for a board, caching per-board similarities."""
+
+    def __init__(self, embeddings: Embeddings, cache_boards: int = 32):
+        self.embeddings = embeddings
+        self.cache_boards = cache_boards
+        # Board words -> 25 x vocabulary size cosine similarities
+        self._cache: "OrderedDict[Tuple[str, ...], object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def similarities(self, words: Tuple[str, ...]):
+        """Similarities of every vocabulary word to each board word, one row per card."""
+        with self._lock:
+            similarities = self._cache.get(words)
+            if similarities is not None:
+                self._cache.move_to_end(words)
+                return similarities
+
+        embeddings = self.embeddings
+        board = np.zeros((len(words), embeddings.vectors.shape[1]), dtype=np.float32)
+        for position, word in enumerate(words):
+            # Words missing from the vocabulary keep a zero vector: similar to nothing
+            row = embeddings.row(word)
+            if row is not None:
+                board[position] = embeddings.vectors[row]
+        # Vocabulary-major is the faster product; each card's row is then
+        # made contiguous for the per-turn row picks
+        similarities = np.ascontiguousarray((embeddings.vectors @ board.T).T)
+
+        with self._lock:
+            self._cache[words] = similarities
+            while len(self._cache) > self.cache_boards:
+                self._cache.popitem(last=False)
+        return similarities
+
+    def suggest(self, words: Tuple[str, ...], types: bytes, revealed: int, team: int) -> Optional[Tuple[str, int]]:
+        """Pick a (clue, number) for `team`'s spymaster, or None if it has nothing left to find."""
+        similarities = self.similarities(words)
+        hidden = [position for position in range(len(types)) if not revealed >> position & 1]
+        targets = [p for p in hidden if types[p] == team]
+        if not targets:
+            return None
+        opponents = [p for p in hidden if types[p] == (BLUE if team == RED else RED)]
+        neutrals = [p for p in hidden if types[p] == NEUTRAL]
+        assassins = [p for p in hidden if types[p] == ASSASSIN]
+
+        # How close each word is to the card it must not lead guessers to
+        danger = np.full(similarities.shape[1], -1.0, dtype=np.float32)
+        if opponents:
+            np.maximum(danger, similarities[opponents].max(axis=0), out=danger)
+        if neutrals:
+            np.maximum(danger, similarities[neutrals].max(axis=0) - NEUTRAL_SLACK, out=danger)
+        if assassins:
+            np.maximum(danger, similarities[assassins].max(axis=0) + ASSASSIN_MARGIN, out=danger)
+
+        # Targets each word points to more clearly than anything dangerous
+        target = similarities[targets]
+        hits = target > danger + MARGIN
+        count = np.minimum(hits.sum(axis=0), MAX_CLUE_NUMBER)
+        weakest = np.where(hits, target, np.inf).min(axis=0) - danger
+        closest = target.max(axis=0) - danger
+        # More targets first, then the clearest margin on the weakest one;
+        # margins are below 2, so one more target always outweighs them
+        value = np.where(count > 0, 2 * count + weakest, closest - 2)
+
+        # Board-word rules are checked on the best few candidates only
+        if len(value) > CANDIDATES:
+            candidates = np.argpartition(-value, CANDIDATES)[:CANDIDATES]
+        else:
+            candidates = np.arange(len(value))
+        for order in (candidates[np.argsort(-value[candidates])], np.argsort(-value)):
+            for row in order:
+                clue = self.embeddings.word(int(row))
+                if is_legal(clue, words):
+                    return clue, max(int(count[row]), 1)
+        return None
+
+
+class SpymasterAI:
+    """Runs a clue engine off the event loop."""
+
+    def __init__(self, engine: Optional[ClueEngine], workers: int = 2):
+        self.engine = engine
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def available(self) -> bool:
+        return self.engine is not None
+
+    def start(self):
+        """Start the worker threads and index the vocabulary in the background."""
+        if self.engine is not None and self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="spymaster-ai")
+            self._executor.submit(self.engine.embeddings.row, "")
+
+    async def suggest(self, game: Game) -> Optional[Tuple[str, int]]:
+        """Pick a clue for the team to play in `game`."""
+        self.start()
+        board = game.board
+        # Copy what the worker needs, since the game may change while it runs
+        words = tuple(board.word(position) for position in range(BOARD_SIZE))
+        team = RED if game.current_team == Team.RED else BLUE
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.engine.suggest, words, bytes(board.types), board.revealed, team,
+        )
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def create_ai(prefix: str, workers: int, cache_boards: int) -> SpymasterAI:
+    """Create the bot service, disabled if NumPy or the embeddings are missing."""
+    if np is None or not prefix:
+        return SpymasterAI(None)
+    return SpymasterAI(ClueEngine(Embeddings.open(prefix), cache_boards), workers)
+
+
+def build_embeddings(source: str, prefix: str, limit: int, vocab: Sequence[str] = ()):
+    """Convert text vectors ("word v1 v2 ...", most frequent first) into <prefix>.pack and <prefix>.npy.
+
+    Keeps the first `limit` purely alphabetic words, plus any in `vocab`
+    further down so board words always have vectors.
+    """
+    wanted = {word.upper() for word in vocab}
+    words, rows, seen = [], [], set()
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip().split(" ")
+            word = parts[0].upper()
+            if len(parts) < 3 or not word.isalpha() or word in seen:
+                continue
+            if len(words) >= limit and word not in wanted:
+                continue
+            seen.add(word)
+            words.append(word)
+            rows.append(np.asarray(parts[1:], dtype=np.float32))
+            if len(words) >= limit and wanted <= seen:
+                break
+
+    vectors = np.vstack(rows)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+    np.save(prefix + ".npy", vectors)
+    write_pack(prefix + ".pack", words)
+    return len(words)
+
+
+spymaster_ai = create_ai(settings.ai_embeddings, settings.ai_workers, settings.ai_cache_boards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build bot spymaster embeddings from word2vec/GloVe text vectors.")
+    parser.add_argument("source", help="text file with one 'word v1 v2 ...' line per word, most frequent first")
+    parser.add_argument("prefix", help="output path prefix; writes <prefix>.npy and <prefix>.pack")
+    parser.add_argument("--limit", type=int, default=50000, help="vocabulary size (default 50000)")
+    args = parser.parse_args()
+    if np is None:
+        parser.error("NumPy is required")
+    count = build_embeddings(args.source, args.prefix, args.limit, WORDS)
+    print(f"Wrote {count} vectors to {args.prefix}.npy and {args.prefix}.pack")
+
+
+if __name__ == "__main__":
+    main()
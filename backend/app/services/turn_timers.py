@@ -0,0 +1,81 @@
+import asyncio
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..metrics import timer_lag_seconds
+
+
+class TurnTimers:
+    """Turn deadlines for every room, kept in one heap and served by one timer handle.
+
+    Deadlines are wall-clock times, as stored on games. Cancelling or
+    moving a deadline only updates a dict. The superseded heap entry is
+    skipped when it reaches the top, and the heap is rebuilt once stale
+    entries outnumber live ones, so early clues, guesses and turn ends
+    never search the heap.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, str]] = []
+        # game_id -> its live deadline
+        self._deadlines: Dict[str, float] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._on_expire: Optional[Callable[[str, float], None]] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._armed_for = 0.0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, game_id: str, deadline: float):
+        """Set a game's deadline, replacing any it had."""
+        self._deadlines[game_id] = deadline
+        heapq.heappush(self._heap, (deadline, game_id))
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(deadline, game_id) for game_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+        self._arm()
+
+    def cancel(self, game_id: str):
+        self._deadlines.pop(game_id, None)
+
+    def start(self, on_expire: Callable[[str, float], None]):
+        """Call on_expire(game_id, deadline) from the running loop as deadlines pass."""
+        self._loop = asyncio.get_running_loop()
+        self._on_expire = on_expire
+        self._arm()
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._loop = None
+
+    def _arm(self):
+        """Point the timer handle at the earliest live deadline."""
+        heap, deadlines = self._heap, self._deadlines
+        while heap and deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        if self._loop is None or not heap:
+            return
+        deadline = heap[0][0]
+        if self._handle is not None:
+            if self._armed_for <= deadline:
+                return
+            self._handle.cancel()
+        self._armed_for = deadline
+        self._handle = self._loop.call_later(max(0.0, deadline - time.time()), self._fire)
+
+    def _fire(self):
+        self._handle = None
+        now = time.time()
+        heap, deadlines = self._heap, self._deadlines
+        while heap and heap[0][0] <= now:
+            deadline, game_id = heapq.heappop(heap)
+            if deadlines.get(game_id) != deadline:
+                continue
+            del deadlines[game_id]
+            timer_lag_seconds.observe("fired", now - deadline)
+            self._on_expire(game_id, deadline)
+        self._arm()
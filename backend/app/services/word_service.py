@@ -1,13 +1,19 @@
-import random
-from typing import List
+from typing import AbstractSet, List
 
-from ..utils.word_lists import WORDS
+from ..utils.word_packs import DEFAULT_PACK, word_packs
 
 
 class WordService:
     """Service for managing word selection."""
 
     @staticmethod
-    def get_random_words(count: int = 25) -> List[str]:
+    def get_random_words(count: int = 25, pack: str = DEFAULT_PACK) -> List[str]:
         """Select random words for a game board."""
-        return random.sample(WORDS, count)
+        word_pack = word_packs.get(pack)
+        return [word_pack[index] for index in word_pack.sample(count)]
+
+    @staticmethod
+    def get_random_indices(count: int = 25, pack: str = DEFAULT_PACK,
+                           exclude: AbstractSet[int] = frozenset()) -> List[int]:
+        """Select random word indices for a game board, avoiding recently used ones."""
+        return word_packs.get(pack).sample(count, exclude)
@@ -0,0 +1,249 @@
+"""Headless self-play: full games between bot policies, without a server.
+
+Games run on bare Boards through the rules the server uses (deal,
+guesses_for and Board.outcome), skipping the Game model, deltas and
+logging. Batches are spread over a process pool. Each batch has its own
+RNG seeded from the run seed and the batch number, so a run is
+reproducible for a given seed, batch size and game count, whatever the
+number of workers.
+
+Policies are named "name[:arg]", e.g. "fixed:2" or "skilled:0.7", or
+given as "package.module.Class[:arg]" for one defined elsewhere. A
+spymaster policy has clue(board, team, rng) -> number. An operative
+policy has guess(board, team, guesses_remaining, rng), which returns a
+position or None to end the turn.
+
+Usage (from backend/):
+    python -m app.simulator --games 1000000 --workers 4 --seed 1
+"""
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from .models.board import (
+    ASSASSINATED, BLUE, BOARD_SIZE, CONTINUE, RED, Board, deal, guesses_for,
+)
+
+# A board's words don't affect play, so every simulated board uses these
+_NO_WORDS = [0] * BOARD_SIZE
+
+# Longest game, in turns, kept in the length histogram; longer ones share the last bucket
+MAX_TURNS = 32
+# Games undecided after this many turns are abandoned and counted as aborted,
+# so policies that never find a card can't hang a run
+TURN_LIMIT = 1000
+
+
+class FixedSpymaster:
+    """Clues a fixed number of cards, or all the team has left if fewer."""
+
+    def __init__(self, number: float = 2):
+        if number < 1:
+            raise ValueError("fixed spymaster number must be at least 1")
+        self.number = int(number)
+
+    def clue(self, board: Board, team: int, rng: random.Random) -> int:
+        return min(self.number, board.remaining[team])
+
+
+class RandomOperative:
+    """Guesses hidden cards at random, ending the turn before the bonus guess."""
+
+    def __init__(self, arg: float = 0):
+        pass
+
+    def guess(self, board: Board, team: int, guesses_remaining: int, rng: random.Random) -> Optional[int]:
+        if guesses_remaining <= 1:
+            return None
+        # Redraw until a hidden card comes up: cheaper than listing them
+        revealed = board.revealed
+        while True:
+            position = int(rng.random() * BOARD_SIZE)
+            if not revealed >> position & 1:
+                return position
+
+
+class SkilledOperative(RandomOperative):
+    """Finds one of the team's cards with the given probability, else guesses at random."""
+
+    def __init__(self, accuracy: float = 0.8):
+        self.accuracy = accuracy
+
+    def guess(self, board: Board, team: int, guesses_remaining: int, rng: random.Random) -> Optional[int]:
+        if guesses_remaining > 1 and rng.random() < self.accuracy:
+            revealed, types = board.revealed, board.types
+            while True:
+                position = int(rng.random() * BOARD_SIZE)
+                if types[position] == team and not revealed >> position & 1:
+                    return position
+        return super().guess(board, team, guesses_remaining, rng)
+
+
+SPYMASTERS = {"fixed": FixedSpymaster}
+OPERATIVES = {"random": RandomOperative, "skilled": SkilledOperative}
+
+
+def load_policy(spec: str, builtin: Dict[str, type]):
+    """Create a policy from "name[:arg]" or "package.module.Class[:arg]"."""
+    name, _, arg = spec.partition(":")
+    if name in builtin:
+        cls = builtin[name]
+    else:
+        module, _, attr = name.rpartition(".")
+        if not module:
+            raise ValueError(f"Unknown policy {name!r}; choose from {', '.join(builtin)}")
+        cls = getattr(importlib.import_module(module), attr)
+    return cls(float(arg)) if arg else cls()
+
+
+def play(spymasters, operatives, rng: random.Random) -> Tuple[int, Optional[int], Optional[int], int]:
+    """Play one game, returning (starting team, winner, outcome, turns).
+
+    Winner and outcome are None for a game abandoned at TURN_LIMIT.
+    """
+    types, starting = deal(rng)
+    board = Board(_NO_WORDS, types)
+    team = starting
+    turns = 0
+    while turns < TURN_LIMIT:
+        turns += 1
+        guesses = guesses_for(spymasters[team].clue(board, team, rng))
+        operative = operatives[team]
+        outcome = CONTINUE
+        while outcome == CONTINUE:
+            position = operative.guess(board, team, guesses, rng)
+            if position is None:
+                break
+            guesses -= 1
+            outcome, winner = board.outcome(board.reveal(position), team, guesses)
+            if winner is not None:
+                return starting, winner, outcome, turns
+        team = BLUE - team
+    return starting, None, None, turns
+
+
+class Stats:
+    """Aggregate results of a batch of games; batches merge by addition."""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = [0, 0]  # by team
+        self.starting_wins = 0
+        self.assassinations = 0
+        self.aborted = 0
+        self.turns = 0
+        self.lengths = [0] * (MAX_TURNS + 1)
+
+    def add(self, starting: int, winner: Optional[int], outcome: Optional[int], turns: int):
+        self.games += 1
+        if winner is None:
+            self.aborted += 1
+        else:
+            self.wins[winner] += 1
+            self.starting_wins += winner == starting
+        self.assassinations += outcome == ASSASSINATED
+        self.turns += turns
+        self.lengths[min(turns, MAX_TURNS)] += 1
+
+    def merge(self, other: "Stats"):
+        self.games += other.games
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.starting_wins += other.starting_wins
+        self.assassinations += other.assassinations
+        self.aborted += other.aborted
+        self.turns += other.turns
+        self.lengths = [a + b for a, b in zip(self.lengths, other.lengths)]
+
+    def summary(self) -> dict:
+        games = max(self.games, 1)
+        return {
+            "games": self.games,
+            "red_win_rate": self.wins[RED] / games,
+            "blue_win_rate": self.wins[BLUE] / games,
+            "starting_team_win_rate": self.starting_wins / games,
+            "assassin_rate": self.assassinations / games,
+            "cleared_rate": (self.games - self.assassinations - self.aborted) / games,
+            "aborted_rate": self.aborted / games,
+            "mean_turns": self.turns / games,
+            "turns_histogram": {
+                (f"{turns}+" if turns == MAX_TURNS else str(turns)): count
+                for turns, count in enumerate(self.lengths) if count
+            },
+        }
+
+
+def run_batch(seed: int, batch: int, games: int, spymaster: str, operative: str) -> Stats:
+    """Play a batch of games with its own seeded RNG."""
+    rng = random.Random(f"{seed}:{batch}")
+    spymasters = [load_policy(spymaster, SPYMASTERS) for _ in (RED, BLUE)]
+    operatives = [load_policy(operative, OPERATIVES) for _ in (RED, BLUE)]
+    stats = Stats()
+    add = stats.add
+    for _ in range(games):
+        add(*play(spymasters, operatives, rng))
+    return stats
+
+
+def simulate(games: int, workers: int, seed: int, spymaster: str, operative: str,
+             batch_size: int = 10000) -> Stats:
+    """Play `games` games over a pool of `workers` processes and merge their stats."""
+    batches = [min(batch_size, games - start) for start in range(0, games, batch_size)]
+    stats = Stats()
+    if workers <= 1:
+        for batch, size in enumerate(batches):
+            stats.merge(run_batch(seed, batch, size, spymaster, operative))
+        return stats
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(run_batch, seed, batch, size, spymaster, operative)
+            for batch, size in enumerate(batches)
+        ]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--spymaster", default="fixed:2", help="spymaster policy for both teams")
+    parser.add_argument("--operative", default="skilled:0.8", help="operative policy for both teams")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+    try:
+        load_policy(args.spymaster, SPYMASTERS)
+        load_policy(args.operative, OPERATIVES)
+    except (ValueError, ImportError, AttributeError) as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    stats = simulate(args.games, args.workers, args.seed, args.spymaster, args.operative, args.batch_size)
+    elapsed = time.perf_counter() - start
+
+    summary = stats.summary()
+    summary["seconds"] = round(elapsed, 3)
+    summary["games_per_second"] = round(stats.games / elapsed)
+    summary["games_per_second_per_worker"] = round(stats.games / elapsed / max(args.workers, 1))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    histogram = summary.pop("turns_histogram")
+    for key, value in summary.items():
+        print(f"{key:<30} {value:.4f}" if isinstance(value, float) else f"{key:<30} {value}")
+    print("turns  games")
+    for turns, count in histogram.items():
+        print(f"{turns:>5}  {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Word packs stored as compact, memory-mapped files.
+
+A pack file is a header, an offset table and the UTF-8 words back to back:
+
+    b"CNWP" | version: u16 | reserved: u16 | count: u32
+    offsets: u32 * (count + 1), relative to the start of the words
+    words
+
+All integers are little-endian. Opening a pack maps the file and reads
+the 12-byte header; a word is decoded from the mapping only when it is
+looked up. Startup time and resident memory therefore don't grow with pack
+size, and the workers on a host share the pages through the page cache.
+
+Build a pack from a text file with one word per line:
+
+    python -m app.utils.word_packs words.txt packs/animals.pack
+"""
+import argparse
+import mmap
+import os
+import random
+import re
+import struct
+from typing import AbstractSet, Dict, Iterable, List, Union
+
+from ..config import settings
+from .word_lists import WORDS
+
+MAGIC = b"CNWP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+OFFSET_PAIR = struct.Struct("<II")
+
+# The built-in list, always available
+DEFAULT_PACK = "standard"
+
+_PACK_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def encode_pack(words: Iterable[str]) -> bytes:
+    """Encode words into the pack file format."""
+    data = [word.encode("utf-8") for word in words]
+    offsets = [0]
+    for word in data:
+        offsets.append(offsets[-1] + len(word))
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, 0, len(data)),
+        struct.pack(f"<{len(offsets)}I", *offsets),
+        *data,
+    ])
+
+
+def write_pack(path: str, words: Iterable[str]):
+    """Write a pack file, replacing any existing one atomically."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode_pack(words))
+    os.replace(tmp, path)
+
+
+class WordPack:
+    """A read-only list of words backed by a pack file's bytes."""
+
+    __slots__ = ("name", "count", "_buffer", "_words_start")
+
+    def __init__(self, name: str, buffer: Union[bytes, mmap.mmap]):
+        magic, version, _, count = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} word pack: {name}")
+        self.name = name
+        self.count = count
+        self._buffer = buffer
+        self._words_start = HEADER.size + 4 * (count + 1)
+
+    @classmethod
+    def open(cls, name: str, path: str) -> "WordPack":
+        """Map a pack file; the mapping stays valid after the file is closed."""
+        with open(path, "rb") as f:
+            return cls(name, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_words(cls, name: str, words: Iterable[str]) -> "WordPack":
+        return cls(name, encode_pack(words))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        start, end = OFFSET_PAIR.unpack_from(self._buffer, HEADER.size + 4 * index)
+        base = self._words_start
+        return self._buffer[base + start:base + end].decode("utf-8")
+
+    def sample(self, count: int, exclude: AbstractSet[int] = frozenset()) -> List[int]:
+        """Pick `count` distinct word indices, avoiding those in `exclude` while enough are left.
+
+        Indices are drawn at random and repeats rejected, which takes about
+        `count` draws while most of the pack is eligible and never reads the
+        words. Only when the eligible words are few is the pack scanned.
+        """
+        if count > self.count:
+            raise ValueError(f"Pack {self.name} has only {self.count} words")
+        available = self.count - len(exclude)
+        if available < count:
+            exclude = frozenset()
+            available = self.count
+
+        if available < max(self.count // 4, 2 * count):
+            return random.sample([i for i in range(self.count) if i not in exclude], count)
+
+        picked: List[int] = []
+        seen = set()
+        while len(picked) < count:
+            index = random.randrange(self.count)
+            if index not in exclude and index not in seen:
+                seen.add(index)
+                picked.append(index)
+        return picked
+
+
+class WordPacks:
+    """Packs by name: the built-in list plus <name>.pack files in a directory, mapped on first use."""
+
+    def __init__(self, directory: str = ""):
+        self.directory = directory
+        self._packs: Dict[str, WordPack] = {DEFAULT_PACK: WordPack.from_words(DEFAULT_PACK, WORDS)}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name + ".pack")
+
+    def __contains__(self, name: str) -> bool:
+        if name in self._packs:
+            return True
+        return bool(self.directory and _PACK_NAME.fullmatch(name) and os.path.isfile(self._path(name)))
+
+    def get(self, name: str) -> WordPack:
+        """Get a pack by name, raising KeyError if there is none."""
+        pack = self._packs.get(name)
+        if pack is None:
+            if name not in self:
+                raise KeyError(name)
+            pack = self._packs[name] = WordPack.open(name, self._path(name))
+        return pack
+
+    def names(self) -> List[str]:
+        """Names of all available packs."""
+        names = set(self._packs)
+        if self.directory and os.path.isdir(self.directory):
+            for entry in os.listdir(self.directory):
+                name, ext = os.path.splitext(entry)
+                if ext == ".pack" and _PACK_NAME.fullmatch(name):
+                    names.add(name)
+        return sorted(names)
+
+
+word_packs = WordPacks(settings.word_pack_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a word pack from a text file with one word per line.")
+    parser.add_argument("source", help="text file; blank lines and lines starting with # are skipped")
+    parser.add_argument("output", help="pack file to write, named <pack name>.pack")
+    args = parser.parse_args()
+
+    words = {}
+    with open(args.source, encoding="utf-8") as f:
+        for line in f:
+            word = line.strip().upper()
+            if word and not word.startswith("#"):
+                words[word] = None
+    write_pack(args.output, words)
+    print(f"Wrote {len(words)} words to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,108 +1,621 @@
-from typing import Dict, Set
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Deque, Dict, List, Optional, Set
 from fastapi import WebSocket
-import json
+
+from .codecs import DEFAULT_CODEC, Codec, Frame
+from .config import settings
+from .heartbeat import heartbeat
+from .metrics import fanout_seconds, frame_bytes
+from .models import Role
+
+
+class Connection:
+    """A WebSocket with its own bounded outbound queue and writer task.
+
+    Broadcasts only enqueue frames; the writer task drains the queue, so a
+    slow client never delays the rest of its room.
+    """
+
+    def __init__(self, websocket: WebSocket, game_id: str, player_id: str, max_queue: int,
+                 codec: Codec = DEFAULT_CODEC):
+        self.websocket = websocket
+        self.game_id = game_id
+        self.player_id = player_id
+        self.max_queue = max_queue
+        self.codec = codec
+        # (frame, is_state) pairs waiting to be written
+        self.queue: Deque[tuple[Frame, bool]] = deque()
+        self.full_since: Optional[float] = None
+        self.evicted = False
+        # Liveness, kept by the heartbeat: when the client last sent a frame,
+        # when it was last pinged and whether a write to it has failed
+        self.last_seen = time.monotonic()
+        self.pinged_at: Optional[float] = None
+        self.failed = False
+        self.timed_out = False
+        # The handler task reading from the socket
+        self.task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the writer, from the task that reads the socket, and enrol it in the heartbeat."""
+        self.task = asyncio.current_task()
+        self._writer = asyncio.create_task(self._write_loop())
+        heartbeat.add(self)
+
+    def seen(self):
+        self.last_seen = time.monotonic()
+
+    def expire(self):
+        """End the handler of a connection the heartbeat found dead, as if the client had left."""
+        self.timed_out = True
+        self.stop()
+        if self.task is not None:
+            self.task.cancel()
+
+    def stop(self):
+        """Stop writing. The heartbeat keeps watching until the handler calls close()."""
+        if self._writer:
+            self._writer.cancel()
+            self._writer = None
+        self.queue.clear()
+
+    def close(self):
+        """Stop writing and leave the heartbeat, once the handler is done with the socket."""
+        self.stop()
+        heartbeat.remove(self)
+
+    def is_full(self) -> bool:
+        return len(self.queue) >= self.max_queue
+
+    def push(self, frame: Frame) -> bool:
+        """Enqueue a non-state frame. Returns False if it was dropped."""
+        if self.is_full():
+            return False
+        self.queue.append((frame, False))
+        self._ready.set()
+        return True
+
+    def push_state(self, frame: Frame, snapshot: bool) -> int:
+        """Enqueue a state frame, returning how many queued frames were discarded.
+
+        A snapshot supersedes every state frame still queued, so those are
+        coalesced away. A delta is refused (-1) when the queue is full; the
+        caller should send a snapshot instead.
+        """
+        discarded = 0
+        if snapshot:
+            kept = deque(item for item in self.queue if not item[1])
+            discarded = len(self.queue) - len(kept)
+            self.queue = kept
+        elif self.is_full():
+            return -1
+        self.queue.append((frame, True))
+        self._ready.set()
+        return discarded
+
+    async def _write_loop(self):
+        try:
+            while True:
+                while not self.queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                frame, _ = self.queue.popleft()
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+                if self.full_since is not None and not self.is_full():
+                    self.full_since = None
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The socket is gone. The reader side should see the disconnect,
+            # but a half-open socket may never report it, so check it now
+            self.queue.clear()
+            self.failed = True
+            heartbeat.check_soon(self)
+
+
+class RoomStats:
+    """Outbound queue counters for a game room."""
+
+    def __init__(self):
+        self.dropped = 0
+        self.coalesced = 0
+        self.evicted = 0
+
+
+class Spectators:
+    """Read-only viewers of one game room.
+
+    Spectators are kept apart from players, so player broadcasts never
+    iterate over them. They get full operative views, or spymaster views
+    after a delay, refreshed at a capped rate.
+    """
+
+    def __init__(self):
+        # Connections seeing the live operative view
+        self.live: Set[Connection] = set()
+        # Connections seeing the delayed spymaster view
+        self.delayed: Set[Connection] = set()
+        self.last_update = 0.0
+        self.scheduled = False
+
+    def __len__(self) -> int:
+        return len(self.live) + len(self.delayed)
+
+
+# Spectators updated before yielding to the event loop
+SPECTATOR_CHUNK = 256
 
 
 class ConnectionManager:
     """Manages WebSocket connections for game rooms."""
 
-    def __init__(self):
-        # game_id -> set of WebSocket connections
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-        # websocket -> (game_id, player_id)
-        self.connection_info: Dict[WebSocket, tuple[str, str]] = {}
+    def __init__(self, max_queue: int = 64, evict_after: float = 10.0, max_spectators: int = 10000,
+                 spectator_interval: float = 0.5, spectator_delay: float = 30.0):
+        # Frames a connection may have queued before its state frames are coalesced
+        self.max_queue = max_queue
+        # Seconds a connection's queue may stay full before it is disconnected
+        self.evict_after = evict_after
+        # Spectators this worker accepts across all rooms
+        self.max_spectators = max_spectators
+        # Minimum seconds between updates sent to a room's spectators
+        self.spectator_interval = spectator_interval
+        # Seconds spymaster-view spectators lag behind the game
+        self.spectator_delay = spectator_delay
+        # game_id -> set of connections
+        self.active_connections: Dict[str, Set[Connection]] = {}
+        # websocket -> connection
+        self.connection_info: Dict[WebSocket, Connection] = {}
+        self.room_stats: Dict[str, RoomStats] = {}
+        # game_id -> spectators, and websocket -> spectator connection
+        self.spectators: Dict[str, Spectators] = {}
+        self.spectator_info: Dict[WebSocket, Connection] = {}
+        # Relays broadcasts to other workers when running more than one
+        self.broker = None
+        self._game_service = None
+        # game_id -> broadcasts held back by an open outbox
+        self._outboxes: Dict[str, List[dict]] = {}
+        # game_id -> long polls waiting on this worker
+        self._pollers: Dict[str, int] = {}
+        # Non-game rooms -> handler(data) for their messages from other workers
+        self._remote_handlers: Dict[str, Callable[[dict], None]] = {}
+        # Background tasks started from sync code, kept until they finish
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def attach_broker(self, broker, game_service):
+        """Start relaying broadcasts through a pub/sub broker."""
+        self.broker = broker
+        self._game_service = game_service
+        await broker.start(self._handle_remote)
+        rooms = self.active_connections.keys() | self.spectators.keys() | self._pollers.keys()
+        for room in rooms | self._remote_handlers.keys():
+            broker.subscribe(room)
 
-    async def connect(self, websocket: WebSocket, game_id: str, player_id: str):
+    def on_remote(self, room: str, handler: Callable[[dict], None]):
+        """Pass messages other workers publish to a non-game room to handler(data)."""
+        self._remote_handlers[room] = handler
+        if self.broker is not None:
+            self.broker.subscribe(room)
+
+    async def _handle_remote(self, game_id: str, data: dict):
+        """Deliver a broadcast published by another worker to local sockets."""
+        handler = self._remote_handlers.get(game_id)
+        if handler is not None:
+            handler(data)
+            return
+        self._flush(game_id, data["items"], self._game_service)
+        if game_id in self._pollers:
+            self._game_service.notify(game_id)
+
+    async def _publish(self, game_id: str, data: dict):
+        if self.broker is not None:
+            await self.broker.publish(game_id, data)
+
+    async def connect(self, websocket: WebSocket, game_id: str, player_id: str,
+                      codec: Codec = DEFAULT_CODEC):
         """Accept and register a new WebSocket connection."""
-        await websocket.accept()
+        await websocket.accept(subprotocol=codec.subprotocol)
+        connection = Connection(websocket, game_id, player_id, self.max_queue, codec)
+        connection.start()
         if game_id not in self.active_connections:
+            self._watch(game_id)
             self.active_connections[game_id] = set()
-        self.active_connections[game_id].add(websocket)
-        self.connection_info[websocket] = (game_id, player_id)
+            self.room_stats[game_id] = RoomStats()
+        self.active_connections[game_id].add(connection)
+        self.connection_info[websocket] = connection
 
     def disconnect(self, websocket: WebSocket) -> tuple[str, str] | None:
         """Remove a WebSocket connection and return (game_id, player_id)."""
-        if websocket in self.connection_info:
-            game_id, player_id = self.connection_info[websocket]
-            if game_id in self.active_connections:
-                self.active_connections[game_id].discard(websocket)
-                if not self.active_connections[game_id]:
-                    del self.active_connections[game_id]
-            del self.connection_info[websocket]
-            return (game_id, player_id)
-        return None
+        connection = self.connection_info.pop(websocket, None)
+        if connection is None:
+            return None
+
+        connection.close()
+        game_id = connection.game_id
+        if game_id in self.active_connections:
+            self.active_connections[game_id].discard(connection)
+            if not self.active_connections[game_id]:
+                del self.active_connections[game_id]
+                del self.room_stats[game_id]
+                self._unwatch(game_id)
+        return (game_id, connection.player_id)
+
+    def _watched(self, game_id: str) -> bool:
+        return game_id in self.active_connections or game_id in self.spectators or game_id in self._pollers
+
+    def _watch(self, game_id: str):
+        """Subscribe to a room's broadcasts from other workers before its first local watcher."""
+        if self.broker is not None and not self._watched(game_id):
+            self.broker.subscribe(game_id)
+
+    def _unwatch(self, game_id: str):
+        if self.broker is not None and not self._watched(game_id):
+            self.broker.unsubscribe(game_id)
+
+    @asynccontextmanager
+    async def polling(self, game_id: str):
+        """Hear about a room's changes on other workers while a long poll waits on it."""
+        self._watch(game_id)
+        self._pollers[game_id] = self._pollers.get(game_id, 0) + 1
+        try:
+            yield
+        finally:
+            count = self._pollers.pop(game_id) - 1
+            if count:
+                self._pollers[game_id] = count
+            else:
+                self._unwatch(game_id)
+
+    async def connect_spectator(self, websocket: WebSocket, game_id: str, codec: Codec,
+                                delayed: bool, game_service) -> bool:
+        """Accept a read-only connection. Returns False if this worker is full."""
+        if len(self.spectator_info) >= self.max_spectators:
+            await websocket.close(code=1013, reason="Too many spectators")
+            return False
+
+        await websocket.accept(subprotocol=codec.subprotocol)
+        # Spectators only ever hold the latest state frame and a greeting
+        connection = Connection(websocket, game_id, "", 2, codec)
+        connection.start()
+        if game_id not in self.spectators:
+            self._watch(game_id)
+            self.spectators[game_id] = Spectators()
+        group = self.spectators[game_id]
+        (group.delayed if delayed else group.live).add(connection)
+        self.spectator_info[websocket] = connection
+
+        connection.push(codec.encode({
+            "type": "connected",
+            "payload": {"spectator": True, "delay": self.spectator_delay if delayed else 0},
+        }))
+        connection.push_state(game_service.get_state_frame(game_id, False, codec), True)
+        if delayed:
+            frame = game_service.get_state_frame(game_id, True, codec)
+            asyncio.get_running_loop().call_later(
+                self.spectator_delay, self._release_delayed, game_id, {codec.name: frame}, {connection}
+            )
+        return True
+
+    def disconnect_spectator(self, websocket: WebSocket):
+        connection = self.spectator_info.pop(websocket, None)
+        if connection is None:
+            return
+
+        connection.close()
+        game_id = connection.game_id
+        group = self.spectators.get(game_id)
+        if group is not None:
+            group.live.discard(connection)
+            group.delayed.discard(connection)
+            if not group:
+                del self.spectators[game_id]
+                self._unwatch(game_id)
+
+    def _spectators_changed(self, game_id: str, game_service):
+        """Schedule a spectator update, at most one per spectator_interval."""
+        group = self.spectators.get(game_id)
+        if group is None or group.scheduled:
+            return
+        group.scheduled = True
+        wait = max(0.0, group.last_update + self.spectator_interval - time.monotonic())
+        # Always deferred, so players' own frames are queued first
+        asyncio.get_running_loop().call_later(
+            wait, lambda: self._spawn(self._update_spectators(game_id, game_service))
+        )
+
+    async def _update_spectators(self, game_id: str, game_service):
+        group = self.spectators.get(game_id)
+        if group is None:
+            return
+        group.scheduled = False
+        group.last_update = time.monotonic()
+        if game_service.get_game(game_id) is None:
+            return
+
+        start = time.perf_counter()
+        if group.delayed:
+            # Capture the spymaster view now and release it after the delay
+            frames = {}
+            for connection in group.delayed:
+                codec = connection.codec
+                if codec.name not in frames:
+                    frames[codec.name] = game_service.get_state_frame(game_id, True, codec)
+            asyncio.get_running_loop().call_later(
+                self.spectator_delay, self._release_delayed, game_id, frames, None
+            )
+
+        for i, connection in enumerate(list(group.live)):
+            if i and i % SPECTATOR_CHUNK == 0:
+                await asyncio.sleep(0)
+            # Cached per version and codec, so every spectator shares a frame
+            connection.push_state(game_service.get_state_frame(game_id, False, connection.codec), True)
+        fanout_seconds.observe("spectators", time.perf_counter() - start)
+
+    def _release_delayed(self, game_id: str, frames: Dict[str, Frame], only: Optional[Set[Connection]]):
+        group = self.spectators.get(game_id)
+        if group is None:
+            return
+        for connection in only if only is not None else group.delayed:
+            frame = frames.get(connection.codec.name)
+            if frame is not None and connection in group.delayed:
+                connection.push_state(frame, True)
+
+    def _check_backlog(self, connection: Connection):
+        """Disconnect a connection whose queue has stayed full for too long."""
+        if not connection.is_full() or connection.evicted:
+            return
+
+        now = time.monotonic()
+        if connection.full_since is None:
+            connection.full_since = now
+        elif now - connection.full_since > self.evict_after:
+            connection.evicted = True
+            connection.stop()
+            self.room_stats[connection.game_id].evicted += 1
+            self._spawn(self._close(connection.websocket, 1008, "Client too slow"))
+
+    def _spawn(self, coro):
+        """Run a coroutine as a task, holding a reference until it is done."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def kick(self, websocket: WebSocket, code: int, reason: str):
+        """Stop writing to a connection and close it."""
+        connection = self.connection_info.get(websocket)
+        if connection is not None:
+            connection.stop()
+        await self._close(websocket, code, reason)
+
+    async def _close(self, websocket: WebSocket, code: int, reason: str):
+        try:
+            await websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    def _push(self, connection: Connection, frame: Frame):
+        if connection.evicted:
+            return
+        if not connection.push(frame):
+            self.room_stats[connection.game_id].dropped += 1
+        self._check_backlog(connection)
+
+    def _push_state(self, connection: Connection, frame: Frame, snapshot: bool, game_service=None):
+        if connection.evicted:
+            return
+        stats = self.room_stats[connection.game_id]
+        discarded = connection.push_state(frame, snapshot)
+        if discarded < 0:
+            # Queue is full: replace everything stale with the current snapshot
+            game = game_service.get_game(connection.game_id)
+            snapshot_frame = game_service.get_state_frame(
+                connection.game_id, self._is_spymaster(game, connection), connection.codec
+            )
+            discarded = connection.push_state(snapshot_frame, True)
+            stats.dropped += 1
+        stats.coalesced += discarded
+        self._check_backlog(connection)
 
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """Send a message to a specific WebSocket."""
-        await websocket.send_text(json.dumps(message))
+        connection = self.connection_info.get(websocket)
+        if connection:
+            self._push(connection, connection.codec.encode(message))
 
-    async def broadcast_to_game(self, game_id: str, message: dict, exclude: WebSocket = None):
-        """Broadcast a message to all connections in a game room."""
-        if game_id in self.active_connections:
-            for connection in self.active_connections[game_id]:
-                if connection != exclude:
-                    try:
-                        await connection.send_text(json.dumps(message))
-                    except Exception:
-                        pass
-
-    async def broadcast_game_state(self, game_id: str, game_state: dict, game_service):
-        """Broadcast game state to all players, with role-appropriate views."""
-        if game_id not in self.active_connections:
-            return
+    @asynccontextmanager
+    async def outbox(self, game_id: str, game_service):
+        """Hold a room's broadcasts while an action runs, then send them together.
 
-        game = game_service.games.get(game_id)
-        if not game:
+        Each connection gets everything the action produced, in order, as a
+        single frame: a batch envelope when there is more than one message.
+        """
+        self._outboxes[game_id] = []
+        try:
+            yield
+        finally:
+            items = self._outboxes.pop(game_id)
+            if items:
+                await self._send_items(game_id, items, game_service)
+
+    async def _broadcast(self, game_id: str, item: dict, game_service=None):
+        pending = self._outboxes.get(game_id)
+        if pending is not None:
+            pending.append(item)
+        else:
+            await self._send_items(game_id, [item], game_service)
+
+    async def _send_items(self, game_id: str, items: List[dict], game_service):
+        self._flush(game_id, items, game_service)
+        await self._publish(game_id, {
+            "kind": "batch",
+            "items": [{key: value for key, value in item.items() if key != "exclude"} for item in items],
+        })
+
+    def _flush(self, game_id: str, items: List[dict], game_service):
+        """Queue broadcast items for a room as one frame per connection.
+
+        Items are {"kind": "message" | "deltas", "message": ...} or
+        {"kind": "snapshot"} for role-appropriate full views. Connections are
+        grouped by view, codec and exclusions, so each distinct frame is
+        encoded once and shared by its group.
+        """
+        if game_id in self.spectators and any(item["kind"] != "message" for item in items):
+            self._spectators_changed(game_id, game_service)
+
+        connections = self.active_connections.get(game_id)
+        if not connections:
             return
 
-        # Create a list of connections to iterate over (avoid modification during iteration)
-        connections = list(self.active_connections[game_id])
+        start = time.perf_counter()
+        game = None
+        if any(item["kind"] == "snapshot" for item in items):
+            game = game_service.get_game(game_id)
+            if not game:
+                items = [item for item in items if item["kind"] != "snapshot"]
+        snapshot = game is not None
+        # A frame made only of state can be coalesced; anything else is queued as is
+        stateful = all(item["kind"] != "message" for item in items)
+        kind = items[0]["kind"] if len(items) == 1 else "batch"
 
+        encoded: Dict[tuple, Frame] = {}
+        frames: Dict[tuple, Optional[Frame]] = {}
         for connection in connections:
-            if connection not in self.connection_info:
+            codec = connection.codec
+            is_spymaster = snapshot and self._is_spymaster(game, connection)
+            excluded = tuple(i for i, item in enumerate(items) if item.get("exclude") is connection.websocket)
+            key = (is_spymaster, codec.name, excluded)
+            if key not in frames:
+                parts = []
+                for i, item in enumerate(items):
+                    if i in excluded:
+                        continue
+                    part_key = (i, codec.name, is_spymaster if item["kind"] == "snapshot" else False)
+                    if part_key not in encoded:
+                        if item["kind"] == "snapshot":
+                            encoded[part_key] = game_service.get_state_frame(game_id, is_spymaster, codec)
+                        else:
+                            encoded[part_key] = codec.encode(item["message"])
+                    parts.append(encoded[part_key])
+                frame = None
+                if parts:
+                    frame = parts[0] if len(parts) == 1 else codec.batch(parts)
+                    frame_bytes.observe(kind, len(frame))
+                frames[key] = frame
+
+            frame = frames[key]
+            if frame is None:
                 continue
+            if stateful:
+                self._push_state(connection, frame, snapshot, game_service)
+            else:
+                self._push(connection, frame)
+        fanout_seconds.observe(kind, time.perf_counter() - start)
 
-            _, player_id = self.connection_info[connection]
-            player = game.players.get(player_id)
+    async def broadcast_to_game(self, game_id: str, message: dict, exclude: WebSocket = None):
+        """Broadcast a message to all connections in a game room."""
+        await self._broadcast(game_id, {"kind": "message", "message": message, "exclude": exclude})
 
-            # Skip stale connections where player doesn't exist in game
-            # This prevents stale websockets from receiving wrong game state
-            if player is None:
-                continue
+    def _is_spymaster(self, game, connection: Connection) -> bool:
+        """Whether a connection should see the spymaster view of a game."""
+        player = game.players.get(connection.player_id)
+        # Connections that haven't joined yet see the operative view
+        return player is not None and player.role == Role.SPYMASTER
+
+    async def send_snapshot(self, websocket: WebSocket, game_id: str, game_service):
+        """Send the full role-appropriate game state to a single connection."""
+        game = game_service.get_game(game_id)
+        connection = self.connection_info.get(websocket)
+        if not game or connection is None:
+            return
+
+        frame = game_service.get_state_frame(
+            game_id, self._is_spymaster(game, connection), connection.codec
+        )
+        self._push_state(connection, frame, True)
 
-            # Check if player is a spymaster
-            is_spymaster = False
-            if player.role is not None:
-                role_value = player.role.value if hasattr(player.role, 'value') else str(player.role)
-                is_spymaster = role_value == "spymaster"
-
-            # Build fresh state dict for each player to avoid any shared references
-            player_state = {
-                "id": game_state["id"],
-                "state": game_state["state"],
-                "players": game_state["players"],
-                "currentTeam": game_state.get("currentTeam"),
-                "startingTeam": game_state.get("startingTeam"),
-                "currentClue": game_state.get("currentClue"),
-                "guessesRemaining": game_state.get("guessesRemaining", 0),
-                "winner": game_state.get("winner"),
-                "redRemaining": game_state.get("redRemaining", 0),
-                "blueRemaining": game_state.get("blueRemaining", 0),
-                "clueHistory": game_state.get("clueHistory", []),
-                "cards": game.get_cards_for_role(is_spymaster),
-            }
-
-            try:
-                await connection.send_text(json.dumps({
-                    "type": "game_state",
-                    "payload": player_state
-                }))
-            except Exception:
-                pass
+    async def broadcast_game_state(self, game_id: str, game_service):
+        """Broadcast game state to all connections, with role-appropriate views."""
+        await self._broadcast(game_id, {"kind": "snapshot"}, game_service)
+
+    async def broadcast_deltas(self, game_id: str, game_service):
+        """Broadcast the deltas produced by the last command to a game room.
+
+        Deltas are identical for every role, so a single state_delta frame is
+        shared by all connections. If any delta replaced the board, full views
+        are sent instead.
+        """
+        deltas = game_service.drain_deltas(game_id)
+        if not deltas:
+            return
+
+        if any(delta["op"] == "snapshot" for delta in deltas):
+            await self.broadcast_game_state(game_id, game_service)
+            return
+
+        await self._broadcast(game_id, {
+            "kind": "deltas",
+            "message": {"type": "state_delta", "payload": {"deltas": deltas}},
+        }, game_service)
+
+    async def close_room(self, game_id: str, code: int, reason: str):
+        """Close every connection in a game room, spectators included."""
+        for connection in list(self.active_connections.get(game_id, ())):
+            await self._close(connection.websocket, code, reason)
+        group = self.spectators.get(game_id)
+        if group is not None:
+            for connection in list(group.live | group.delayed):
+                await self._close(connection.websocket, code, reason)
+
+    def get_player_connections(self, game_id: str, player_id: str) -> List[Connection]:
+        """Connections in a game room belonging to a player."""
+        return [c for c in self.active_connections.get(game_id, ()) if c.player_id == player_id]
 
     def get_connection_count(self, game_id: str) -> int:
         """Get the number of connections in a game room."""
         return len(self.active_connections.get(game_id, set()))
 
+    def get_room_stats(self, game_id: str) -> Optional[dict]:
+        """Get outbound queue depth and drop counters for a game room."""
+        connections = self.active_connections.get(game_id)
+        if not connections:
+            return None
+
+        stats = self.room_stats[game_id]
+        depths = [len(connection.queue) for connection in connections]
+        return {
+            "connections": len(connections),
+            "queued": sum(depths),
+            "maxQueueDepth": max(depths),
+            "dropped": stats.dropped,
+            "coalesced": stats.coalesced,
+            "evicted": stats.evicted,
+        }
+
+    def get_room_buffers(self, game_id: str) -> dict:
+        """Connections in a room and the frames buffered for them, for memory accounting."""
+        connections = list(self.active_connections.get(game_id, ()))
+        spectators = self.spectators.get(game_id)
+        if spectators is not None:
+            connections += spectators.live | spectators.delayed
+        queued = [frame for connection in connections for frame, _ in connection.queue]
+        return {
+            "connections": len(self.active_connections.get(game_id, ())),
+            "spectators": len(spectators) if spectators is not None else 0,
+            "queuedFrames": len(queued),
+            "queuedBytes": sum(len(frame) for frame in queued),
+            "outboxItems": len(self._outboxes.get(game_id, ())),
+        }
+
 
-manager = ConnectionManager()
+manager = ConnectionManager(
+    max_spectators=settings.max_spectators,
+    spectator_interval=1 / settings.spectator_max_fps,
+    spectator_delay=settings.spectator_delay,
+)
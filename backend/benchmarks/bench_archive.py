@@ -0,0 +1,101 @@
+"""Benchmark of the finished-game archive.
+
+Times buffering a finished game from the event loop, the background
+writer's batched inserts against committing each game on its own, and
+the stats query served from the running totals against the same figures
+computed by scanning the games table.
+
+Usage (from backend/):
+    python -m benchmarks.bench_archive --games 100000 --batch 200
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from app.services.archive import GameArchive
+
+PACKS = ["standard", "animals", "movies", "science"]
+TEAMS = ["red", "blue"]
+
+SCAN = (
+    "SELECT starting_team, COUNT(*), SUM(winner = starting_team), SUM(reason = 'assassin'),"
+    " SUM(json_array_length(data, '$.clues')) FROM games GROUP BY starting_team"
+)
+
+
+def random_record(rng: random.Random, i: int) -> dict:
+    clues = [{"word": "CLUE", "number": rng.randint(1, 4), "team": rng.choice(TEAMS)} for _ in range(rng.randint(4, 14))]
+    return {
+        "gameId": f"G{i % 50000:05d}",
+        "finishedAt": time.time(),
+        "wordPack": rng.choice(PACKS),
+        "startingTeam": rng.choice(TEAMS),
+        "winner": rng.choice(TEAMS),
+        "reason": rng.choices(["assassin", "all_cards_revealed"], weights=[1, 4])[0],
+        "cards": [{"word": f"WORD{p}", "type": "neutral", "revealed": True, "position": p} for p in range(25)],
+        "reveals": rng.sample(range(25), rng.randint(8, 20)),
+        "clues": clues,
+        "players": [{"name": f"p{n}", "team": TEAMS[n % 2], "role": "operative", "isBot": False} for n in range(4)],
+    }
+
+
+def median_time(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=200, help="games buffered per writer flush")
+    parser.add_argument("--unbatched", type=int, default=500, help="games committed one by one for comparison")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    records = [random_record(rng, i) for i in range(args.games)]
+    with tempfile.TemporaryDirectory() as directory:
+        archive = GameArchive(os.path.join(directory, "archive.db"))
+
+        start = time.perf_counter()
+        for i, record in enumerate(records, 1):
+            archive.append(record)
+            if i % args.batch == 0:
+                archive.flush()
+        archive.flush()
+        batched = (time.perf_counter() - start) / args.games
+
+        start = time.perf_counter()
+        for record in records[:args.unbatched]:
+            archive.append(record)
+            archive.flush()
+        unbatched = (time.perf_counter() - start) / args.unbatched
+        total = args.games + args.unbatched
+
+        start = time.perf_counter()
+        for record in records[:10000]:
+            archive.append(record)
+        appended = (time.perf_counter() - start) / 10000
+        archive._buffer.clear()
+
+        from_totals = median_time(archive.stats, 50)
+        scanned = median_time(lambda: archive._reader.execute(SCAN).fetchall(), 3)
+        archive.close()
+        size = os.path.getsize(os.path.join(directory, "archive.db"))
+
+    print(f"{total:,} archived games, {size / total:.0f} bytes each on disk")
+    print(f"append from the event loop {appended * 1e6:>10.2f} us")
+    print(f"write, {args.batch} per transaction {batched * 1e6:>8.1f} us per game")
+    print(f"write, one per transaction {unbatched * 1e6:>9.1f} us per game")
+    print(f"stats from running totals  {from_totals * 1e3:>10.3f} ms")
+    print(f"stats by scanning games    {scanned * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Microbenchmark for WebSocket frame encoding and decoding.
+
+Encodes and decodes the messages a room actually sends - a full mid-game
+game_state for each role and a typical state_delta - with every available
+codec, and reports time per operation and frame size. The stdlib json
+codec is the baseline the orjson and msgpack paths are compared against.
+
+Usage (from backend/):
+    python -m benchmarks.bench_codecs --iterations 20000
+"""
+import argparse
+import time
+
+from app.codecs import CODECS, JsonCodec
+from app.models import Role, Team
+from app.services.game_service import GameService
+
+
+def mid_game_messages() -> dict:
+    service = GameService()
+    game = service.create_game()
+    for i, (team, role) in enumerate([
+        (Team.RED, Role.SPYMASTER), (Team.RED, Role.OPERATIVE),
+        (Team.BLUE, Role.SPYMASTER), (Team.BLUE, Role.OPERATIVE),
+    ]):
+        service.add_player(game.id, f"player-{i}", f"Player {i}")
+        service.assign_role(game.id, f"player-{i}", team, role)
+    service.start_game(game.id)
+
+    # Play a few turns so the board has revealed cards and a clue history
+    for _ in range(3):
+        game = service.get_game(game.id)
+        team = game.current_team
+        spymaster, operative = ("player-0", "player-1") if team == Team.RED else ("player-2", "player-3")
+        service.give_clue(game.id, spymaster, "clue", 2)
+        for card in game.cards:
+            if not card.revealed and card.type.value == team.value:
+                service.reveal_card(game.id, operative, card.position)
+                break
+        if game.current_team == team:
+            service.end_turn(game.id, operative)
+    service.drain_deltas(game.id)
+
+    spymaster = "player-0" if game.current_team == Team.RED else "player-2"
+    service.give_clue(game.id, spymaster, "final", 1)
+    deltas = service.drain_deltas(game.id)
+    return {
+        "game_state (spymaster)": {"type": "game_state", "payload": service._build_view(game, True)},
+        "game_state (operative)": {"type": "game_state", "payload": service._build_view(game, False)},
+        "state_delta": {"type": "state_delta", "payload": {"deltas": deltas}},
+    }
+
+
+def measure(codec, message: dict, iterations: int) -> dict:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        frame = codec.encode(message)
+    encode = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        codec.decode(frame)
+    decode = time.perf_counter() - start
+
+    return {
+        "encode_us": encode / iterations * 1e6,
+        "decode_us": decode / iterations * 1e6,
+        "bytes": len(frame),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    codecs = {"stdlib json": JsonCodec("json", None, binary=False, fast=False)}
+    codecs.update({codec.subprotocol: codec for codec in CODECS.values()})
+
+    for name, message in mid_game_messages().items():
+        print(name)
+        print(f"  {'codec':<24} {'encode us':>10} {'decode us':>10} {'bytes':>8}")
+        for codec_name, codec in codecs.items():
+            result = measure(codec, message, args.iterations)
+            print(f"  {codec_name:<24} {result['encode_us']:>10.2f} "
+                  f"{result['decode_us']:>10.2f} {result['bytes']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Microbenchmark of WebSocket message parse-and-dispatch cost.
+
+Compares the old loop body - json.loads, then an if/elif chain over the
+message type with payload.get() parsing - against the handler table:
+one pydantic validate_json pass into a typed message, then a dict lookup.
+Handlers are no-ops, so only parsing, validation and dispatch are timed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_dispatch --iterations 200000
+"""
+import argparse
+import json
+import time
+
+from app.models import Role, Team, client_message
+from app.routers.websocket import HANDLERS
+
+FRAMES = [
+    '{"type":"join_game","payload":{"player_name":"Alice"}}',
+    '{"type":"assign_role","payload":{"team":"red","role":"operative"}}',
+    '{"type":"give_clue","payload":{"word":"ocean","number":2}}',
+    '{"type":"reveal_card","payload":{"position":17}}',
+    '{"type":"reveal_card","payload":{"position":3}}',
+    '{"type":"end_turn","payload":{}}',
+    '{"type":"resync"}',
+]
+
+
+def legacy_dispatch(data: str):
+    """The if/elif loop body as it was, with handler calls removed."""
+    message = json.loads(data)
+    msg_type = message.get("type")
+    payload = message.get("payload", {})
+    if msg_type == "join_game":
+        return payload.get("player_name", "Anonymous")
+    elif msg_type == "assign_role":
+        return Team(payload.get("team")), Role(payload.get("role"))
+    elif msg_type == "start_game":
+        return None
+    elif msg_type == "give_clue":
+        word = payload.get("word", "").strip()
+        number = int(payload.get("number", 0))
+        if not word or number < 0:
+            return None
+        return word, number
+    elif msg_type == "reveal_card":
+        return int(payload.get("position", -1))
+    elif msg_type == "end_turn":
+        return None
+    elif msg_type == "reset_game":
+        return None
+    elif msg_type == "resync":
+        return None
+
+
+def table_dispatch(data: str):
+    message = client_message.validate_json(data)
+    return HANDLERS[message.type], message
+
+
+def measure(dispatch, iterations: int, repeat: int) -> float:
+    """Best time per message over `repeat` runs, in microseconds."""
+    frames = FRAMES * (iterations // len(FRAMES))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            dispatch(frame)
+        best = min(best, time.perf_counter() - start)
+    return best / len(frames) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per dispatcher; the best is reported")
+    args = parser.parse_args()
+
+    print(f"{'dispatcher':<28} {'us/message':>10}")
+    for name, dispatch in [("json.loads + if/elif", legacy_dispatch), ("validate_json + table", table_dispatch)]:
+        print(f"{name:<28} {measure(dispatch, args.iterations, args.repeat):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
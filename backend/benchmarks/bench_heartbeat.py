@@ -0,0 +1,77 @@
+"""Benchmark of the heartbeat's cost for many idle connections.
+
+Enrols simulated clients that send nothing but answer every ping at
+once, spread over the wheel as if they had connected at different times,
+then runs the ticks of a few intervals back to back on a simulated
+clock. Reports the time a tick takes and the share of one core the
+heartbeat would use at one tick per second.
+
+Usage (from backend/):
+    python -m benchmarks.bench_heartbeat --connections 100000 --interval 30
+"""
+import argparse
+import statistics
+import time
+
+from app.codecs import DEFAULT_CODEC
+from app.heartbeat import Heartbeat
+
+
+# Simulated monotonic clock, one tick per second
+clock = 0.0
+
+
+class Client:
+    __slots__ = ("last_seen", "pinged_at", "failed", "timed_out", "codec", "pings")
+
+    def __init__(self, last_seen: float):
+        self.last_seen = last_seen
+        self.pinged_at = None
+        self.failed = False
+        self.timed_out = False
+        self.codec = DEFAULT_CODEC
+        self.pings = 0
+
+    def push(self, frame):
+        # Answers straight away
+        self.pings += 1
+        self.last_seen = clock
+
+    def expire(self):
+        self.timed_out = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=100000)
+    parser.add_argument("--interval", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--intervals", type=int, default=3, help="intervals of ticks to run")
+    args = parser.parse_args()
+
+    global clock
+    heartbeat = Heartbeat(args.interval, args.timeout)
+    clients = []
+    for i in range(args.connections):
+        # Idle for a whole interval by the time their slot comes up
+        client = Client(-args.interval)
+        heartbeat.wheel.schedule(client, (i % int(args.interval)) + 1)
+        clients.append(client)
+
+    ticks = []
+    for _ in range(int(args.intervals * args.interval)):
+        clock += heartbeat.wheel.tick
+        start = time.perf_counter()
+        heartbeat.tick(clock)
+        ticks.append(time.perf_counter() - start)
+
+    pings = sum(client.pings for client in clients)
+    expired = sum(client.timed_out for client in clients)
+    print(f"{args.connections:,} idle connections, ping every {args.interval:g}s")
+    print(f"pings sent {pings:,}, wrongly expired {expired}")
+    print(f"tick p50 {statistics.median(ticks) * 1e3:.2f} ms, max {max(ticks) * 1e3:.2f} ms")
+    print(f"CPU at one tick per second: {sum(ticks) / len(ticks) * 100:.2f}% of a core")
+
+
+if __name__ == "__main__":
+    main()
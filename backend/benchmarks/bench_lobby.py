@@ -0,0 +1,92 @@
+"""Benchmark of lobby listings against a full scan of the rooms.
+
+Fills a lobby index with public rooms spread over states, player counts
+and word packs, then times pages for a few filters, deep pages reached by
+cursor, and re-indexing a room after it changes. The scan baseline checks
+every room against the filter, as a listing without the index would.
+
+Usage (from backend/):
+    python -m benchmarks.bench_lobby --rooms 100000 --limit 20
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.models import GameState
+from app.services.lobby import LobbyEntry, LobbyFilter, LobbyIndex
+
+PACKS = ["standard", "animals", "movies", "science"]
+CAPACITY = 12
+
+FILTERS = {
+    "all": LobbyFilter(),
+    "lobby, open seats": LobbyFilter(GameState.LOBBY, True),
+    "needs a spymaster": LobbyFilter(GameState.LOBBY, True, True),
+    "pack + state": LobbyFilter(GameState.IN_PROGRESS, word_pack="science"),
+}
+
+
+def random_entry(rng: random.Random, game_id: str) -> LobbyEntry:
+    state = rng.choices(list(GameState), weights=[2, 6, 2])[0]
+    return LobbyEntry(
+        game_id, state.value, rng.randint(0, CAPACITY), CAPACITY, rng.random() < 0.3, rng.choice(PACKS),
+    )
+
+
+def timed(fn, repeat: int) -> list:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def scan(index: LobbyIndex, where: LobbyFilter, limit: int):
+    matching = [entry for entry in index._entries.values() if where.matches(entry)]
+    matching.sort(key=lambda entry: entry.seq, reverse=True)
+    return matching[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    index = LobbyIndex(CAPACITY)
+    ids = [f"{i:06d}" for i in range(args.rooms)]
+    start = time.perf_counter()
+    for game_id in ids:
+        index.put(random_entry(rng, game_id))
+    fill = time.perf_counter() - start
+    index.drain_changes()
+
+    print(f"{args.rooms:,} rooms, {args.limit} per page; filled in {fill:.2f}s")
+    print(f"{'':<30} {'p50 us':>10} {'max us':>10}")
+    rows = []
+    for name, where in FILTERS.items():
+        rows.append((f"page: {name}", timed(lambda: index.query(where, args.limit), args.repeat)))
+
+    def deep_page():
+        # Ten pages in, following cursors from the first
+        cursor = None
+        for _ in range(10):
+            _, cursor = index.query(FILTERS["lobby, open seats"], args.limit, cursor)
+    rows.append(("10th page by cursor", [t / 10 for t in timed(deep_page, args.repeat // 10 or 1)]))
+
+    def change():
+        index.put(random_entry(rng, rng.choice(ids)))
+    rows.append(("re-index a changed room", timed(change, args.repeat * 10)))
+    rows.append(("full scan: lobby, open seats",
+                 timed(lambda: scan(index, FILTERS["lobby, open seats"], args.limit), max(args.repeat // 20, 3))))
+
+    for name, times in rows:
+        print(f"{name:<30} {statistics.median(times) * 1e6:>10.1f} {max(times) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
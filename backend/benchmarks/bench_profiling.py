@@ -0,0 +1,94 @@
+"""Benchmark of the admin diagnostics' overhead.
+
+Runs a CPU-bound stand-in for message handling on the event loop with
+and without the SIGPROF stack sampler attached, and times taking one
+sample at the depth of a running handler, which with the sampling
+interval gives the profiler's share of the loop. Then sizes many
+in-progress games as the per-room memory report does.
+
+Usage (from backend/):
+    python -m benchmarks.bench_profiling --seconds 3 --rooms 10000
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from app.models import Role, Team
+from app.profiling import StackSampler, deep_sizeof
+from app.services.game_service import GameService
+
+
+def handle(service: GameService, game_id: str):
+    # A mutation and the views it invalidates, as a handler would
+    game = service.get_game(game_id)
+    service.get_state_frame(game_id, False)
+    game.version += 1
+    service.get_state_frame(game_id, True)
+
+
+def playing_game(service: GameService) -> str:
+    game = service.create_game()
+    for i, (team, role) in enumerate([(Team.RED, Role.SPYMASTER), (Team.RED, Role.OPERATIVE),
+                                      (Team.BLUE, Role.SPYMASTER), (Team.BLUE, Role.OPERATIVE)]):
+        player = service.add_player(game.id, f"p{i}", f"Player {i}")
+        service.assign_role(game.id, player.id, team, role)
+    service.start_game(game.id)
+    return game.id
+
+
+async def throughput(seconds: float, sampler: StackSampler = None) -> float:
+    service = GameService()
+    game_id = playing_game(service)
+    profiling = asyncio.ensure_future(sampler.run(seconds)) if sampler else None
+    handled = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            handle(service, game_id)
+        handled += 100
+        await asyncio.sleep(0)
+    if profiling:
+        await profiling
+    return handled / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--interval-ms", type=float, default=5)
+    parser.add_argument("--rooms", type=int, default=10000)
+    args = parser.parse_args()
+
+    off = asyncio.run(throughput(args.seconds))
+    sampler = StackSampler(args.interval_ms / 1e3, {handle.__code__: "handle"})
+    on = asyncio.run(throughput(args.seconds, sampler))
+    print(f"handled/s, profiler off      {off:>10,.0f}")
+    print(f"handled/s, sampling every {args.interval_ms:g} ms {on:>7,.0f}  ({(off - on) / off * 100:+.1f}% slower, "
+          f"{sampler.samples} samples, {sampler.handlers['handle'] / max(sampler.samples, 1) * 100:.0f}% in handle)")
+
+    def nested(depth: int):
+        # As deep as a handler running under uvicorn and the loop
+        if depth:
+            return nested(depth - 1)
+        frame = sys._getframe()
+        start = time.perf_counter()
+        for _ in range(10000):
+            sampler.record(frame)
+        return (time.perf_counter() - start) / 10000
+    per_sample = nested(25)
+    print(f"one sample                   {per_sample * 1e6:>10.1f} us  "
+          f"({per_sample / (args.interval_ms / 1e3) * 100:.2f}% of the loop at one per {args.interval_ms:g} ms)")
+
+    service = GameService()
+    ids = [playing_game(service) for _ in range(args.rooms)]
+    games = [service.get_game(game_id) for game_id in ids]
+    start = time.perf_counter()
+    total = sum(deep_sizeof(game) for game in games)
+    elapsed = time.perf_counter() - start
+    print(f"{args.rooms:,} in-progress rooms: about {total / args.rooms:,.0f} bytes each, "
+          f"sized in {elapsed * 1e3:.0f} ms ({elapsed / args.rooms * 1e6:.0f} us per room)")
+
+
+if __name__ == "__main__":
+    main()
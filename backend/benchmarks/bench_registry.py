@@ -0,0 +1,116 @@
+"""Microbenchmark for game registry create, lookup and delete throughput.
+
+Compares GameRegistry (one dict) with RoomCodeAllocator against the old
+plain dict with retry-on-collision code generation, and against the same
+allocator over 64 dict shards, at increasing numbers of live rooms. Rooms
+hold a placeholder object so the numbers reflect the registry rather than
+Game construction. Also reports the longest single insert while filling
+up, which is when a dict resize stalls the loop.
+
+Usage (from backend/):
+    python -m benchmarks.bench_registry --sizes 100000 1000000
+"""
+import argparse
+import random
+import string
+import time
+
+from app.services.game_registry import GameRegistry, RoomCodeAllocator
+
+
+class DictRegistry:
+    """The previous registry: one dict, random codes retried until unused."""
+
+    def __init__(self):
+        self.games = {}
+
+    def allocate(self) -> str:
+        while True:
+            game_id = ''.join(random.choices(string.ascii_uppercase, k=6))
+            if game_id not in self.games:
+                return game_id
+
+
+class AllocatorRegistry:
+    def __init__(self):
+        self.games = GameRegistry()
+        self.codes = RoomCodeAllocator()
+
+    def allocate(self) -> str:
+        return self.codes.allocate()
+
+
+class ShardedDict:
+    """Games spread over dict shards by hash, so each shard resizes on its own."""
+
+    def __init__(self, shard_count: int = 64):
+        self._mask = shard_count - 1
+        self._shards = [{} for _ in range(shard_count)]
+
+    def __setitem__(self, game_id, game):
+        self._shards[hash(game_id) & self._mask][game_id] = game
+
+    def get(self, game_id, default=None):
+        return self._shards[hash(game_id) & self._mask].get(game_id, default)
+
+    def __delitem__(self, game_id):
+        del self._shards[hash(game_id) & self._mask][game_id]
+
+
+class ShardedRegistry(AllocatorRegistry):
+    def __init__(self):
+        super().__init__()
+        self.games = ShardedDict()
+
+
+def run(registry, live: int, ops: int) -> dict:
+    games = registry.games
+    room = object()
+
+    # Fill to the target occupancy first
+    ids = []
+    worst = 0.0
+    for _ in range(live):
+        game_id = registry.allocate()
+        start = time.perf_counter()
+        games[game_id] = room
+        worst = max(worst, time.perf_counter() - start)
+        ids.append(game_id)
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        game_id = registry.allocate()
+        games[game_id] = room
+        ids.append(game_id)
+    create = ops / (time.perf_counter() - start)
+
+    sample = random.sample(ids, ops)
+    start = time.perf_counter()
+    for game_id in sample:
+        games.get(game_id)
+    lookup = ops / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for game_id in sample:
+        del games[game_id]
+    delete = ops / (time.perf_counter() - start)
+
+    return {"create": create, "lookup": lookup, "delete": delete, "worst_insert": worst}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'registry':<10} {'live rooms':>12} {'create/s':>12} {'lookup/s':>12} {'delete/s':>12} {'worst insert ms':>16}")
+    for live in args.sizes:
+        for name, factory in (("retry", DictRegistry), ("registry", AllocatorRegistry), ("sharded", ShardedRegistry)):
+            result = run(factory(), live, args.ops)
+            print(f"{name:<10} {live:>12,} {result['create']:>12,.0f} "
+                  f"{result['lookup']:>12,.0f} {result['delete']:>12,.0f} {result['worst_insert'] * 1e3:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark of bot spymaster clue generation.
+
+Builds random unit vectors for a synthetic vocabulary (the standard words
+plus filler) in a temporary directory, then times clues for random boards:
+
+- first clue on a new board, which computes the vocabulary's similarities
+  to the board and caches them for later turns
+- later turns on the same board, with a few more cards revealed each time
+
+Indexing the vocabulary, which the server does at startup, is timed
+separately.
+
+Usage (from backend/):
+    python -m benchmarks.bench_spymaster --vocab 50000 --dims 300 --boards 20
+"""
+import argparse
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+
+import numpy as np
+
+from app.models.board import BOARD_SIZE
+from app.services.spymaster_ai import ClueEngine, Embeddings
+from app.utils.word_lists import WORDS
+from app.utils.word_packs import write_pack
+
+
+def build(prefix: str, vocab: int, dims: int):
+    rng = random.Random(1)
+    words = dict.fromkeys(WORDS)
+    while len(words) < vocab:
+        words["".join(rng.choices(string.ascii_uppercase, k=rng.randint(4, 10)))] = None
+    vectors = np.random.default_rng(1).standard_normal((len(words), dims), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.save(prefix + ".npy", vectors)
+    write_pack(prefix + ".pack", words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--dims", type=int, default=300)
+    parser.add_argument("--boards", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=6, help="clues per board after the first")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        prefix = os.path.join(directory, "vectors")
+        build(prefix, args.vocab, args.dims)
+        embeddings = Embeddings.open(prefix)
+        start = time.perf_counter()
+        embeddings.row("")
+        index = time.perf_counter() - start
+        engine = ClueEngine(embeddings, cache_boards=args.boards)
+
+        first, later = [], []
+        for _ in range(args.boards):
+            words = tuple(random.sample(WORDS, BOARD_SIZE))
+            types = bytes(random.sample([0] * 9 + [1] * 8 + [2] * 7 + [3], BOARD_SIZE))
+            revealed = 0
+            start = time.perf_counter()
+            engine.suggest(words, types, revealed, 0)
+            first.append(time.perf_counter() - start)
+            for _ in range(args.turns):
+                revealed |= 1 << random.randrange(BOARD_SIZE)
+                start = time.perf_counter()
+                engine.suggest(words, types, revealed, random.randrange(2))
+                later.append(time.perf_counter() - start)
+
+    print(f"vocabulary {args.vocab:,} x {args.dims} dims")
+    print(f"{'':<22} {'p50 ms':>8} {'max ms':>8}")
+    print(f"{'vocabulary index':<22} {index * 1e3:>8.1f}")
+    for name, times in [("first clue per board", first), ("later turns", later)]:
+        print(f"{name:<22} {statistics.median(times) * 1e3:>8.1f} {max(times) * 1e3:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark of turn timers for many rooms.
+
+Gives every room a deadline, then times moving deadlines (a clue given,
+a turn ended) and cancelling them (a reset or deleted room). Then runs
+the event loop while a share of the rooms come due over a few seconds,
+and reports how late each expiry callback ran.
+
+Usage (from backend/):
+    python -m benchmarks.bench_turn_timers --rooms 100000 --due 5000 --window 3
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.services.turn_timers import TurnTimers
+
+
+def timed(fn, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+async def run(args):
+    rng = random.Random(1)
+    timers = TurnTimers()
+    ids = [f"{i:06d}" for i in range(args.rooms)]
+    now = time.time()
+    # Far enough out that none fire during the timing below
+    far = now + 3600
+
+    tracemalloc.start()
+    per_schedule = timed(lambda game_id: timers.schedule(game_id, far + rng.random() * 600), ids)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    per_move = timed(lambda game_id: timers.schedule(game_id, far + rng.random() * 600), ids)
+    sample = rng.sample(ids, len(ids) // 10)
+    per_cancel = timed(timers.cancel, sample)
+    for game_id in sample:
+        timers.schedule(game_id, far + rng.random() * 600)
+
+    lags = []
+
+    def on_expire(game_id: str, deadline: float):
+        lags.append(time.time() - deadline)
+
+    timers.start(on_expire)
+    start = time.time()
+    for game_id in rng.sample(ids, args.due):
+        timers.schedule(game_id, start + 0.1 + rng.random() * args.window)
+    while len(lags) < args.due:
+        await asyncio.sleep(0.05)
+    timers.stop()
+
+    lags.sort()
+    print(f"{args.rooms:,} timed rooms, {len(timers):,} still pending")
+    print(f"memory per room            {memory / args.rooms:>8.0f} bytes")
+    print(f"schedule                   {per_schedule * 1e6:>8.2f} us")
+    print(f"move a deadline            {per_move * 1e6:>8.2f} us")
+    print(f"cancel                     {per_cancel * 1e6:>8.2f} us")
+    print(f"{args.due:,} expiries over {args.window:g}s: lag p50 {statistics.median(lags) * 1e3:.2f} ms, "
+          f"p99 {lags[int(len(lags) * 0.99)] * 1e3:.2f} ms, max {lags[-1] * 1e3:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--due", type=int, default=5000, help="rooms to let expire")
+    parser.add_argument("--window", type=float, default=3, help="seconds the expiries are spread over")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""End-to-end load test: many rooms of scripted WebSocket players.
+
+Each room is driven by bots that join, pick roles, start the game and play
+it out with give_clue / reveal_card / end_turn over real WebSockets. After
+every action the room waits until all of its players have seen the new
+state version; the time from sending the action to each player receiving
+it is one action-to-broadcast latency sample.
+
+The server is a local uvicorn started for each scale point (so peak RSS
+is per point), an existing server given with --url, or uvicorn running
+inside this process with --in-process (peak RSS then includes the bots).
+
+Results can be saved as a baseline and later runs compared against it;
+a p95/p99 latency, throughput or memory regression beyond --tolerance
+exits non-zero.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --rooms 10 100 1000 --players 4 8
+    python -m benchmarks.loadtest --rooms 100 --save baseline.json
+    python -m benchmarks.loadtest --rooms 100 --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+import websockets
+
+SEATS = [("red", "spymaster"), ("blue", "spymaster"), ("red", "operative"), ("blue", "operative")]
+
+# Metric -> whether a higher value is worse, for baseline comparison
+COMPARED = {"p95_ms": True, "p99_ms": True, "msgs_per_s": False, "peak_rss_mb": True}
+
+
+class Bot:
+    """One player: a socket plus the state version it has seen so far."""
+
+    def __init__(self, room: "Room", ws, team: str, role: str):
+        self.room = room
+        self.ws = ws
+        self.team = team
+        self.role = role
+        self.version = 0
+        self.state: Optional[dict] = None
+
+    async def send(self, msg_type: str, **payload):
+        await self.ws.send(json.dumps({"type": msg_type, "payload": payload}))
+
+    async def read(self):
+        stats = self.room.stats
+        async for raw in self.ws:
+            now = time.perf_counter()
+            stats.frames += 1
+            stats.bytes += len(raw)
+            message = json.loads(raw)
+            if message["type"] == "batch":
+                for item in message["payload"]["messages"]:
+                    self.handle(item, now)
+            else:
+                self.handle(message, now)
+
+    def handle(self, message: dict, now: float):
+        msg_type = message["type"]
+        if msg_type == "game_state":
+            self.state = message["payload"]
+            self.seen(self.state["version"], now)
+        elif msg_type == "state_delta":
+            deltas = message["payload"]["deltas"]
+            if self.state is not None:
+                self.apply(deltas)
+            self.seen(deltas[-1]["seq"], now)
+        elif msg_type == "ping":
+            asyncio.ensure_future(self.send("pong"))
+        elif msg_type == "error":
+            self.room.stats.errors += 1
+
+    def apply(self, deltas: List[dict]):
+        """Track just enough state for the room script to pick its next move."""
+        state = self.state
+        for delta in deltas:
+            op = delta["op"]
+            if op == "card_revealed":
+                card = state["cards"][delta["position"]]
+                card["revealed"] = True
+                card["type"] = delta["type"]
+            elif op == "turn_ended":
+                state["currentTeam"] = delta["currentTeam"]
+            elif op == "game_over":
+                state["state"] = "finished"
+
+    def seen(self, version: int, now: float):
+        if version > self.version:
+            self.version = version
+            self.room.observe(self, now)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.frames = 0
+        self.bytes = 0
+        self.actions = 0
+        self.errors = 0
+        self.timeouts = 0
+
+
+class Room:
+    """Scripted game in one room."""
+
+    def __init__(self, game_id: str, stats: Stats, think: float, accuracy: float):
+        self.game_id = game_id
+        self.stats = stats
+        self.think = think
+        self.accuracy = accuracy
+        self.bots: List[Bot] = []
+        self._target = 0
+        self._sent_at = 0.0
+        self._waiting: set = set()
+        self._done = asyncio.Event()
+
+    def observe(self, bot: Bot, now: float):
+        if bot in self._waiting and bot.version >= self._target:
+            self._waiting.discard(bot)
+            self.stats.latencies.append(now - self._sent_at)
+            if not self._waiting:
+                self._done.set()
+
+    async def act(self, bot: Bot, msg_type: str, **payload):
+        """Send an action and wait until every player has seen its result."""
+        if self.think:
+            await asyncio.sleep(random.uniform(0, 2 * self.think))
+        self._target = max(b.version for b in self.bots) + 1
+        self._waiting = set(self.bots)
+        self._done.clear()
+        self._sent_at = time.perf_counter()
+        await bot.send(msg_type, **payload)
+        self.stats.actions += 1
+        try:
+            await asyncio.wait_for(self._done.wait(), 10)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+
+    def seat(self, team: str, role: str) -> Bot:
+        return next(bot for bot in self.bots if bot.team == team and bot.role == role)
+
+    async def play(self, games: int):
+        for i, bot in enumerate(self.bots):
+            await self.act(bot, "join_game", player_name=f"bot-{i}")
+        for bot in self.bots:
+            await self.act(bot, "assign_role", team=bot.team, role=bot.role)
+
+        for game in range(games):
+            if game:
+                await self.act(self.bots[0], "reset_game")
+            await self.act(self.bots[0], "start_game")
+            await self.play_game()
+
+    async def play_game(self):
+        # The red spymaster sees every card type
+        view = self.seat("red", "spymaster")
+        while view.state["state"] == "in_progress":
+            team = view.state["currentTeam"]
+            await self.act(self.seat(team, "spymaster"), "give_clue", word="CLUE", number=1)
+
+            hidden = [card for card in view.state["cards"] if not card["revealed"]]
+            own = [card for card in hidden if card["type"] == team]
+            if own and random.random() < self.accuracy:
+                card = random.choice(own)
+            else:
+                card = random.choice([card for card in hidden if card["type"] != "assassin"] or hidden)
+            operative = self.seat(team, "operative")
+            await self.act(operative, "reveal_card", position=card["position"])
+
+            if view.state["state"] == "in_progress" and view.state["currentTeam"] == team:
+                await self.act(operative, "end_turn")
+
+
+def create_game(base_url: str) -> str:
+    request = urllib.request.Request(f"{base_url}/api/games", method="POST")
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())["game_id"]
+
+
+async def run_room(base_url: str, ws_url: str, players: int, args, stats: Stats, connecting: asyncio.Semaphore):
+    async with connecting:
+        game_id = await asyncio.to_thread(create_game, base_url)
+        room = Room(game_id, stats, args.think, args.accuracy)
+        for i in range(players):
+            # Extra players beyond the four seats join as operatives
+            team, role = SEATS[i] if i < len(SEATS) else (SEATS[i % 2][0], "operative")
+            ws = await websockets.connect(f"{ws_url}/ws/{game_id}", max_size=None, ping_interval=None)
+            room.bots.append(Bot(room, ws, team, role))
+
+    readers = [asyncio.create_task(bot.read()) for bot in room.bots]
+    try:
+        await room.play(args.games)
+    finally:
+        for bot in room.bots:
+            await bot.ws.close()
+        await asyncio.gather(*readers, return_exceptions=True)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_healthy(base_url: str, timeout: float = 15):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"{base_url}/health"):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def peak_rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def run_point(base_url: str, rooms: int, players: int, args) -> Stats:
+    ws_url = "ws" + base_url[len("http"):]
+    stats = Stats()
+    connecting = asyncio.Semaphore(args.connect_concurrency)
+    await asyncio.gather(*(run_room(base_url, ws_url, players, args, stats, connecting) for _ in range(rooms)))
+    return stats
+
+
+async def run_in_process(port: int, rooms: int, players: int, args):
+    import uvicorn
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        start = time.perf_counter()
+        stats = await run_point(f"http://127.0.0.1:{port}", rooms, players, args)
+        return stats, time.perf_counter() - start
+    finally:
+        server.should_exit = True
+        await serving
+
+
+def measure(rooms: int, players: int, args) -> dict:
+    process = None
+    if args.in_process:
+        stats, elapsed = asyncio.run(run_in_process(free_port(), rooms, players, args))
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    else:
+        base_url = args.url
+        if base_url is None:
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            )
+        try:
+            wait_healthy(base_url)
+            start = time.perf_counter()
+            stats = asyncio.run(run_point(base_url, rooms, players, args))
+            elapsed = time.perf_counter() - start
+            peak = peak_rss_mb(process.pid if process else args.pid) if (process or args.pid) else None
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    latencies = stats.latencies
+    return {
+        "rooms": rooms,
+        "players": players,
+        "actions": stats.actions,
+        "errors": stats.errors,
+        "timeouts": stats.timeouts,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "msgs_per_s": stats.frames / elapsed,
+        "bytes_per_s": stats.bytes / elapsed,
+        "peak_rss_mb": peak,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric, higher_is_worse in COMPARED.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change > tolerance) if higher_is_worse else (change < -tolerance):
+                regressions.append(f"{key} {metric}: {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return regressions
+
+
+def raise_fd_limit():
+    # Every bot holds a socket, and so does the server side when in-process
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--players", type=int, nargs="+", default=[4], help="players per room, at least 4")
+    parser.add_argument("--games", type=int, default=1, help="games played per room")
+    parser.add_argument("--think", type=float, default=0.05, help="mean seconds between actions in a room")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="chance an operative picks its own card")
+    parser.add_argument("--connect-concurrency", type=int, default=100)
+    parser.add_argument("--url", help="use a running server, e.g. http://127.0.0.1:8000")
+    parser.add_argument("--pid", type=int, help="pid of the --url server, for peak RSS")
+    parser.add_argument("--in-process", action="store_true", help="run uvicorn inside this process")
+    parser.add_argument("--save", help="write results to this baseline file")
+    parser.add_argument("--compare", help="compare results with this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative change before flagging")
+    args = parser.parse_args()
+    if min(args.players) < len(SEATS):
+        parser.error("--players must be at least 4")
+    raise_fd_limit()
+
+    print(f"{'rooms':>6} {'players':>7} {'actions':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'msgs/s':>9} {'KB/s':>9} {'peak MB':>8} {'errors':>6}")
+    results: Dict[str, dict] = {}
+    for players in args.players:
+        for rooms in args.rooms:
+            result = measure(rooms, players, args)
+            results[f"{rooms}x{players}"] = result
+            peak = f"{result['peak_rss_mb']:.1f}" if result["peak_rss_mb"] else "-"
+            print(f"{rooms:>6} {players:>7} {result['actions']:>8} {result['p50_ms']:>8.2f} "
+                  f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['msgs_per_s']:>9.0f} "
+                  f"{result['bytes_per_s'] / 1024:>9.1f} {peak:>8} {result['errors'] + result['timeouts']:>6}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
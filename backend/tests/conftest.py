@@ -0,0 +1,54 @@
+from typing import Dict, Tuple
+
+import pytest
+
+from app.models import Game, Player, Role, Team
+from app.services.game_service import GameService
+
+SEATS = [
+    (Team.RED, Role.SPYMASTER),
+    (Team.RED, Role.OPERATIVE),
+    (Team.BLUE, Role.SPYMASTER),
+    (Team.BLUE, Role.OPERATIVE),
+]
+
+
+class FakeClock:
+    """A monotonic clock the test moves by hand."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def service() -> GameService:
+    return GameService()
+
+
+def seat_players(service: GameService, game: Game) -> Dict[Tuple[Team, Role], Player]:
+    """Add a spymaster and an operative to each team."""
+    seated = {}
+    for i, (team, role) in enumerate(SEATS):
+        player = service.add_player(game.id, f"p{i}", f"Player {i}")
+        service.assign_role(game.id, player.id, team, role)
+        seated[team, role] = player
+    return seated
+
+
+def started_game(service: GameService, **options) -> Tuple[Game, Dict[Tuple[Team, Role], Player]]:
+    """A game in progress with a full table."""
+    game = service.create_game(**options)
+    seated = seat_players(service, game)
+    assert service.start_game(game.id)
+    return service.get_game(game.id), seated
@@ -0,0 +1,61 @@
+import sqlite3
+import time
+
+import pytest
+
+from app.services.archive import GameArchive
+
+FAIL_INSERTS = (
+    "CREATE TEMP TRIGGER fail_inserts BEFORE INSERT ON games"
+    " BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+)
+
+
+def record(game_id: str, winner: str = "red") -> dict:
+    return {
+        "gameId": game_id, "finishedAt": 0.0, "wordPack": "standard", "startingTeam": "red",
+        "winner": winner, "reason": "cards", "clues": [{"word": "sea", "number": 2}], "reveals": [1, 2],
+    }
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = GameArchive(str(tmp_path / "archive.db"), flush_interval=0.01)
+    yield archive
+    archive.close()
+
+
+def test_failed_write_keeps_games_for_the_next_flush(archive):
+    archive.append(record("A"))
+    archive.append(record("B"))
+    archive._writer.execute(FAIL_INSERTS)
+    with pytest.raises(sqlite3.DatabaseError):
+        archive.flush()
+    assert archive.pending == 2
+    assert archive.stats()["games"] == 0
+
+    archive.append(record("C"))
+    archive._writer.execute("DROP TRIGGER fail_inserts")
+    archive.flush()
+    assert archive.pending == 0
+    assert archive.stats()["games"] == 3
+    rows = archive._read("SELECT game_id FROM games ORDER BY seq", ())
+    assert [game_id for (game_id,) in rows] == ["A", "B", "C"]
+
+
+def test_writer_thread_survives_a_failed_write(archive, caplog):
+    archive._writer.execute(FAIL_INSERTS)
+    archive.append(record("A"))
+    archive.start()
+    deadline = time.monotonic() + 2
+    while "Archive write failed" not in caplog.text:
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+    assert archive._thread.is_alive()
+
+    with archive._io_lock:
+        archive._writer.execute("DROP TRIGGER fail_inserts")
+    while archive.pending:
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+    assert archive.games("A")[0]["gameId"] == "A"
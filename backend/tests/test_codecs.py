@@ -0,0 +1,110 @@
+import pytest
+from pydantic import TypeAdapter
+
+from app.codecs import CODECS, DEFAULT_CODEC, MsgpackCodec, negotiate, pack_cards, unpack_cards
+from app.models.messages import client_message
+
+ALL_CODECS = [DEFAULT_CODEC, *CODECS.values()]
+
+CARDS = [
+    {"word": "APPLE", "type": "red", "revealed": True, "position": 0},
+    {"word": "BANK", "type": None, "revealed": False, "position": 1},
+    {"word": "CAT", "type": "assassin", "revealed": False, "position": 2},
+]
+
+GAME_STATE = {"type": "game_state", "payload": {"id": "ABCDEF", "version": 3, "cards": CARDS}}
+DELTA = {"type": "state_delta", "payload": {"deltas": [{"seq": 4, "op": "turn_ended", "currentTeam": "blue"}]}}
+
+
+@pytest.mark.parametrize("codec", ALL_CODECS, ids=lambda codec: codec.name)
+def test_round_trip(codec):
+    for message in (GAME_STATE, DELTA):
+        frame = codec.encode(message)
+        assert isinstance(frame, bytes if codec.binary else str)
+        assert codec.decode(frame) == message
+
+
+@pytest.mark.parametrize("codec", ALL_CODECS, ids=lambda codec: codec.name)
+def test_batch_keeps_order(codec):
+    frames = [codec.encode(GAME_STATE), codec.encode(DELTA)]
+    assert codec.decode(codec.batch(frames)) == {"type": "batch", "payload": {"messages": [GAME_STATE, DELTA]}}
+
+
+@pytest.mark.skipif(MsgpackCodec.subprotocol not in CODECS, reason="msgpack not installed")
+def test_msgpack_batch_header_for_many_frames():
+    codec = CODECS[MsgpackCodec.subprotocol]
+    frames = [codec.encode(DELTA)] * 20
+    assert codec.decode(codec.batch(frames))["payload"]["messages"] == [DELTA] * 20
+
+
+def test_pack_cards_round_trip():
+    packed = pack_cards(CARDS)
+    assert packed["revealed"] == 1
+    assert unpack_cards(packed) == CARDS
+
+
+@pytest.mark.parametrize("codec", ALL_CODECS, ids=lambda codec: codec.name)
+def test_validate_parses_client_messages(codec):
+    message = codec.validate(codec.encode({"type": "reveal_card", "payload": {"position": 7}}), client_message)
+    assert message.type == "reveal_card"
+    assert message.payload.position == 7
+
+
+@pytest.mark.parametrize("codec", ALL_CODECS, ids=lambda codec: codec.name)
+@pytest.mark.parametrize("message", [
+    {"type": "no_such_message", "payload": {}},
+    {"type": "reveal_card", "payload": {"position": "seven"}},
+    {"payload": {}},
+])
+def test_validate_rejects_bad_messages(codec, message):
+    with pytest.raises(ValueError):
+        codec.validate(codec.encode(message), client_message)
+
+
+@pytest.mark.parametrize("codec", ALL_CODECS, ids=lambda codec: codec.name)
+def test_validate_rejects_garbage(codec):
+    with pytest.raises(ValueError):
+        codec.validate(b"\xc1\x00not a frame" if codec.binary else "{not json", client_message)
+
+
+def test_negotiate_picks_first_supported():
+    assert negotiate(["nope", "codenames.json-binary", "codenames.json"]) is CODECS["codenames.json-binary"]
+    assert negotiate([]) is DEFAULT_CODEC
+    assert negotiate(["nope"]) is DEFAULT_CODEC
+
+
+def test_validate_accepts_plain_type_adapter():
+    adapter = TypeAdapter(dict)
+    assert DEFAULT_CODEC.validate('{"a": 1}', adapter) == {"a": 1}
+
+
+@pytest.mark.skipif(MsgpackCodec.subprotocol not in CODECS, reason="msgpack not installed")
+@pytest.mark.parametrize("frame", [
+    "a text frame",
+    b"\x91",
+    b"\xc1",
+])
+def test_msgpack_rejects_bad_frames_as_value_error(frame):
+    codec = CODECS[MsgpackCodec.subprotocol]
+    with pytest.raises(ValueError):
+        codec.decode(frame)
+    with pytest.raises(ValueError):
+        codec.validate(frame, client_message)
+
+
+@pytest.mark.skipif(MsgpackCodec.subprotocol not in CODECS, reason="msgpack not installed")
+@pytest.mark.parametrize("message", [
+    {"type": "game_state"},
+    {"type": "game_state", "payload": {"cards": 1}},
+    {"type": "batch"},
+    {"type": "batch", "payload": {"messages": [1]}},
+])
+def test_msgpack_client_frames_never_unpack_payloads(message):
+    import msgpack
+
+    codec = CODECS[MsgpackCodec.subprotocol]
+    frame = msgpack.packb(message)
+    with pytest.raises(ValueError):
+        codec.validate(frame, client_message)
+    with pytest.raises(ValueError):
+        codec.decode(frame)
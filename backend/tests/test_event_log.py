@@ -0,0 +1,74 @@
+import asyncio
+import os
+
+from app.models import GameState, Role
+from app.services.event_log import EventLog
+from app.services.game_service import GameService
+
+from .conftest import started_game
+
+
+def play_some(service: GameService):
+    game, seated = started_game(service, clue_seconds=30)
+    spymaster = seated[game.current_team, Role.SPYMASTER]
+    operative = seated[game.current_team, Role.OPERATIVE]
+    service.give_clue(game.id, spymaster.id, "thing", 2)
+    own = next(card.position for card in game.cards if card.type.value == game.current_team.value)
+    service.reveal_card(game.id, operative.id, own)
+    service.end_turn(game.id, operative.id)
+    return game.id
+
+
+def recovered(directory) -> GameService:
+    service = GameService()
+    service.recover(EventLog(str(directory)))
+    return service
+
+
+def dump(service: GameService, game_id: str) -> dict:
+    return service.get_game(game_id).model_dump(exclude={"version", "created_at", "turn_deadline"})
+
+
+def test_recover_replays_commands(tmp_path):
+    log = EventLog(str(tmp_path))
+    service = GameService()
+    service.recover(log)
+    game_id = play_some(service)
+    gone = service.create_game().id
+    service.delete_game(gone)
+    log.close()
+
+    copy = recovered(tmp_path)
+    assert dump(copy, game_id) == dump(service, game_id)
+    assert copy.get_game(gone) is None
+    assert len(copy.timers) == 1
+
+
+def test_snapshot_plus_tail(tmp_path):
+    log = EventLog(str(tmp_path))
+    service = GameService()
+    service.recover(log)
+    game_id = play_some(service)
+    asyncio.run(service.write_snapshot())
+    later = service.create_game().id
+    service.add_player(later, "late", "Late")
+    log.close()
+
+    assert [name for name in os.listdir(tmp_path) if name.startswith("log-")] == ["log-00000002.jsonl"]
+    copy = recovered(tmp_path)
+    assert dump(copy, game_id) == dump(service, game_id)
+    assert "late" in copy.get_game(later).players
+
+
+def test_torn_line_ends_the_segment(tmp_path):
+    log = EventLog(str(tmp_path))
+    service = GameService()
+    service.recover(log)
+    game_id = service.create_game().id
+    log.close()
+    with open(tmp_path / "log-00000001.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"op": "join", "game": "')
+
+    copy = recovered(tmp_path)
+    assert copy.get_game(game_id).state == GameState.LOBBY
+    assert copy.get_game(game_id).players == {}
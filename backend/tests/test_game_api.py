@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import Role
+from app.services.game_service import game_service
+from app.services.sessions import sessions
+
+from .conftest import started_game
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def game():
+    game, seated = started_game(game_service)
+    tokens = {role: sessions.token(game.id, seated[game.current_team, role].id) for role in Role}
+    yield game, tokens
+    game_service.delete_game(game.id)
+
+
+def card_types(response):
+    return [card["type"] for card in response.json()["cards"]]
+
+
+@pytest.mark.parametrize("path", ["", "/poll"])
+def test_only_spymasters_see_card_types(client, game, path):
+    game, tokens = game
+    url = f"/api/games/{game.id}{path}"
+    assert set(card_types(client.get(url))) == {None}
+    assert set(card_types(client.get(url, params={"token": tokens[Role.OPERATIVE]}))) == {None}
+    assert set(card_types(client.get(url, params={"token": "forged.token"}))) == {None}
+    assert None not in card_types(client.get(url, params={"token": tokens[Role.SPYMASTER]}))
+
+
+def test_etag_depends_on_the_view(client, game):
+    game, tokens = game
+    url = f"/api/games/{game.id}"
+    operative = client.get(url).headers["etag"]
+    spymaster = client.get(url, params={"token": tokens[Role.SPYMASTER]}).headers["etag"]
+    assert operative != spymaster
+
+    assert client.get(url, headers={"If-None-Match": operative}).status_code == 304
+    response = client.get(url, params={"token": tokens[Role.SPYMASTER]}, headers={"If-None-Match": operative})
+    assert response.status_code == 200
+    assert None not in card_types(response)
+
+
+def test_missing_game_is_404(client):
+    assert client.get("/api/games/NOPE00").status_code == 404
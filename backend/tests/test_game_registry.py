@@ -0,0 +1,24 @@
+from app.services.game_registry import RoomCodeAllocator
+
+
+def test_codes_are_unique_and_well_formed():
+    codes = RoomCodeAllocator(seed=1)
+    issued = [codes.allocate() for _ in range(50000)]
+    assert len(set(issued)) == len(issued)
+    assert all(len(code) == 6 and code.isalpha() and code.isupper() for code in issued)
+
+
+def test_used_up_permutation_starts_a_new_one():
+    codes = RoomCodeAllocator(seed=1)
+    keys = codes._keys
+    codes._counter = 1 << (2 * codes._HALF_BITS)
+    code = codes.allocate()
+    assert len(code) == 6
+    assert codes._keys != keys
+    assert codes._counter < 10
+
+
+def test_deleting_games_keeps_no_codes(service):
+    for _ in range(100):
+        service.delete_game(service.create_game().id)
+    assert vars(service.codes).keys() == {"_rng", "_keys", "_counter"}
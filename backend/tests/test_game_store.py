@@ -0,0 +1,55 @@
+import pytest
+
+from app.models import Game
+from app.services.game_service import GameService
+from app.services.game_store import ConcurrentUpdateError, SQLiteGameStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "games.db")
+
+
+def test_reads_reuse_the_decoded_game_until_it_changes(path):
+    here, elsewhere = GameService(SQLiteGameStore(path)), GameService(SQLiteGameStore(path))
+    game_id = here.create_game().id
+    first = here.get_game(game_id)
+    assert here.get_game(game_id) is first
+
+    elsewhere.add_player(game_id, "p", "Player")
+    changed = here.get_game(game_id)
+    assert changed is not first
+    assert "p" in changed.players
+    assert here.get_game(game_id) is changed
+
+
+def test_deleted_elsewhere_is_gone_here(path):
+    here, elsewhere = GameService(SQLiteGameStore(path)), GameService(SQLiteGameStore(path))
+    game_id = here.create_game().id
+    here.get_game(game_id)
+    elsewhere.delete_game(game_id)
+    assert here.get_game(game_id) is None
+
+
+def test_failed_save_drops_the_cached_copy(path):
+    here, elsewhere = SQLiteGameStore(path), SQLiteGameStore(path)
+    here.add(Game(id="ABCDEF"))
+    stale = here["ABCDEF"]
+    theirs = elsewhere["ABCDEF"]
+    theirs.version += 1
+    elsewhere.save(theirs)
+
+    stale.version += 1
+    stale.public = True
+    with pytest.raises(ConcurrentUpdateError):
+        here.save(stale)
+    assert here["ABCDEF"] is not stale
+    assert not here["ABCDEF"].public
+
+
+def test_cache_is_bounded(path):
+    store = SQLiteGameStore(path, cache_size=2)
+    for game_id in ("AAAAAA", "BBBBBB", "CCCCCC"):
+        store.add(Game(id=game_id))
+    assert list(store._cache) == ["BBBBBB", "CCCCCC"]
+    assert store["AAAAAA"].id == "AAAAAA"
@@ -0,0 +1,78 @@
+from app.models import GameState
+from app.services.lobby import LobbyEntry, LobbyFilter, LobbyIndex
+
+
+def entry(game_id: str, state: GameState = GameState.LOBBY, players: int = 0, missing_spymaster: bool = True,
+          word_pack: str = "standard") -> LobbyEntry:
+    return LobbyEntry(game_id, state.value, players, 4, missing_spymaster, word_pack)
+
+
+def ids(page):
+    return [e.id for e in page]
+
+
+def test_query_filters_newest_first():
+    index = LobbyIndex(4)
+    index.put(entry("A"))
+    index.put(entry("B", GameState.IN_PROGRESS, players=4, missing_spymaster=False))
+    index.put(entry("C", word_pack="animals"))
+    assert ids(index.query(LobbyFilter())[0]) == ["C", "B", "A"]
+    assert ids(index.query(LobbyFilter(GameState.LOBBY))[0]) == ["C", "A"]
+    assert ids(index.query(LobbyFilter(open_seats=False))[0]) == ["B"]
+    assert ids(index.query(LobbyFilter(word_pack="animals"))[0]) == ["C"]
+
+
+def test_pages_follow_the_cursor():
+    index = LobbyIndex(4)
+    for i in range(5):
+        index.put(entry(f"G{i}"))
+    page, cursor = index.query(LobbyFilter(), limit=2)
+    assert ids(page) == ["G4", "G3"]
+    page, cursor = index.query(LobbyFilter(), limit=2, before=cursor)
+    assert ids(page) == ["G2", "G1"]
+    page, cursor = index.query(LobbyFilter(), limit=2, before=cursor)
+    assert ids(page) == ["G0"]
+    assert cursor is None
+
+
+def test_change_within_a_bucket_keeps_position():
+    index = LobbyIndex(4)
+    index.put(entry("A", players=1))
+    index.put(entry("B"))
+    index.put(entry("A", players=2))
+    assert ids(index.query(LobbyFilter())[0]) == ["B", "A"]
+    assert index.get("A").players == 2
+
+
+def test_change_of_bucket_moves_entry():
+    index = LobbyIndex(4)
+    index.put(entry("A"))
+    index.put(entry("B"))
+    index.put(entry("A", players=4))
+    assert ids(index.query(LobbyFilter(open_seats=True))[0]) == ["B"]
+    assert ids(index.query(LobbyFilter(open_seats=False))[0]) == ["A"]
+
+
+def test_remove_and_drain_changes():
+    index = LobbyIndex(4)
+    index.put(entry("A"))
+    index.drain_changes()
+    old_key = index.get("A").key
+    index.put(entry("A", players=4))
+    index.put(entry("B"), local=False)
+    index.remove("A")
+    changes, local = index.drain_changes()
+    assert sorted(changes, key=lambda change: change[0]) == [("A", old_key, None), ("B", None, index.get("B"))]
+    assert local == {"A"}
+    assert index.drain_changes() == ([], set())
+    assert len(index) == 1
+
+
+def test_service_indexes_public_games_only(service):
+    public = service.create_game(public=True)
+    service.create_game()
+    assert ids(service.lobby.query(LobbyFilter())[0]) == [public.id]
+    service.add_player(public.id, "p", "Player")
+    assert service.lobby.get(public.id).players == 1
+    service.delete_game(public.id)
+    assert len(service.lobby) == 0
@@ -0,0 +1,23 @@
+import asyncio
+
+from app.profiling import deep_sizeof, room_sizes
+from .conftest import started_game
+
+
+def test_room_sizes_measure_on_the_loop_between_changes(service):
+    (first, _), (second, _) = started_game(service), started_game(service)
+    before = deep_sizeof(second)
+
+    async def measure():
+        async def grow():
+            # Runs in the gap between the two measurements
+            second.clue_history.extend([None] * 1000)
+
+        task = asyncio.create_task(grow())
+        sizes = await room_sizes([(first.id, first), (second.id, second)])
+        await task
+        return sizes
+
+    sizes = asyncio.run(measure())
+    assert sizes[first.id] == deep_sizeof(first)
+    assert sizes[second.id] == deep_sizeof(second) > before
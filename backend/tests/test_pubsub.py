@@ -0,0 +1,46 @@
+import asyncio
+
+from app.pubsub import Relay, UnixSocketBroker
+
+
+def test_relay_drops_bad_lines_and_keeps_the_publisher(tmp_path):
+    path = str(tmp_path / "relay.sock")
+
+    async def main():
+        server = await asyncio.start_unix_server(Relay().handle_client, path=path)
+        received = asyncio.Queue()
+
+        async def handler(room, data):
+            await received.put((room, data))
+
+        subscriber, publisher = UnixSocketBroker(path), UnixSocketBroker(path)
+        await subscriber.start(handler)
+        await publisher.start(handler)
+        subscriber.subscribe("G")
+        await asyncio.sleep(0.05)
+
+        publisher._writer.write(b'{"op": "pub", "room\n[1, 2]\n')
+        await publisher.publish("G", {"n": 1})
+        assert await asyncio.wait_for(received.get(), 1) == ("G", {"n": 1})
+
+        await subscriber.stop()
+        await publisher.stop()
+        server.close()
+
+    asyncio.run(main())
+
+
+def test_worker_drops_bad_lines_and_keeps_reading():
+    async def main():
+        received = []
+
+        async def handler(room, data):
+            received.append((room, data))
+
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'{"room": "G", "da\n{"room": "G"}\n{"room": "G", "data": {"n": 1}}\n')
+        reader.feed_eof()
+        await UnixSocketBroker("unused")._read_loop(reader, handler)
+        return received
+
+    assert asyncio.run(main()) == [("G", {"n": 1})]
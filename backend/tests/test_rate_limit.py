@@ -0,0 +1,53 @@
+from app.rate_limit import RateLimiter, TokenBucket, parse_limits
+
+
+def test_parse_limits():
+    assert parse_limits(" reveal_card=2/5, *=10/20 ,") == {"reveal_card": (2.0, 5.0), "*": (10.0, 20.0)}
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    bucket = TokenBucket(2, 3, clock())
+    assert [bucket.take(clock()) for _ in range(4)] == [True, True, True, False]
+    clock.advance(0.5)
+    assert bucket.take(clock())
+    assert not bucket.take(clock())
+    clock.advance(100)
+    assert [bucket.take(clock()) for _ in range(4)] == [True, True, True, False]
+
+
+def test_connection_limit_per_type(clock):
+    limiter = RateLimiter(parse_limits("join_game=1/1,*=10/10"), {}, strikes=5, clock=clock)
+    connection = limiter.connection()
+    assert limiter.check(connection, "G", "join_game") == (True, False)
+    assert limiter.check(connection, "G", "join_game") == (False, False)
+    # Other types have their own bucket
+    assert limiter.check(connection, "G", "reveal_card") == (True, False)
+
+
+def test_room_limit_is_shared_by_connections(clock):
+    limiter = RateLimiter({}, parse_limits("start_game=1/2"), strikes=5, clock=clock)
+    first, second = limiter.connection(), limiter.connection()
+    assert limiter.check(first, "G", "start_game")[0]
+    assert limiter.check(second, "G", "start_game")[0]
+    assert not limiter.check(first, "G", "start_game")[0]
+    # Another room is unaffected, and a forgotten room starts afresh
+    assert limiter.check(first, "H", "start_game")[0]
+    limiter.forget_room("G")
+    assert limiter.check(second, "G", "start_game")[0]
+
+
+def test_unlisted_type_without_wildcard_is_unlimited(clock):
+    limiter = RateLimiter(parse_limits("join_game=1/1"), {}, strikes=1, clock=clock)
+    connection = limiter.connection()
+    assert all(limiter.check(connection, "G", "resync")[0] for _ in range(100))
+
+
+def test_strikes_disconnect_and_recover(clock):
+    limiter = RateLimiter(parse_limits("*=0/1"), {}, strikes=2, strike_rate=1, clock=clock)
+    connection = limiter.connection()
+    assert limiter.check(connection, "G", "x") == (True, False)
+    assert limiter.check(connection, "G", "x") == (False, False)
+    assert limiter.check(connection, "G", "x") == (False, False)
+    assert limiter.check(connection, "G", "x") == (False, True)
+    clock.advance(1)
+    assert limiter.check(connection, "G", "x") == (False, False)
@@ -0,0 +1,84 @@
+from app.models import GameState
+from app.services.reaper import RoomReaper
+
+TTLS = {GameState.LOBBY: 10, GameState.IN_PROGRESS: 100, GameState.FINISHED: 5}
+
+
+def test_rooms_expire_by_their_state_ttl(clock):
+    reaper = RoomReaper(TTLS, max_rooms=100, clock=clock)
+    reaper.touch("LOBBY", GameState.LOBBY)
+    reaper.touch("PLAYING", GameState.IN_PROGRESS)
+    clock.advance(11)
+    assert reaper.expired(lambda game_id: False) == ["LOBBY"]
+    assert reaper.counts() == {"lobby": 0, "in_progress": 1, "finished": 0}
+    assert reaper.evictions["lobby"] == 1
+
+
+def test_touch_resets_the_clock_and_moves_state(clock):
+    reaper = RoomReaper(TTLS, max_rooms=100, clock=clock)
+    reaper.touch("G", GameState.LOBBY)
+    clock.advance(8)
+    reaper.touch("G", GameState.IN_PROGRESS)
+    clock.advance(8)
+    assert reaper.expired(lambda game_id: False) == []
+    assert reaper.counts()["lobby"] == 0
+    reaper.touch("G", GameState.FINISHED)
+    clock.advance(6)
+    assert reaper.expired(lambda game_id: False) == ["G"]
+    assert len(reaper) == 0
+
+
+def test_active_rooms_are_kept(clock):
+    reaper = RoomReaper(TTLS, max_rooms=100, clock=clock)
+    reaper.touch("G", GameState.LOBBY)
+    clock.advance(11)
+    assert reaper.expired(lambda game_id: True) == []
+    clock.advance(11)
+    assert reaper.expired(lambda game_id: False) == ["G"]
+
+
+def test_over_capacity_evicts_least_recently_active(clock):
+    reaper = RoomReaper(TTLS, max_rooms=2, clock=clock)
+    for game_id in ("A", "B", "C"):
+        reaper.touch(game_id, GameState.LOBBY)
+        clock.advance(1)
+    reaper.touch("A", GameState.IN_PROGRESS)
+    reaper.touch("D", GameState.LOBBY)
+    assert reaper.over_capacity() == ["B", "C"]
+    assert reaper.evictions["capacity"] == 2
+
+
+def test_forget_stops_tracking(clock):
+    reaper = RoomReaper(TTLS, max_rooms=100, clock=clock)
+    reaper.touch("G", GameState.LOBBY)
+    reaper.forget("G")
+    reaper.forget("G")
+    clock.advance(100)
+    assert reaper.expired(lambda game_id: False) == []
+
+
+def test_shared_store_rooms_are_not_deleted_by_one_worker(tmp_path, clock):
+    from app.services.game_service import GameService
+    from app.services.game_store import SQLiteGameStore
+
+    path = str(tmp_path / "games.db")
+    here = GameService(SQLiteGameStore(path), RoomReaper(TTLS, max_rooms=1, clock=clock))
+    elsewhere = GameService(SQLiteGameStore(path))
+    game = here.create_game()
+    here.get_state_body(game.id, False)
+    # Players carry on through another worker, which this one can't see
+    clock.advance(11)
+    elsewhere.add_player(game.id, "p", "Player")
+
+    assert here.reap(lambda game_id: False) == []
+    assert len(here.reaper) == 0
+    assert game.id not in here._view_cache
+    assert "p" in elsewhere.get_game(game.id).players
+
+
+def test_local_store_rooms_are_deleted(service, clock):
+    service.reaper = RoomReaper(TTLS, max_rooms=100, clock=clock)
+    game = service.create_game()
+    clock.advance(11)
+    assert service.reap(lambda game_id: False) == [game.id]
+    assert service.get_game(game.id) is None
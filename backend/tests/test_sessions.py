@@ -0,0 +1,57 @@
+import asyncio
+
+from app.services.sessions import SessionManager
+
+sessions = SessionManager("secret", grace=1)
+
+
+def test_token_verifies_for_its_game():
+    token = sessions.token("ABCDEF", "player.1")
+    assert sessions.verify("ABCDEF", token) == "player.1"
+
+
+def test_token_rejected_for_other_game_or_secret():
+    token = sessions.token("ABCDEF", "p1")
+    assert sessions.verify("GHIJKL", token) is None
+    assert SessionManager("other", grace=1).verify("ABCDEF", token) is None
+
+
+def test_tampered_tokens_are_rejected():
+    token = sessions.token("ABCDEF", "p1")
+    player_id, _, signature = token.partition(".")
+    assert sessions.verify("ABCDEF", f"p2.{signature}") is None
+    assert sessions.verify("ABCDEF", token[:-1]) is None
+    assert sessions.verify("ABCDEF", signature) is None
+    assert sessions.verify("ABCDEF", "") is None
+
+
+def test_non_ascii_tokens_are_rejected():
+    token = sessions.token("ABCDEF", "p1")
+    assert sessions.verify("ABCDEF", token[:-1] + "é") is None
+    assert sessions.verify("ABCDEF", "p1.ü") is None
+    assert sessions.verify("ABCDEF", "ü.ü") is None
+
+
+def test_seat_expires_after_grace_and_release_cancels_it():
+    held = SessionManager("secret", grace=0.01)
+    expired = []
+
+    async def main():
+        finish = asyncio.Event()
+
+        async def expire(player_id):
+            await finish.wait()
+            expired.append(player_id)
+
+        held.hold("G", "kept", lambda: expire("kept"))
+        held.hold("G", "gone", lambda: expire("gone"))
+        held.release("G", "kept")
+        await asyncio.sleep(0.05)
+        # The removal has started and is held on to until it finishes
+        assert len(held._expiring) == 1
+        finish.set()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert expired == ["gone"]
+    assert not held._expiring
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+from app.models.board import CLEARED, RED
+from app.simulator import TURN_LIMIT, FixedSpymaster, SkilledOperative, Stats, load_policy, play, run_batch
+
+SPYMASTER = "app.simulator.FixedSpymaster"
+
+
+def test_batches_are_reproducible():
+    first = run_batch(1, 0, 200, "fixed:2", "skilled:0.8").summary()
+    assert first == run_batch(1, 0, 200, "fixed:2", "skilled:0.8").summary()
+    assert first["games"] == 200
+    assert first["red_win_rate"] + first["blue_win_rate"] == pytest.approx(1)
+    assert first["aborted_rate"] == 0
+
+
+@pytest.mark.parametrize("spec", ["fixed:0", "fixed:-1", f"{SPYMASTER}:0"])
+def test_fixed_spymaster_needs_a_positive_number(spec):
+    with pytest.raises(ValueError):
+        load_policy(spec, {"fixed": FixedSpymaster})
+
+
+class SilentSpymaster:
+    def clue(self, board, team, rng):
+        return 0
+
+
+def test_games_nobody_can_finish_are_aborted():
+    spymasters = [SilentSpymaster()] * 2
+    operatives = [SkilledOperative(1.0)] * 2
+    starting, winner, outcome, turns = play(spymasters, operatives, random.Random(0))
+    assert (winner, outcome, turns) == (None, None, TURN_LIMIT)
+
+    stats = Stats()
+    stats.add(starting, winner, outcome, turns)
+    stats.add(RED, RED, CLEARED, 10)
+    summary = stats.summary()
+    assert summary["aborted_rate"] == 0.5
+    assert summary["red_win_rate"] == 0.5
@@ -0,0 +1,31 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.models.board import ASSASSIN, BLUE, NEUTRAL, RED  # noqa: E402
+from app.services.spymaster_ai import CANDIDATES, ClueEngine, Embeddings  # noqa: E402
+from app.utils.word_packs import WordPack, encode_pack  # noqa: E402
+
+BOARD = ("APPLE", "BANANA", "ROBOT", "SKULL")
+TYPES = bytes([RED, RED, BLUE, ASSASSIN])
+
+
+def engine(extra: int) -> ClueEngine:
+    """An engine over the board words, FRUIT near the red cards, and `extra` unrelated words."""
+    words = [*BOARD, "FRUIT"] + [f"FILLER{i}" for i in range(extra)]
+    vectors = np.zeros((len(words), 8), dtype=np.float32)
+    for row, axis in enumerate([0, 0, 1, 2]):
+        vectors[row, axis] = 1
+    vectors[4, 0] = 1
+    for row in range(5, len(words)):
+        vectors[row, 3 + row % 5] = 1
+    return ClueEngine(Embeddings(WordPack("test", encode_pack(words)), vectors))
+
+
+@pytest.mark.parametrize("extra", [0, 10, CANDIDATES + 10])
+def test_clue_for_any_vocabulary_size(extra):
+    assert engine(extra).suggest(BOARD, TYPES, 0, RED) == ("FRUIT", 2)
+
+
+def test_no_clue_without_targets():
+    assert engine(0).suggest(BOARD, bytes([NEUTRAL, NEUTRAL, BLUE, ASSASSIN]), 0, RED) is None
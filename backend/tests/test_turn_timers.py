@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from app.models import Role
+from app.services.turn_timers import TurnTimers
+
+from .conftest import started_game
+
+
+def run_timers(schedule, wait: float):
+    """Start timers, apply `schedule` to them and collect what fires within `wait` seconds."""
+    fired = []
+
+    async def main():
+        timers = TurnTimers()
+        timers.start(lambda game_id, deadline: fired.append(game_id))
+        schedule(timers, time.time())
+        await asyncio.sleep(wait)
+        timers.stop()
+        return timers
+
+    return fired, asyncio.run(main())
+
+
+def test_deadlines_fire_in_order():
+    def schedule(timers, now):
+        timers.schedule("LATE", now + 0.06)
+        timers.schedule("EARLY", now + 0.02)
+
+    fired, timers = run_timers(schedule, 0.15)
+    assert fired == ["EARLY", "LATE"]
+    assert len(timers) == 0
+
+
+def test_reschedule_and_cancel():
+    def schedule(timers, now):
+        timers.schedule("MOVED", now + 0.01)
+        timers.schedule("MOVED", now + 0.05)
+        timers.schedule("CANCELLED", now + 0.02)
+        timers.cancel("CANCELLED")
+        timers.schedule("KEPT", now + 10)
+
+    fired, timers = run_timers(schedule, 0.1)
+    assert fired == ["MOVED"]
+    assert len(timers) == 1
+
+
+def test_stale_entries_are_compacted():
+    timers = TurnTimers()
+    for i in range(1000):
+        timers.schedule("G", 1e12 + i)
+    assert len(timers._heap) <= 2 * len(timers) + 65
+
+
+def test_timed_game_passes_the_turn(service):
+    game, _ = started_game(service, clue_seconds=30, guess_seconds=60)
+    team, deadline = game.current_team, game.turn_deadline
+    assert deadline is not None and len(service.timers) == 1
+
+    assert not service.expire_turn(game.id, deadline - 1)
+    assert service.expire_turn(game.id, deadline)
+    game = service.get_game(game.id)
+    assert game.current_team != team
+    assert game.turn_deadline is not None and game.turn_deadline != deadline
+
+
+def test_clue_switches_to_the_guess_clock(service):
+    game, seated = started_game(service, clue_seconds=30, guess_seconds=60)
+    spymaster = seated[game.current_team, Role.SPYMASTER]
+    before = game.turn_deadline
+    assert service.give_clue(game.id, spymaster.id, "thing", 1)
+    assert service.get_game(game.id).turn_deadline > before + 20
+
+
+def test_untimed_game_has_no_clock(service):
+    game, _ = started_game(service)
+    assert game.turn_deadline is None
+    assert len(service.timers) == 0
+    assert not service.expire_turn(game.id)
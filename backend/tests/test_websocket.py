@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.codecs import CODECS, MsgpackCodec
+from app.main import app
+from app.routers import websocket as websocket_router
+from app.services.game_service import game_service
+from app.websocket_manager import manager
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def wait_for(condition, timeout: float = 2.0):
+    """Wait for the server side of a closed socket to finish cleaning up."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def receive_until(ws, codec, message_type):
+    while True:
+        message = codec.decode(ws.receive_bytes() if codec.binary else ws.receive_text())
+        if message["type"] == message_type:
+            return message
+
+
+def test_connected_carries_the_server_time(client):
+    game_id = client.post("/api/games").json()["game_id"]
+    before = time.time()
+    with client.websocket_connect(f"/ws/{game_id}") as ws:
+        connected = ws.receive_json()
+        assert connected["type"] == "connected"
+        assert before <= connected["payload"]["serverTime"] <= time.time()
+
+
+@pytest.mark.skipif(MsgpackCodec.subprotocol not in CODECS, reason="msgpack not installed")
+@pytest.mark.parametrize("frame", [
+    "a text frame",
+    {"type": "game_state"},
+    {"type": "batch"},
+])
+def test_msgpack_bad_frames_get_an_error_and_keep_the_connection(client, frame):
+    import msgpack
+
+    codec = CODECS[MsgpackCodec.subprotocol]
+    game_id = client.post("/api/games").json()["game_id"]
+    with client.websocket_connect(f"/ws/{game_id}", subprotocols=[codec.subprotocol]) as ws:
+        receive_until(ws, codec, "game_state")
+        if isinstance(frame, str):
+            ws.send_text(frame)
+        else:
+            ws.send_bytes(msgpack.packb(frame))
+        assert receive_until(ws, codec, "error")["payload"]["code"] in ("malformed", "unknown_type")
+
+        ws.send_bytes(codec.encode({"type": "join_game", "payload": {"player_name": "Ann"}}))
+        delta = receive_until(ws, codec, "state_delta")["payload"]["deltas"][-1]
+        assert (delta["op"], delta["player"]["name"]) == ("player_joined", "Ann")
+        assert [player.name for player in game_service.get_game(game_id).players.values()] == ["Ann"]
+
+    wait_for(lambda: manager.get_connection_count(game_id) == 0)
+
+
+def test_error_during_catch_up_removes_the_connection(client, monkeypatch):
+    async def broken(*args):
+        raise RuntimeError("catch_up failed")
+
+    monkeypatch.setattr(websocket_router, "catch_up", broken)
+    game_id = client.post("/api/games").json()["game_id"]
+    with pytest.raises(RuntimeError, match="catch_up failed"):
+        with client.websocket_connect(f"/ws/{game_id}") as ws:
+            ws.receive_text()
+            ws.receive_text()
+    wait_for(lambda: manager.get_connection_count(game_id) == 0)
+    assert not any(connection.game_id == game_id for connection in manager.connection_info.values())
+
+
+def test_heartbeat_expiry_during_catch_up_removes_the_connection(client, monkeypatch):
+    async def expired(websocket, *args):
+        manager.connection_info[websocket].expire()
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(websocket_router, "catch_up", expired)
+    game_id = client.post("/api/games").json()["game_id"]
+    with client.websocket_connect(f"/ws/{game_id}") as ws:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            while True:
+                ws.receive_text()
+        assert closed.value.code == 1001
+    wait_for(lambda: manager.get_connection_count(game_id) == 0)
@@ -0,0 +1,73 @@
+import asyncio
+
+from app.codecs import DEFAULT_CODEC
+from app.websocket_manager import Connection, ConnectionManager, RoomStats
+
+
+class StuckSocket:
+    """A client that never reads, and records how it was closed."""
+
+    def __init__(self):
+        self.closed = None
+
+    async def send_text(self, frame):
+        await asyncio.Event().wait()
+
+    async def close(self, code, reason):
+        self.closed = (code, reason)
+
+
+def test_slow_client_is_evicted_and_closed():
+    async def main():
+        manager = ConnectionManager(max_queue=2, evict_after=-1)
+        websocket = StuckSocket()
+        connection = Connection(websocket, "G", "p", manager.max_queue)
+        manager.room_stats["G"] = RoomStats()
+        for _ in range(4):
+            manager._push(connection, "frame")
+
+        assert connection.evicted
+        assert len(manager._tasks) == 1
+        await asyncio.sleep(0)
+        return manager, websocket
+
+    manager, websocket = asyncio.run(main())
+    assert websocket.closed == (1008, "Client too slow")
+    assert manager.room_stats["G"].evicted == 1
+    assert not manager._tasks
+
+
+class ViewerSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, frame):
+        self.sent.append(frame)
+
+
+def test_spectator_updates_are_tracked_until_done(service):
+    game = service.create_game()
+
+    async def main():
+        manager = ConnectionManager(spectator_interval=0)
+        websocket = ViewerSocket()
+        assert await manager.connect_spectator(websocket, game.id, DEFAULT_CODEC, False, service)
+        await asyncio.sleep(0.01)
+        sent = len(websocket.sent)
+
+        manager._spectators_changed(game.id, service)
+        for _ in range(100):
+            if manager._tasks:
+                break
+            await asyncio.sleep(0)
+        assert len(manager._tasks) == 1
+        await asyncio.gather(*manager._tasks)
+        await asyncio.sleep(0.01)
+        assert not manager._tasks
+        assert len(websocket.sent) == sent + 1
+        manager.disconnect_spectator(websocket)
+
+    asyncio.run(main())
@@ -1,8 +1,29 @@
+import { useEffect, useState } from 'react';
 import { useGame } from '../../contexts/GameContext';
 import { useGameState } from '../../hooks/useGameState';
 
+// The deadline is on the server's clock; offset shifts it onto this client's
+function TurnClock({ deadline, offset }: { deadline: number; offset: number }) {
+  const [now, setNow] = useState(() => Date.now() / 1000);
+
+  useEffect(() => {
+    const timer = setInterval(() => setNow(Date.now() / 1000), 250);
+    return () => clearInterval(timer);
+  }, [deadline]);
+
+  const left = Math.max(0, Math.ceil(deadline - offset - now));
+  const minutes = Math.floor(left / 60);
+  const seconds = String(left % 60).padStart(2, '0');
+
+  return (
+    <div className={`text-center text-lg font-mono ${left <= 10 ? 'text-red-600' : 'text-gray-700'}`}>
+      {minutes}:{seconds}
+    </div>
+  );
+}
+
 export function GameInfo() {
-  const { game, currentPlayer, endTurn } = useGame();
+  const { game, currentPlayer, clockOffset, endTurn } = useGame();
   const { isMyTurnToGuess } = useGameState();
 
   if (!game) return null;
@@ -37,6 +58,9 @@ export function GameInfo() {
         </div>
       )}
 
+      {/* Turn Clock */}
+      {isInProgress && game.turnDeadline !== null && <TurnClock deadline={game.turnDeadline} offset={clockOffset} />}
+
       {/* Current Clue */}
       {isInProgress && game.currentClue && (
         <div className="text-center space-y-2">
@@ -0,0 +1,75 @@
+import { useEffect, useState } from 'react';
+import { useNavigate } from 'react-router-dom';
+import { WS_BASE_URL } from '../../utils/constants';
+import type { LobbyGame } from '../../types/game';
+
+// Games shown at once; the server caps pages at 100
+const PAGE_SIZE = 20;
+
+export function LobbyBrowser() {
+  const navigate = useNavigate();
+  const [games, setGames] = useState<LobbyGame[]>([]);
+  const [needsSpymaster, setNeedsSpymaster] = useState(false);
+
+  useEffect(() => {
+    const params = new URLSearchParams({ state: 'lobby', open_seats: 'true', limit: String(PAGE_SIZE) });
+    if (needsSpymaster) params.set('missing_spymaster', 'true');
+    const ws = new WebSocket(`${WS_BASE_URL}/lobby?${params}`);
+
+    ws.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === 'ping') {
+        ws.send(JSON.stringify({ type: 'pong', payload: {} }));
+      } else if (message.type === 'lobby') {
+        setGames(message.payload.games);
+      } else if (message.type === 'lobby_update') {
+        const { games: changed, removed } = message.payload as { games: LobbyGame[]; removed: string[] };
+        setGames((current) => {
+          const byId = new Map(current.map((game) => [game.id, game]));
+          removed.forEach((id) => byId.delete(id));
+          changed.forEach((game) => byId.set(game.id, game));
+          return [...byId.values()].sort((a, b) => b.seq - a.seq).slice(0, PAGE_SIZE);
+        });
+      }
+    };
+
+    return () => ws.close();
+  }, [needsSpymaster]);
+
+  return (
+    <div className="space-y-3">
+      <div className="flex items-center justify-between">
+        <h2 className="font-semibold text-gray-700">Open games</h2>
+        <label className="text-sm text-gray-600 flex items-center gap-1">
+          <input
+            type="checkbox"
+            checked={needsSpymaster}
+            onChange={(e) => setNeedsSpymaster(e.target.checked)}
+          />
+          Needs a spymaster
+        </label>
+      </div>
+
+      {games.length === 0 ? (
+        <p className="text-center text-gray-400 text-sm">No public games right now.</p>
+      ) : (
+        <ul className="divide-y border rounded-xl max-h-64 overflow-y-auto">
+          {games.map((game) => (
+            <li key={game.id}>
+              <button
+                onClick={() => navigate(`/game/${game.id}`)}
+                className="w-full px-4 py-2 flex items-center justify-between hover:bg-gray-50 text-left"
+              >
+                <span className="font-mono tracking-widest">{game.id}</span>
+                <span className="text-sm text-gray-500">
+                  {game.players}/{game.capacity} players · {game.wordPack}
+                  {game.missingSpymaster && ' · needs spymaster'}
+                </span>
+              </button>
+            </li>
+          ))}
+        </ul>
+      )}
+    </div>
+  );
+}
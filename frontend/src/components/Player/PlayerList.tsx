@@ -5,9 +5,11 @@ export function PlayerList() {
   const { playerId } = useGame();
   const { teamPlayers } = useGameState();
 
-  const PlayerItem = ({ player, isYou }: { player: { id: string; name: string; role?: string }; isYou: boolean }) => (
-    <div className={`px-3 py-1 rounded ${isYou ? 'bg-yellow-100 font-semibold' : ''}`}>
+  const PlayerItem = ({ player, isYou }: { player: { id: string; name: string; role?: string; disconnected_at?: number | null; is_bot?: boolean }; isYou: boolean }) => (
+    <div className={`px-3 py-1 rounded ${isYou ? 'bg-yellow-100 font-semibold' : ''} ${player.disconnected_at ? 'opacity-50' : ''}`}>
       {player.name} {isYou && '(You)'}
+      {player.is_bot && <span className="text-xs ml-1">(bot)</span>}
+      {player.disconnected_at && <span className="text-xs ml-1">(reconnecting)</span>}
       {player.role && (
         <span className="text-xs ml-1 opacity-70">
           ({player.role})
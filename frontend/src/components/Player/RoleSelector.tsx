@@ -2,7 +2,7 @@ import { useGame } from '../../contexts/GameContext';
 import { Team, Role } from '../../types/game';
 
 export function RoleSelector() {
-  const { assignRole, currentPlayer, game } = useGame();
+  const { assignRole, addBot, currentPlayer, game } = useGame();
 
   if (!game) return null;
 
@@ -48,6 +48,22 @@ export function RoleSelector() {
     );
   };
 
+  const BotButton = ({ team }: { team: Team }) => {
+    const seated = Object.values(game.players).some(p => p.team === team && p.role === 'spymaster');
+    if (seated) return null;
+
+    return (
+      <div className="text-center">
+        <button
+          onClick={() => addBot(team)}
+          className="text-xs text-gray-500 underline hover:text-gray-700"
+        >
+          Use a bot spymaster
+        </button>
+      </div>
+    );
+  };
+
   return (
     <div className="bg-white rounded-xl shadow-lg p-4">
       <h3 className="text-lg font-semibold mb-4 text-center">Choose Your Role</h3>
@@ -60,6 +76,7 @@ export function RoleSelector() {
             <RoleButton team="red" role="spymaster" label="Spymaster" />
             <RoleButton team="red" role="operative" label="Operative" />
           </div>
+          <BotButton team="red" />
         </div>
 
         {/* Blue Team */}
@@ -69,6 +86,7 @@ export function RoleSelector() {
             <RoleButton team="blue" role="spymaster" label="Spymaster" />
             <RoleButton team="blue" role="operative" label="Operative" />
           </div>
+          <BotButton team="blue" />
         </div>
       </div>
 
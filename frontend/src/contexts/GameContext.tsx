@@ -1,17 +1,21 @@
-import React, { createContext, useContext, useState, useCallback, useEffect, ReactNode } from 'react';
-import { Game, Player, Team, Role, WebSocketMessage } from '../types/game';
+import React, { createContext, useContext, useState, useCallback, useEffect, useRef, ReactNode } from 'react';
+import { Game, Player, Team, Role, StateDelta, WebSocketMessage } from '../types/game';
 import { websocketService } from '../services/websocket';
+import { applyDeltas } from '../utils/deltas';
 
 interface GameContextType {
   game: Game | null;
   playerId: string | null;
   currentPlayer: Player | null;
   isConnected: boolean;
+  // Server clock minus this client's clock, in seconds
+  clockOffset: number;
   error: string | null;
   connect: (gameId: string) => void;
   disconnect: () => void;
   joinGame: (playerName: string) => void;
   assignRole: (team: Team, role: Role) => void;
+  addBot: (team: Team) => void;
   startGame: () => void;
   giveClue: (word: string, number: number) => void;
   revealCard: (position: number) => void;
@@ -26,7 +30,16 @@ export function GameProvider({ children }: { children: ReactNode }) {
   const [game, setGame] = useState<Game | null>(null);
   const [playerId, setPlayerId] = useState<string | null>(null);
   const [isConnected, setIsConnected] = useState(false);
+  const [clockOffset, setClockOffset] = useState(0);
   const [error, setError] = useState<string | null>(null);
+  // Latest game copy, read synchronously when applying deltas
+  const gameRef = useRef<Game | null>(null);
+  const awaitingSnapshot = useRef(false);
+
+  const updateGame = useCallback((next: Game | null) => {
+    gameRef.current = next;
+    setGame(next);
+  }, []);
 
   const currentPlayer = game && playerId ? game.players[playerId] || null : null;
 
@@ -34,12 +47,30 @@ export function GameProvider({ children }: { children: ReactNode }) {
     switch (message.type) {
       case 'connected':
         setPlayerId(message.payload.playerId as string);
+        if (typeof message.payload.serverTime === 'number') {
+          setClockOffset(message.payload.serverTime - Date.now() / 1000);
+        }
         break;
 
       case 'game_state':
-        setGame(message.payload as unknown as Game);
+        awaitingSnapshot.current = false;
+        updateGame(message.payload as unknown as Game);
         break;
 
+      case 'state_delta': {
+        const current = gameRef.current;
+        if (!current || awaitingSnapshot.current) break;
+
+        const deltas = message.payload.deltas as StateDelta[];
+        const { game: next, gap } = applyDeltas(current, deltas);
+        updateGame(next);
+        if (gap) {
+          awaitingSnapshot.current = true;
+          websocketService.send({ type: 'resync', payload: { version: next.version } });
+        }
+        break;
+      }
+
       case 'error':
         setError(message.payload.message as string);
         break;
@@ -61,7 +92,7 @@ export function GameProvider({ children }: { children: ReactNode }) {
         // Game state will be updated
         break;
     }
-  }, []);
+  }, [updateGame]);
 
   useEffect(() => {
     const unsubMessage = websocketService.onMessage(handleMessage);
@@ -84,10 +115,10 @@ export function GameProvider({ children }: { children: ReactNode }) {
 
   const disconnect = useCallback(() => {
     websocketService.disconnect();
-    setGame(null);
+    updateGame(null);
     setPlayerId(null);
     setIsConnected(false);
-  }, []);
+  }, [updateGame]);
 
   const joinGame = useCallback((playerName: string) => {
     websocketService.send({
@@ -103,6 +134,13 @@ export function GameProvider({ children }: { children: ReactNode }) {
     });
   }, []);
 
+  const addBot = useCallback((team: Team) => {
+    websocketService.send({
+      type: 'add_bot',
+      payload: { team },
+    });
+  }, []);
+
   const startGame = useCallback(() => {
     websocketService.send({
       type: 'start_game',
@@ -149,11 +187,13 @@ export function GameProvider({ children }: { children: ReactNode }) {
         playerId,
         currentPlayer,
         isConnected,
+        clockOffset,
         error,
         connect,
         disconnect,
         joinGame,
         assignRole,
+        addBot,
         startGame,
         giveClue,
         revealCard,
@@ -1,11 +1,21 @@
 import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
+import { LobbyBrowser } from '../components/Lobby/LobbyBrowser';
 import { API_BASE_URL } from '../utils/constants';
 
+// Seconds to give a clue and to guess, per turn
+const TURN_CLOCKS = {
+  untimed: { label: 'No turn timer', clue_seconds: 0, guess_seconds: 0 },
+  relaxed: { label: '2 min clues, 3 min guesses', clue_seconds: 120, guess_seconds: 180 },
+  blitz: { label: '1 min clues, 90 s guesses', clue_seconds: 60, guess_seconds: 90 },
+};
+
 export function HomePage() {
   const navigate = useNavigate();
   const [joinCode, setJoinCode] = useState('');
   const [isCreating, setIsCreating] = useState(false);
+  const [isPublic, setIsPublic] = useState(false);
+  const [clock, setClock] = useState<keyof typeof TURN_CLOCKS>('untimed');
   const [error, setError] = useState('');
 
   const handleCreateGame = async () => {
@@ -15,6 +25,12 @@ export function HomePage() {
     try {
       const response = await fetch(`${API_BASE_URL}/games`, {
         method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({
+          public: isPublic,
+          clue_seconds: TURN_CLOCKS[clock].clue_seconds,
+          guess_seconds: TURN_CLOCKS[clock].guess_seconds,
+        }),
       });
 
       if (!response.ok) {
@@ -78,6 +94,25 @@ export function HomePage() {
             >
               {isCreating ? 'Creating...' : 'Create New Game'}
             </button>
+            <label className="mt-2 flex items-center justify-center gap-2 text-sm text-gray-600">
+              <input
+                type="checkbox"
+                checked={isPublic}
+                onChange={(e) => setIsPublic(e.target.checked)}
+              />
+              List publicly so anyone can join
+            </label>
+            <select
+              value={clock}
+              onChange={(e) => setClock(e.target.value as keyof typeof TURN_CLOCKS)}
+              className="mt-2 w-full px-3 py-2 border border-gray-300 rounded-lg text-sm text-gray-600"
+            >
+              {Object.entries(TURN_CLOCKS).map(([key, { label }]) => (
+                <option key={key} value={key}>
+                  {label}
+                </option>
+              ))}
+            </select>
           </div>
 
           {/* Divider */}
@@ -105,6 +140,9 @@ export function HomePage() {
               Join Game
             </button>
           </form>
+
+          {/* Public Games */}
+          <LobbyBrowser />
         </div>
 
         {/* Footer */}
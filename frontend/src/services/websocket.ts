@@ -13,14 +13,48 @@ class WebSocketService {
   private reconnectAttempts = 0;
   private maxReconnectAttempts = 5;
   private reconnectTimeout: number | null = null;
+  // Last state version seen, so a reconnect only replays what was missed
+  private version: number | null = null;
+
+  private resumeKey(gameId: string): string {
+    return `codenames:resume:${gameId}`;
+  }
+
+  private url(gameId: string): string {
+    const params = new URLSearchParams();
+    // Kept in sessionStorage so a page reload also gets the seat back
+    const token = sessionStorage.getItem(this.resumeKey(gameId));
+    if (token) {
+      params.set('resume', token);
+      if (this.version !== null) {
+        params.set('since', String(this.version));
+      }
+    }
+    const query = params.toString();
+    return `${WS_BASE_URL}/${gameId}${query ? `?${query}` : ''}`;
+  }
+
+  private track(message: WebSocketMessage): void {
+    if (message.type === 'connected' && this.gameId) {
+      sessionStorage.setItem(this.resumeKey(this.gameId), message.payload.resumeToken as string);
+    } else if (message.type === 'game_state') {
+      this.version = message.payload.version as number;
+    } else if (message.type === 'state_delta') {
+      const deltas = message.payload.deltas as { seq: number }[];
+      this.version = Math.max(this.version ?? 0, deltas[deltas.length - 1].seq);
+    }
+  }
 
   connect(gameId: string): void {
     if (this.ws?.readyState === WebSocket.OPEN) {
       this.disconnect();
     }
 
+    if (gameId !== this.gameId) {
+      this.version = null;
+    }
     this.gameId = gameId;
-    this.ws = new WebSocket(`${WS_BASE_URL}/${gameId}`);
+    this.ws = new WebSocket(this.url(gameId));
 
     this.ws.onopen = () => {
       this.reconnectAttempts = 0;
@@ -30,7 +64,19 @@ class WebSocketService {
     this.ws.onmessage = (event) => {
       try {
         const message: WebSocketMessage = JSON.parse(event.data);
-        this.messageHandlers.forEach(handler => handler(message));
+        // Heartbeat: answer so the server knows this connection is alive
+        if (message.type === 'ping') {
+          this.ws?.send(JSON.stringify({ type: 'pong', payload: {} }));
+          return;
+        }
+        // The server sends everything produced by one action as a single batch
+        const messages = message.type === 'batch'
+          ? message.payload.messages as WebSocketMessage[]
+          : [message];
+        messages.forEach(m => {
+          this.track(m);
+          this.messageHandlers.forEach(handler => handler(m));
+        });
       } catch (error) {
         console.error('Failed to parse WebSocket message:', error);
       }
@@ -72,7 +118,12 @@ class WebSocketService {
       this.ws = null;
     }
 
+    // Leaving on purpose gives up the seat rather than resuming it later
+    if (this.gameId) {
+      sessionStorage.removeItem(this.resumeKey(this.gameId));
+    }
     this.gameId = null;
+    this.version = null;
   }
 
   send(message: WebSocketMessage): void {
@@ -15,6 +15,9 @@ export interface Player {
   name: string;
   team?: Team;
   role?: Role;
+  // Set while the player's connection is down and their seat is held
+  disconnected_at?: number | null;
+  is_bot?: boolean;
 }
 
 export interface Clue {
@@ -25,6 +28,7 @@ export interface Clue {
 
 export interface Game {
   id: string;
+  version: number;
   state: GameState;
   cards: Card[];
   players: Record<string, Player>;
@@ -36,9 +40,41 @@ export interface Game {
   redRemaining: number;
   blueRemaining: number;
   clueHistory: Clue[];
+  clueSeconds: number;
+  guessSeconds: number;
+  // Epoch seconds the current clue or guesses are due by, null if untimed
+  turnDeadline: number | null;
 }
 
+export type StateDelta =
+  | { seq: number; op: 'player_joined' | 'player_updated'; player: Player }
+  | { seq: number; op: 'player_left'; playerId: string }
+  | { seq: number; op: 'clue_given'; clue: Clue; guessesRemaining: number; turnDeadline: number | null }
+  | {
+      seq: number;
+      op: 'card_revealed';
+      position: number;
+      type: CardType;
+      guessesRemaining: number;
+      redRemaining: number;
+      blueRemaining: number;
+    }
+  | { seq: number; op: 'turn_ended'; currentTeam: Team; turnDeadline: number | null }
+  | { seq: number; op: 'game_over'; winner: Team; reason: string };
+
 export interface WebSocketMessage {
   type: string;
   payload: Record<string, unknown>;
 }
+
+// A public game as listed by /api/lobby and /ws/lobby
+export interface LobbyGame {
+  id: string;
+  state: GameState;
+  players: number;
+  capacity: number;
+  openSeats: number;
+  missingSpymaster: boolean;
+  wordPack: string;
+  seq: number;
+}
@@ -0,0 +1,69 @@
+import { Game, StateDelta } from '../types/game';
+
+export interface DeltaResult {
+  game: Game;
+  gap: boolean;
+}
+
+function applyDelta(game: Game, delta: StateDelta): Game {
+  switch (delta.op) {
+    case 'player_joined':
+    case 'player_updated':
+      return { ...game, players: { ...game.players, [delta.player.id]: delta.player } };
+
+    case 'player_left': {
+      const players = { ...game.players };
+      delete players[delta.playerId];
+      return { ...game, players };
+    }
+
+    case 'clue_given':
+      return {
+        ...game,
+        currentClue: delta.clue,
+        guessesRemaining: delta.guessesRemaining,
+        clueHistory: [...game.clueHistory, delta.clue],
+        turnDeadline: delta.turnDeadline,
+      };
+
+    case 'card_revealed':
+      return {
+        ...game,
+        cards: game.cards.map(card =>
+          card.position === delta.position ? { ...card, type: delta.type, revealed: true } : card
+        ),
+        guessesRemaining: delta.guessesRemaining,
+        redRemaining: delta.redRemaining,
+        blueRemaining: delta.blueRemaining,
+      };
+
+    case 'turn_ended':
+      return {
+        ...game,
+        currentTeam: delta.currentTeam,
+        currentClue: null,
+        guessesRemaining: 0,
+        turnDeadline: delta.turnDeadline,
+      };
+
+    case 'game_over':
+      return { ...game, state: 'finished', winner: delta.winner, turnDeadline: null };
+  }
+}
+
+/**
+ * Apply server deltas in sequence order. Deltas the game has already seen are
+ * skipped; a missing sequence number stops application and reports a gap so
+ * the caller can request a fresh snapshot.
+ */
+export function applyDeltas(game: Game, deltas: StateDelta[]): DeltaResult {
+  let current = game;
+  for (const delta of deltas) {
+    if (delta.seq <= current.version) continue;
+    if (delta.seq !== current.version + 1) {
+      return { game: current, gap: true };
+    }
+    current = { ...applyDelta(current, delta), version: delta.seq };
+  }
+  return { game: current, gap: false };
+}